@@ -0,0 +1,100 @@
+"""
+Prometheus metrics endpoint.
+Exposes the request metrics of this worker together with connection pool,
+password hashing pool, cache, search index and log pipeline figures.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import response_cache
+from app.core.database import get_pool_stats
+from app.core.logging import error_log_limiter, get_log_queue_stats
+from app.core.metrics import counter_family, gauge_family, registry
+from app.core.security import password_hash_pool, token_cache
+from app.services.search_index import search_index
+
+# Starlette appends "; charset=utf-8"
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+router = APIRouter()
+
+
+@registry.add_collector
+def _database_pool_collector():
+    stats = [entry for entry in get_pool_stats() if "size" in entry]
+    for key, documentation in (
+        ("size", "Configured pool size."),
+        ("checked_out", "Connections currently checked out."),
+        ("checked_in", "Idle connections in the pool."),
+        ("overflow", "Connections open beyond the pool size."),
+    ):
+        yield gauge_family(
+            f"db_pool_{key}", documentation,
+            [(f"db_pool_{key}", {"engine": entry["engine"]}, entry[key]) for entry in stats]
+        )
+
+
+@registry.add_collector
+def _password_hash_pool_collector():
+    stats = password_hash_pool.stats()
+    for key, documentation in (
+        ("workers", "Password hashing worker threads."),
+        ("in_flight", "Password hashes being computed."),
+        ("queue_depth", "Password hashes waiting for a worker."),
+        ("peak_pending", "Highest number of pending password hashes."),
+    ):
+        name = f"password_hash_pool_{key}"
+        yield gauge_family(name, documentation, [(name, {}, stats[key])])
+    for key, documentation in (
+        ("completed", "Password hashes computed."),
+        ("rejected", "Password hashes rejected because the queue was full."),
+    ):
+        name = f"password_hash_pool_{key}_total"
+        yield counter_family(name, documentation, [(name, {}, stats[key])])
+
+
+@registry.add_collector
+def _cache_collector():
+    caches = {"token": token_cache.stats(), "response": response_cache.stats()}
+    caches = {name: stats for name, stats in caches.items() if stats}
+    yield counter_family(
+        "cache_hits_total", "Cache lookups answered from the cache.",
+        [("cache_hits_total", {"cache": name}, stats["hits"]) for name, stats in caches.items()]
+    )
+    yield counter_family(
+        "cache_misses_total", "Cache lookups that missed.",
+        [("cache_misses_total", {"cache": name}, stats["misses"]) for name, stats in caches.items()]
+    )
+    yield gauge_family(
+        "cache_entries", "Entries held by the cache.",
+        [("cache_entries", {"cache": name}, stats["size"]) for name, stats in caches.items() if "size" in stats]
+    )
+
+
+@registry.add_collector
+def _search_index_collector():
+    if not search_index.ready:
+        return
+    for key, value in search_index.stats().items():
+        name = f"search_index_{key}"
+        yield gauge_family(name, f"In-memory search index {key}.", [(name, {}, value)])
+
+
+@registry.add_collector
+def _logging_collector():
+    stats = get_log_queue_stats()
+    if stats["enabled"]:
+        yield gauge_family("log_queue_depth", "Log records waiting for the writer thread.",
+                           [("log_queue_depth", {}, stats["depth"])])
+        yield gauge_family("log_queue_capacity", "Capacity of the log queue.",
+                           [("log_queue_capacity", {}, stats["capacity"])])
+        yield counter_family("log_records_dropped_total", "Log records dropped because the queue was full.",
+                             [("log_records_dropped_total", {}, stats["dropped"])])
+    yield counter_family("log_messages_suppressed_total", "Repeated error logs suppressed by rate limiting.",
+                         [("log_messages_suppressed_total", {}, error_log_limiter.suppressed)])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics of this worker process in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -4,14 +4,12 @@ Handles user login, logout, and current user information.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 import logging
 
-from app.core.database import get_db
-from app.core.exceptions import AuthenticationError
-from app.schemas.auth import LoginRequest, LoginResponse, Token
-from app.services.auth_service import AuthService, get_current_user_dependency
-from app.models.user import User
+from app.core.database import DBSession, get_session
+from app.core.exceptions import AuthenticationError, ServiceUnavailableError
+from app.schemas.auth import AuthenticatedUser, LoginRequest, LoginResponse, Token
+from app.services.auth_service import AsyncAuthService, get_current_user_dependency
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +19,7 @@ router = APIRouter()
 @router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """
     Login endpoint for JSON-based authentication.
@@ -37,8 +35,8 @@ async def login(
         HTTPException: If authentication fails
     """
     try:
-        auth_service = AuthService(db)
-        response = auth_service.login_user(login_data)
+        auth_service = AsyncAuthService(db)
+        response = await auth_service.login_user(login_data)
         
         logger.info(f"Successful login for user: {login_data.email}")
         return response
@@ -49,6 +47,13 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
+    except ServiceUnavailableError as e:
+        logger.warning(f"Login deferred for {login_data.email}: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.detail,
+            headers=e.headers
+        )
     except Exception as e:
         logger.error(f"Login error for {login_data.email}: {e}")
         raise HTTPException(
@@ -60,7 +65,7 @@ async def login(
 @router.post("/login-form", response_model=Token, status_code=status.HTTP_200_OK)
 async def login_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """
     OAuth2 form-based login endpoint for OAuth2 flows and future integrations.
@@ -82,8 +87,8 @@ async def login_form(
             password=form_data.password
         )
         
-        auth_service = AuthService(db)
-        response = auth_service.login_user(login_data)
+        auth_service = AsyncAuthService(db)
+        response = await auth_service.login_user(login_data)
         
         logger.info(f"Successful OAuth2 form login for user: {form_data.username}")
         return Token(
@@ -98,6 +103,13 @@ async def login_form(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
+    except ServiceUnavailableError as e:
+        logger.warning(f"OAuth2 form login deferred for {form_data.username}: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.detail,
+            headers=e.headers
+        )
     except Exception as e:
         logger.error(f"OAuth2 form login error for {form_data.username}: {e}")
         raise HTTPException(
@@ -108,7 +120,7 @@ async def login_form(
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
-    current_user: User = Depends(get_current_user_dependency)
+    current_user: AuthenticatedUser = Depends(get_current_user_dependency)
 ):
     """
     Logout endpoint for authenticated users.
@@ -191,7 +203,7 @@ async def google_callback(code: str):
 
 @router.get("/me", status_code=status.HTTP_200_OK)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user_dependency)
+    current_user: AuthenticatedUser = Depends(get_current_user_dependency)
 ):
     """
     Get current authenticated user information.
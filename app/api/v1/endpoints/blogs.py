@@ -1,22 +1,33 @@
 """
 Blog management endpoints for CRUD operations.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 import logging
 
-from app.core.database import get_db
-from app.core.exceptions import NotFoundError, ConflictError, ValidationError, AuthorizationError
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import DBSession, get_session
+from app.core.responses import model_response
+from app.core.exceptions import NotFoundError, ConflictError, ValidationError, AuthorizationError, DatabaseError, PayloadTooLargeError
 from app.schemas.blog import (
     BlogCreate, 
     BlogUpdate, 
     BlogResponse, 
     BlogWithCreator, 
-    BlogListResponse
+    BlogListResponse, 
+    BlogSearchResult,
+    BlogSearchResponse,
+    BlogImportResponse
 )
-from app.services.blog_service import BlogService
-from app.services.auth_service import get_current_active_user_dependency, User
+from app.schemas.auth import AuthenticatedUser
+from app.services.blog_service import AsyncBlogService, BLOG_LISTS_CACHE, blog_cache_namespace, blog_export_query
+from app.services.auth_service import get_current_active_user_dependency
+from app.utils.bulk import ImportReport, iter_records
+from app.utils.conditional import is_not_modified, not_modified, with_validators
+from app.utils.fields import parse_fields, sparse_page_schema
+from app.utils.export import export_response
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +37,8 @@ router = APIRouter(tags=["blogs"])
 @router.post("/", response_model=BlogResponse, status_code=status.HTTP_201_CREATED)
 async def create_blog(
     blog_data: BlogCreate,
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Create a new blog post.
@@ -44,8 +55,8 @@ async def create_blog(
         HTTPException: If blog creation fails
     """
     try:
-        blog_service = BlogService(db)
-        blog = blog_service.create_blog(blog_data, current_user.id)
+        blog_service = AsyncBlogService(db)
+        blog = await blog_service.create_blog(blog_data, current_user.id)
         
         logger.info(f"Blog created successfully: {blog.title} by user {current_user.id}")
         return blog
@@ -64,20 +75,126 @@ async def create_blog(
         )
 
 
-@router.get("/", response_model=BlogListResponse, status_code=status.HTTP_200_OK)
+@router.post("/import", response_model=BlogImportResponse, status_code=status.HTTP_200_OK)
+async def import_blogs(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000, description="Blogs per INSERT (default BLOG_IMPORT_BATCH_SIZE)"),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
+):
+    """
+    Import blog posts in bulk for the current user.
+    
+    The body is a JSON array of blog objects, or NDJSON (one object per
+    line, ``Content-Type: application/x-ndjson``), which is read as it
+    streams in. Each record is validated on its own; valid records are
+    inserted in batches of ``batch_size`` with one commit per batch.
+    Records that fail validation, or belong to a batch that could not be
+    inserted, are reported by position. Bodies are limited to
+    BLOG_IMPORT_MAX_RECORDS records and BLOG_IMPORT_MAX_BODY_SIZE bytes; an
+    NDJSON upload stopped by a limit keeps the batches already committed.
+    
+    Args:
+        request: Incoming request (body)
+        batch_size: Blogs per INSERT
+        current_user: Current authenticated user
+        db: Database session
+    
+    Returns:
+        Number of imported and failed records, with the first errors
+    
+    Raises:
+        HTTPException: If the body is malformed, over the limits or the import fails
+    """
+    try:
+        blog_service = AsyncBlogService(db)
+        batch_size = batch_size or settings.BLOG_IMPORT_BATCH_SIZE
+        report = ImportReport()
+        batch: List[Tuple[int, BlogCreate]] = []
+        
+        async def flush() -> None:
+            try:
+                await blog_service.import_blogs(
+                    [blog for _, blog in batch], current_user.id, verify_creator=report.imported == 0
+                )
+                report.imported += len(batch)
+            except DatabaseError as e:
+                for index, _ in batch:
+                    report.fail(index, e.detail)
+            batch.clear()
+        
+        records = iter_records(
+            request, BlogCreate,
+            max_records=settings.BLOG_IMPORT_MAX_RECORDS,
+            max_bytes=settings.BLOG_IMPORT_MAX_BODY_SIZE
+        )
+        async for index, record in records:
+            if isinstance(record, str):
+                report.fail(index, record)
+                continue
+            batch.append((index, record))
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+        
+        logger.info(f"Blog import by user {current_user.id}: {report.imported} imported, {report.failed} failed")
+        return BlogImportResponse(imported=report.imported, failed=report.failed, errors=report.errors)
+    
+    except (ValidationError, NotFoundError, PayloadTooLargeError) as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"Blog import error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import blogs"
+        )
+
+
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": sparse_page_schema(BlogListResponse, BlogResponse),
+            "description": "Page of blogs; with `fields` each blog has only those fields and `id`. "
+                           "Pass `next_cursor` as `cursor` for the next page"
+        }
+    }
+)
 async def get_blogs(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of blogs to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of blogs to return"),
     published_only: bool = Query(True, description="Show only published blogs"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (overrides skip)"),
+    include_creators: bool = Query(False, description="Also return the creators of the listed blogs"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return per blog (id is always included)"),
+    db: DBSession = Depends(get_session)
 ):
     """
     Get all blogs with pagination and filtering.
     
+    Responses carry an ETag and Last-Modified derived from the blog listing
+    version, and a matching conditional request gets 304 before any blogs
+    are loaded. Bodies are served from the response cache when it is enabled
+    and are otherwise serialized directly from the page model. With
+    ``fields`` only the named columns are selected; the excerpt is always
+    computed by the database.
+    
     Args:
+        request: Incoming request (conditional headers)
+        response: Outgoing response (validator headers)
         skip: Number of blogs to skip
         limit: Maximum number of blogs to return
         published_only: Show only published blogs
+        cursor: Keyset cursor returned as next_cursor by a previous page
+        include_creators: Load the page's creators with one batched query
+        fields: Sparse fieldset, e.g. "title,excerpt"
         db: Database session
         
     Returns:
@@ -87,15 +204,36 @@ async def get_blogs(
         HTTPException: If operation fails
     """
     try:
-        blog_service = BlogService(db)
-        blogs = blog_service.get_all_blogs(
-            skip=skip, 
-            limit=limit, 
-            published_only=published_only
-        )
+        blog_service = AsyncBlogService(db)
+        selected = parse_fields(fields, BlogResponse)
+        params = {
+            "skip": skip,
+            "limit": limit,
+            "published_only": published_only,
+            "cursor": cursor,
+            "include_creators": include_creators,
+            "fields": selected
+        }
         
-        return blogs
+        # Creator details are not versioned, so such pages get no validators
+        validators = None
+        if not include_creators:
+            validators = await blog_service.get_listing_validators(**params)
+            if validators is not None and is_not_modified(request, validators):
+                return not_modified(validators)
         
+        result = await response_cache.serve(
+            BLOG_LISTS_CACHE,
+            params,
+            lambda: blog_service.get_all_blogs(**params)
+        )
+        return with_validators(result, response, validators)
+        
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.detail
+        )
     except Exception as e:
         logger.error(f"Error fetching blogs: {e}")
         raise HTTPException(
@@ -104,38 +242,62 @@ async def get_blogs(
         )
 
 
-@router.get("/search", response_model=BlogListResponse, status_code=status.HTTP_200_OK)
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": sparse_page_schema(BlogSearchResponse, BlogSearchResult),
+            "description": "Page of search hits; with `fields` each hit has only those fields and `id`"
+        }
+    }
+)
 async def search_blogs(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0, description="Number of blogs to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of blogs to return"),
-    db: Session = Depends(get_db)
+    include_creators: bool = Query(False, description="Also return the creators of the listed blogs"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return per blog (id is always included)"),
+    db: DBSession = Depends(get_session)
 ):
     """
     Search blogs by title or content.
     
+    With ``fields`` only the Blog attributes the named fields need are
+    loaded.
+    
     Args:
         q: Search query
         skip: Number of blogs to skip
         limit: Maximum number of blogs to return
+        include_creators: Load the page's creators with one batched query
+        fields: Sparse fieldset, e.g. "title,snippet"
         db: Database session
         
     Returns:
-        Paginated search results
+        Paginated search results ordered by relevance, with highlighted snippets
         
     Raises:
         HTTPException: If operation fails
     """
     try:
-        blog_service = BlogService(db)
-        blogs = blog_service.search_blogs(
+        blog_service = AsyncBlogService(db)
+        selected = parse_fields(fields, BlogSearchResult)
+        blogs = await blog_service.search_blogs(
             query=q,
             skip=skip,
-            limit=limit
+            limit=limit,
+            include_creators=include_creators,
+            fields=selected
         )
         
-        return blogs
+        return model_response(blogs)
         
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.detail
+        )
     except Exception as e:
         logger.error(f"Error searching blogs: {e}")
         raise HTTPException(
@@ -144,19 +306,36 @@ async def search_blogs(
         )
 
 
-@router.get("/my-blogs", response_model=BlogListResponse, status_code=status.HTTP_200_OK)
+@router.get(
+    "/my-blogs",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": BlogListResponse,
+            "description": "Page of the caller's blogs. Pass `next_cursor` as `cursor` for the next page"
+        }
+    }
+)
 async def get_my_blogs(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of blogs to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of blogs to return"),
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (overrides skip)"),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Get current user's blog posts.
     
+    Supports ETag / Last-Modified validation against the user's blog version.
+    
     Args:
+        request: Incoming request (conditional headers)
+        response: Outgoing response (validator headers)
         skip: Number of blogs to skip
         limit: Maximum number of blogs to return
+        cursor: Keyset cursor returned as next_cursor by a previous page
         current_user: Current authenticated user
         db: Database session
         
@@ -167,15 +346,27 @@ async def get_my_blogs(
         HTTPException: If operation fails
     """
     try:
-        blog_service = BlogService(db)
-        blogs = blog_service.get_blogs_by_user(
+        blog_service = AsyncBlogService(db)
+        validators = await blog_service.get_listing_validators(
+            current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+        if validators is not None and is_not_modified(request, validators):
+            return not_modified(validators)
+        
+        blogs = await blog_service.get_blogs_by_user(
             user_id=current_user.id,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
         
-        return blogs
+        return with_validators(model_response(blogs), response, validators)
         
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.detail
+        )
     except Exception as e:
         logger.error(f"Error fetching user blogs: {e}")
         raise HTTPException(
@@ -184,16 +375,49 @@ async def get_my_blogs(
         )
 
 
+@router.get("/export", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def export_blogs(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    published_only: bool = Query(True, description="Export only published blogs"),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency)
+):
+    """
+    Export blogs as a streamed NDJSON or CSV download.
+    
+    Rows are read from a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and written out as they arrive, so exports of any size run in constant
+    memory.
+    
+    Args:
+        export_format: Output format
+        published_only: Export only published blogs
+        current_user: Current authenticated user
+    
+    Returns:
+        Streamed export, one blog per line/row in id order
+    """
+    logger.info(f"Blog export ({export_format}) requested by user {current_user.id}")
+    return export_response(blog_export_query(published_only), export_format, "blogs")
+
+
 @router.get("/{blog_id}", response_model=BlogWithCreator, status_code=status.HTTP_200_OK)
 async def get_blog(
     blog_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_session)
 ):
     """
     Get blog by ID with creator information.
     
+    Responses carry an ETag and Last-Modified, and a matching conditional
+    request gets 304 before the blog is loaded. Bodies are served from the
+    response cache when it is enabled.
+    
     Args:
         blog_id: Blog ID to fetch
+        request: Incoming request (conditional headers)
+        response: Outgoing response (validator headers)
         db: Database session
         
     Returns:
@@ -203,10 +427,17 @@ async def get_blog(
         HTTPException: If blog not found
     """
     try:
-        blog_service = BlogService(db)
-        blog = blog_service.get_blog_with_creator(blog_id)
+        blog_service = AsyncBlogService(db)
+        validators = await blog_service.get_blog_validators(blog_id)
+        if validators is not None and is_not_modified(request, validators):
+            return not_modified(validators)
         
-        return blog
+        result = await response_cache.serve(
+            blog_cache_namespace(blog_id),
+            None,
+            lambda: blog_service.get_blog_with_creator(blog_id)
+        )
+        return with_validators(result, response, validators)
         
     except NotFoundError as e:
         logger.warning(f"Blog not found: {blog_id}")
@@ -226,8 +457,8 @@ async def get_blog(
 async def update_blog(
     blog_id: int,
     blog_data: BlogUpdate,
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Update a blog post.
@@ -245,8 +476,8 @@ async def update_blog(
         HTTPException: If update fails
     """
     try:
-        blog_service = BlogService(db)
-        blog = blog_service.update_blog(blog_id, blog_data, current_user.id)
+        blog_service = AsyncBlogService(db)
+        blog = await blog_service.update_blog(blog_id, blog_data, current_user.id)
         
         logger.info(f"Blog {blog_id} updated successfully by user {current_user.id}")
         return blog
@@ -280,8 +511,8 @@ async def update_blog(
 @router.delete("/{blog_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_blog(
     blog_id: int,
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Delete a blog post.
@@ -295,8 +526,8 @@ async def delete_blog(
         HTTPException: If deletion fails
     """
     try:
-        blog_service = BlogService(db)
-        blog_service.delete_blog(blog_id, current_user.id)
+        blog_service = AsyncBlogService(db)
+        await blog_service.delete_blog(blog_id, current_user.id)
         
         logger.info(f"Blog {blog_id} deleted successfully by user {current_user.id}")
         
@@ -323,8 +554,8 @@ async def delete_blog(
 @router.post("/{blog_id}/publish", response_model=BlogResponse, status_code=status.HTTP_200_OK)
 async def publish_blog(
     blog_id: int,
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Publish a blog post.
@@ -341,8 +572,8 @@ async def publish_blog(
         HTTPException: If operation fails
     """
     try:
-        blog_service = BlogService(db)
-        blog = blog_service.publish_blog(blog_id, current_user.id)
+        blog_service = AsyncBlogService(db)
+        blog = await blog_service.publish_blog(blog_id, current_user.id)
         
         logger.info(f"Blog {blog_id} published successfully by user {current_user.id}")
         return blog
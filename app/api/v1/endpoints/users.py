@@ -1,16 +1,23 @@
 """
 User management endpoints for CRUD operations.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from operator import attrgetter
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
 import logging
 
-from app.core.database import get_db
-from app.core.exceptions import NotFoundError, ConflictError, ValidationError
-from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithBlogs
-from app.services.user_service import UserService
-from app.services.auth_service import get_current_active_user_dependency, User
+from app.core.config import settings
+from app.core.database import DBSession, get_session, open_session
+from app.core.exceptions import NotFoundError, ConflictError, ValidationError, ServiceUnavailableError, PayloadTooLargeError
+from app.core.responses import models_response
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithBlogs, UserImportResult
+from app.schemas.auth import AuthenticatedUser
+from app.services.user_service import AsyncUserService, user_export_query
+from app.services.auth_service import get_current_active_user_dependency, get_current_admin_user_dependency
+from app.utils.bulk import iter_records
+from app.utils.export import export_response
+from app.utils.fields import parse_fields, sparse_schema
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +27,7 @@ router = APIRouter(tags=["users"])
 @router.post("/create", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
     """
     Create a new user account.
@@ -36,8 +43,8 @@ async def create_user(
         HTTPException: If user creation fails
     """
     try:
-        user_service = UserService(db)
-        user = user_service.create_user(user_data)
+        user_service = AsyncUserService(db)
+        user = await user_service.create_user(user_data)
         
         logger.info(f"User created successfully: {user.email}")
         return user
@@ -54,6 +61,13 @@ async def create_user(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=e.detail
         )
+    except ServiceUnavailableError as e:
+        logger.warning(f"User creation deferred: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.detail,
+            headers=e.headers
+        )
     except Exception as e:
         logger.error(f"User creation error: {e}")
         raise HTTPException(
@@ -62,9 +76,86 @@ async def create_user(
         )
 
 
+@router.post("/import", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def import_users(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=5000, description="Users per INSERT (default USER_IMPORT_BATCH_SIZE)"),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user_dependency)
+):
+    """
+    Provision user accounts in bulk (admin only, see ADMIN_EMAILS).
+    
+    The body is a JSON array of user objects (as for ``/users/create``) or
+    NDJSON, of at most USER_IMPORT_MAX_RECORDS records and
+    USER_IMPORT_MAX_BODY_SIZE bytes. It is validated before anything is
+    written; records are then
+    created in batches of ``batch_size`` (one IN query for taken emails,
+    passwords hashed in parallel, one INSERT) and a result line per
+    record is streamed back as NDJSON as each batch completes.
+    
+    Args:
+        request: Incoming request (body)
+        batch_size: Users per INSERT
+        current_user: Current authenticated admin
+    
+    Returns:
+        NDJSON stream of per-record results
+    
+    Raises:
+        HTTPException: If the caller is not an admin, or the body is
+            malformed or over the limits
+    """
+    try:
+        # Read the whole body first: once the response streams, the server
+        # only delivers disconnect messages
+        records = [
+            record async for record in iter_records(
+                request, UserCreate,
+                max_records=settings.USER_IMPORT_MAX_RECORDS,
+                max_bytes=settings.USER_IMPORT_MAX_BODY_SIZE
+            )
+        ]
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.detail
+        )
+    except PayloadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=e.detail
+        )
+    
+    batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+    logger.info(f"User import of {len(records)} records started by user {current_user.id}")
+    
+    async def results() -> AsyncIterator[bytes]:
+        async with open_session() as db:
+            user_service = AsyncUserService(db)
+            for start in range(0, len(records), batch_size):
+                chunk = records[start:start + batch_size]
+                batch = [(index, record) for index, record in chunk if not isinstance(record, str)]
+                outcome = [
+                    UserImportResult(index=index, status="invalid", detail=record)
+                    for index, record in chunk if isinstance(record, str)
+                ]
+                try:
+                    outcome += await user_service.import_users(batch) if batch else []
+                except Exception as e:
+                    logger.error(f"User import batch at record {start} failed: {e}")
+                    outcome += [
+                        UserImportResult(index=index, email=user.email, status="failed", detail="Failed to create users")
+                        for index, user in batch
+                    ]
+                for result in sorted(outcome, key=attrgetter("index")):
+                    yield result.model_dump_json(exclude_none=True).encode() + b"\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_current_user(
-    current_user: User = Depends(get_current_active_user_dependency)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency)
 ):
     """
     Get current authenticated user information.
@@ -80,8 +171,8 @@ async def get_current_user(
 
 @router.get("/me/blogs", response_model=UserWithBlogs, status_code=status.HTTP_200_OK)
 async def get_current_user_with_blogs(
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Get current user with their blog posts.
@@ -94,8 +185,8 @@ async def get_current_user_with_blogs(
         Current user with blogs
     """
     try:
-        user_service = UserService(db)
-        return user_service.get_user_with_blogs(current_user.id)
+        user_service = AsyncUserService(db)
+        return await user_service.get_user_with_blogs(current_user.id)
         
     except NotFoundError as e:
         logger.warning(f"User blogs not found: {e.detail}")
@@ -111,11 +202,34 @@ async def get_current_user_with_blogs(
         )
 
 
+@router.get("/export", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def export_users(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    current_user: AuthenticatedUser = Depends(get_current_admin_user_dependency)
+):
+    """
+    Export users as a streamed NDJSON or CSV download (admin only, see ADMIN_EMAILS).
+    
+    Rows are read from a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and written out as they arrive, so exports of any size run in constant
+    memory.
+    
+    Args:
+        export_format: Output format
+        current_user: Current authenticated admin
+    
+    Returns:
+        Streamed export, one user per line/row in id order
+    """
+    logger.info(f"User export ({export_format}) requested by user {current_user.id}")
+    return export_response(user_export_query(), export_format, "users")
+
+
 @router.get("/{user_id}", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user_dependency)
+    db: DBSession = Depends(get_session),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency)
 ):
     """
     Get user by ID (only accessible by the user themselves).
@@ -139,8 +253,8 @@ async def get_user(
                 detail="You can only access your own profile"
             )
         
-        user_service = UserService(db)
-        user = user_service.get_user_by_id(user_id)
+        user_service = AsyncUserService(db)
+        user = await user_service.get_user_by_id(user_id)
         
         return user
         
@@ -161,8 +275,8 @@ async def get_user(
 @router.put("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def update_current_user(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Update current user information.
@@ -179,8 +293,8 @@ async def update_current_user(
         HTTPException: If update fails
     """
     try:
-        user_service = UserService(db)
-        user = user_service.update_user(current_user.id, user_data)
+        user_service = AsyncUserService(db)
+        user = await user_service.update_user(current_user.id, user_data)
         
         logger.info(f"User {current_user.id} updated successfully")
         return user
@@ -207,8 +321,8 @@ async def update_current_user(
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_current_user(
-    current_user: User = Depends(get_current_active_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency),
+    db: DBSession = Depends(get_session)
 ):
     """
     Delete current user account.
@@ -221,8 +335,8 @@ async def delete_current_user(
         HTTPException: If deletion fails
     """
     try:
-        user_service = UserService(db)
-        user_service.delete_user(current_user.id)
+        user_service = AsyncUserService(db)
+        await user_service.delete_user(current_user.id)
         
         logger.info(f"User {current_user.id} deleted successfully")
         
@@ -240,24 +354,48 @@ async def delete_current_user(
         )
 
 
-@router.get("/", response_model=List[UserResponse], status_code=status.HTTP_200_OK)
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "model": List[sparse_schema(UserResponse)],
+            "description": "Users; with `fields` each user has only those fields and `id`",
+            "headers": {
+                "X-Next-Cursor": {
+                    "description": "Cursor for the next page (pass as `cursor`); absent on the last page",
+                    "schema": {"type": "string"}
+                }
+            }
+        }
+    }
+)
 async def get_users(
     skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of users to return"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user_dependency)
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of a previous page (overrides skip)"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return per user (id is always included)"),
+    db: DBSession = Depends(get_session),
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency)
 ):
     """
     Get all users with pagination (admin only).
     
+    The cursor for the next page, if any, is returned in the X-Next-Cursor
+    header so the response body stays a plain list. With ``fields`` only
+    the named columns are loaded and returned, so items are not full
+    UserResponse objects and no response_model is declared.
+    
     Args:
         skip: Number of users to skip
         limit: Maximum number of users to return
+        cursor: Keyset cursor from a previous page
+        fields: Sparse fieldset, e.g. "name,email"
         db: Database session
         current_user: Current authenticated user
         
     Returns:
-        List of users
+        JSON list of users (all fields, or ``fields`` and id)
         
     Raises:
         HTTPException: If access denied or operation fails
@@ -270,11 +408,26 @@ async def get_users(
         #         detail="Admin access required"
         #     )
         
-        user_service = UserService(db)
-        users = user_service.get_all_users(skip=skip, limit=limit)
+        user_service = AsyncUserService(db)
+        selected = parse_fields(fields, UserResponse)
+        users, next_cursor = await user_service.get_users_page(
+            skip=skip, 
+            limit=limit, 
+            cursor=cursor,
+            fields=selected
+        )
+        
+        result = models_response(users)
+        if next_cursor:
+            result.headers["X-Next-Cursor"] = next_cursor
         
-        return users
+        return result
         
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.detail
+        )
     except Exception as e:
         logger.error(f"Error fetching users: {e}")
         raise HTTPException(
@@ -6,7 +6,8 @@ import logging
 from app.core.migrations import (
     run_migrations, 
     check_migration_status, 
-    rollback_migrations
+    rollback_migrations,
+    recount_blogs
 )
 from app.core.logging import setup_logging
 
@@ -47,6 +48,18 @@ def status():
         raise click.Abort()
 
 
+@db.command()
+def recount():
+    """Rebuild the trigger-maintained blog counters."""
+    click.echo("Rebuilding blog counters...")
+    try:
+        recount_blogs()
+        click.echo("✅ Blog counters rebuilt successfully!")
+    except Exception as e:
+        click.echo(f"❌ Recount failed: {e}")
+        raise click.Abort()
+
+
 @db.command()
 @click.option('--force', is_flag=True, help='Force rollback without confirmation')
 def rollback(force):
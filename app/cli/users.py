@@ -0,0 +1,107 @@
+"""
+CLI tool for user management.
+"""
+import csv
+import json
+import sys
+import click
+import logging
+from typing import Iterator, List, Tuple, Union
+
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging import setup_logging
+from app.core.security import bulk_password_hash_pool
+from app.schemas.user import UserCreate, UserImportResult
+from app.services.user_service import UserService
+from app.utils.bulk import describe_errors
+
+# Setup logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def read_records(path: str) -> Iterator[Tuple[int, Union[UserCreate, str]]]:
+    """
+    Validate the users of an import file one by one.
+    
+    ``.csv`` files need name, email and password columns, ``.ndjson`` /
+    ``.jsonl`` files hold one object per line and anything else must be a
+    JSON array.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as handle:
+            rows: Iterator = csv.DictReader(handle)
+            yield from _validate(rows)
+    elif path.endswith((".ndjson", ".jsonl")):
+        with open(path, "rb") as handle:
+            lines = (line for line in handle if line.strip())
+            for index, line in enumerate(lines):
+                try:
+                    yield index, UserCreate.model_validate_json(line)
+                except PydanticValidationError as e:
+                    yield index, describe_errors(e)
+    else:
+        with open(path, "rb") as handle:
+            yield from _validate(iter(json.load(handle)))
+
+
+def _validate(rows: Iterator) -> Iterator[Tuple[int, Union[UserCreate, str]]]:
+    for index, row in enumerate(rows):
+        try:
+            yield index, UserCreate.model_validate(row)
+        except PydanticValidationError as e:
+            yield index, describe_errors(e)
+
+
+@click.group()
+def users():
+    """User management commands."""
+    pass
+
+
+@users.command(name="import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", type=int, default=None, help="Users per INSERT (default USER_IMPORT_BATCH_SIZE)")
+@click.option("--output", type=click.File("w"), default="-", help="Where to write NDJSON results (default stdout)")
+def import_users(path, batch_size, output):
+    """Create the users listed in PATH (CSV, NDJSON or JSON array)."""
+    batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+    totals = {"created": 0, "exists": 0, "invalid": 0, "failed": 0}
+    click.echo(f"Importing users from {path} ({bulk_password_hash_pool.workers} hashing threads)...", err=True)
+    
+    def emit(results: List[UserImportResult]) -> None:
+        for result in results:
+            totals[result.status] += 1
+            output.write(result.model_dump_json(exclude_none=True) + "\n")
+    
+    try:
+        with SessionLocal() as db:
+            user_service = UserService(db)
+            batch = []
+            for index, record in read_records(path):
+                if isinstance(record, str):
+                    emit([UserImportResult(index=index, status="invalid", detail=record)])
+                    continue
+                batch.append((index, record))
+                if len(batch) >= batch_size:
+                    emit(user_service.import_users(batch))
+                    batch = []
+            if batch:
+                emit(user_service.import_users(batch))
+    except Exception as e:
+        click.echo(f"❌ User import failed: {e}", err=True)
+        raise click.Abort()
+    finally:
+        bulk_password_hash_pool.shutdown()
+    
+    summary = ", ".join(f"{count} {status}" for status, count in totals.items())
+    click.echo(f"✅ User import finished: {summary}", err=True)
+    if totals["invalid"] or totals["failed"]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    users()
@@ -0,0 +1,299 @@
+"""
+Caching primitives.
+Provides a thread-safe LRU cache with per-entry expiry and a response cache
+for read-mostly endpoints, backed by process memory or Redis.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+import asyncio
+import logging
+import threading
+import time
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.responses import model_response
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it as recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+    
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class CacheBackend:
+    """
+    Storage for cached response bodies and namespace generations.
+    
+    Reads run on the event loop and are awaitable; bumps are called from
+    the synchronous service layer after a write has been committed, which
+    may itself be running on the event loop, so they must not block.
+    """
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+    
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+    
+    async def generation(self, namespace: str) -> int:
+        raise NotImplementedError
+    
+    def bump(self, namespace: str) -> None:
+        raise NotImplementedError
+    
+    async def close(self) -> None:
+        pass
+    
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend; other workers keep serving entries until they expire."""
+    
+    def __init__(self, maxsize: int, ttl: int):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Generations are never evicted: resetting one could revive stale entries
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    async def get(self, key):
+        return self._entries.get(key)
+    
+    async def set(self, key, value, ttl):
+        self._entries.set(key, value, ttl)
+    
+    async def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+    
+    def bump(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+    
+    def stats(self):
+        return self._entries.stats()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend so every worker sees the same entries and invalidations.
+    
+    Bumps are sent by a single background thread, in order, so a write
+    never waits on Redis; a request made within that round trip may still
+    be served the previous generation.
+    """
+    
+    GENERATIONS_KEY = "resp:generations"
+    
+    def __init__(self, url: str):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the redis package "
+                "(pip install 'fastapi-blog-api[redis]')"
+            ) from e
+        
+        self._client = redis.asyncio.Redis.from_url(url)
+        self._sync_client = redis.Redis.from_url(url)
+        self._bumps = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-bump")
+    
+    async def get(self, key):
+        return await self._client.get(key)
+    
+    async def set(self, key, value, ttl):
+        await self._client.set(key, value, ex=ttl)
+    
+    async def generation(self, namespace):
+        value = await self._client.hget(self.GENERATIONS_KEY, namespace)
+        return int(value) if value is not None else 0
+    
+    def bump(self, namespace):
+        future = self._bumps.submit(self._sync_client.hincrby, self.GENERATIONS_KEY, namespace, 1)
+        future.add_done_callback(lambda done: self._bump_done(namespace, done))
+    
+    @staticmethod
+    def _bump_done(namespace: str, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            # Entries in this namespace stay visible until they expire
+            logger.error(f"Response cache invalidation failed for {namespace}: {error}")
+    
+    async def close(self):
+        # Let queued bumps land before the connections go away
+        await asyncio.get_running_loop().run_in_executor(None, self._bumps.shutdown)
+        await self._client.aclose()
+        self._sync_client.close()
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized JSON responses.
+    
+    Keys embed the generation of their namespace, so invalidating a
+    namespace is a single counter bump: readers that computed a key before
+    the bump can only store under the old, unreachable generation. Backend
+    failures degrade to cache misses.
+    """
+    
+    def __init__(self, backend: Optional[CacheBackend], ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        # Counted here rather than by the backend so every backend reports them
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+    
+    async def key(self, namespace: str, params: Optional[Mapping[str, Any]] = None) -> Optional[str]:
+        """Build the current key for a namespace and its request parameters."""
+        try:
+            generation = await self.backend.generation(namespace)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+        query = urlencode(sorted((params or {}).items()))
+        return f"resp:{namespace}:{generation}:{query}"
+    
+    async def serve(
+        self,
+        namespace: str,
+        params: Optional[Mapping[str, Any]],
+        produce: Callable[[], Awaitable[BaseModel]]
+    ) -> Response:
+        """
+        Return the cached body for a request, or produce, store and return it.
+        
+        Args:
+            namespace: Invalidation namespace of the resource
+            params: Parameters that select the response body
+            produce: Coroutine factory building the response model on a miss
+        
+        Returns:
+            A JSON Response with the serialized model
+        """
+        if not self.enabled:
+            return model_response(await produce())
+        
+        key = await self.key(namespace, params)
+        if key is not None:
+            try:
+                body = await self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"Response cache read failed: {e}")
+                body = None
+            if body is not None:
+                self.hits += 1
+                return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+        
+        self.misses += 1
+        response = model_response(await produce(), headers={"X-Cache": "MISS"})
+        if key is not None:
+            try:
+                await self.backend.set(key, response.body, self.ttl)
+            except Exception as e:
+                logger.warning(f"Response cache write failed: {e}")
+        return response
+    
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every cached response in the given namespaces."""
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            try:
+                self.backend.bump(namespace)
+            except Exception as e:
+                # Entries in this namespace stay visible until they expire
+                logger.error(f"Response cache invalidation failed for {namespace}: {e}")
+    
+    async def close(self) -> None:
+        """Release backend connections."""
+        if self.backend is not None:
+            await self.backend.close()
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters of this worker plus backend figures."""
+        if not self.enabled:
+            return {}
+        return {**self.backend.stats(), "hits": self.hits, "misses": self.misses}
+
+
+def _create_response_cache_backend() -> Optional[CacheBackend]:
+    """Build the backend selected by RESPONSE_CACHE_BACKEND."""
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.REDIS_URL)
+    return None
+
+
+# Global response cache for anonymous read endpoints
+response_cache = ResponseCache(_create_response_cache_backend(), settings.RESPONSE_CACHE_TTL)
@@ -2,8 +2,8 @@
 Application configuration settings.
 Uses Pydantic BaseSettings for environment variable management.
 """
-from typing import List, Optional
-from pydantic import field_validator, ConfigDict
+from typing import Dict, List, Optional
+from pydantic import field_validator, ConfigDict, ValidationInfo
 from pydantic_settings import BaseSettings
 
 
@@ -23,12 +23,100 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./blog.db"
     DATABASE_ECHO: bool = False
+    # Serve requests through an AsyncEngine (asyncpg / aiosqlite) instead of
+    # the blocking engine. ASYNC_DATABASE_URL defaults to DATABASE_URL with the
+    # driver swapped for its async counterpart.
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pool (non-SQLite engines), applied per worker process.
+    # DATABASE_POOL_RECYCLE=-1 never recycles; LIFO reuses the most recent
+    # connection so idle ones can time out server-side. Pre-ping costs a
+    # round-trip per checkout; with a recycle below the server's idle timeout
+    # it can usually be turned off.
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 300
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_LIFO: bool = False
+    # Total connections the database allows this app; with WEB_CONCURRENCY
+    # (the uvicorn/gunicorn worker count) it caps each worker's pool
+    DATABASE_CONNECTION_BUDGET: Optional[int] = None
+    WEB_CONCURRENCY: int = 1
+    # SQLite: "shared" uses one connection for everything; "wal" enables WAL
+    # with a single writer connection plus a pool of read-only connections,
+    # so reads run concurrently (file databases only)
+    SQLITE_MODE: str = "shared"
+    SQLITE_READ_POOL_SIZE: int = 4
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536  # page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes memory-mapped per connection
+    # Read replicas for read-only service methods (list of URLs), picked
+    # "round_robin" or by "least_connections". A replica that fails is skipped
+    # for DATABASE_REPLICA_RETRY_SECONDS; with none available reads use the
+    # primary. A user's reads stay on the primary for
+    # DATABASE_REPLICA_STICKY_SECONDS after their own writes (per worker)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_REPLICA_POLICY: str = "round_robin"
+    DATABASE_REPLICA_RETRY_SECONDS: float = 30.0
+    DATABASE_REPLICA_STICKY_SECONDS: float = 5.0
+    # SQL instrumentation: statements slower than SQL_SLOW_QUERY_MS (0 = off)
+    # go to the "app.db.slow_queries" logger, and also to their own JSON file
+    # when SQL_SLOW_QUERY_LOG_FILE is set. A request repeating one statement
+    # more than SQL_REPEATED_QUERY_THRESHOLD times is logged as a possible N+1
+    SQL_SLOW_QUERY_MS: int = 500
+    SQL_SLOW_QUERY_LOG_FILE: Optional[str] = None
+    SQL_REPEATED_QUERY_THRESHOLD: int = 10
+    # How paginated blog lists compute "total": "exact" (COUNT query),
+    # "counter" (trigger-maintained blog_counters table), "window"
+    # (COUNT(*) OVER () in the page query) or "none" (total omitted)
+    BLOG_COUNT_STRATEGY: str = "exact"
+    # Rows per INSERT (and commit) for POST /blogs/import
+    BLOG_IMPORT_BATCH_SIZE: int = 1000
+    # Limits per import request (records, body bytes)
+    BLOG_IMPORT_MAX_RECORDS: int = 50000
+    BLOG_IMPORT_MAX_BODY_SIZE: int = 20 * 1024 * 1024
+    # Rows fetched per round-trip by the streamed /export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Blog search: "fulltext" (SQLite FTS5 / Postgres tsvector), "memory"
+    # (in-process inverted index, no schema changes) or "like"
+    SEARCH_BACKEND: str = "fulltext"
+    SEARCH_LANGUAGE: str = "english"  # Postgres text search configuration
+    # Snapshot file for the "memory" index, memory-mapped at startup
+    SEARCH_INDEX_PATH: Optional[str] = None
+    
+    # Response cache for anonymous blog reads: "none", "memory" (per worker)
+    # or "redis" (shared, needed for correct invalidation with several workers)
+    RESPONSE_CACHE_BACKEND: str = "none"
+    RESPONSE_CACHE_TTL: int = 30
+    RESPONSE_CACHE_SIZE: int = 1024
+    REDIS_URL: str = "redis://localhost:6379/0"
     
     # Security settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Verified-token cache (per worker); TTL of 0 disables it
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: int = 60
+    
+    # Password hashing worker pool (argon2 runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_QUEUE_POLICY: str = "reject"  # "reject" or "wait"
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+    # Bulk user provisioning: rows per INSERT and hashing threads (default: one per CPU)
+    USER_IMPORT_BATCH_SIZE: int = 500
+    USER_IMPORT_HASH_WORKERS: Optional[int] = None
+    # Limits per import request; every record costs a password hash
+    USER_IMPORT_MAX_RECORDS: int = 10000
+    USER_IMPORT_MAX_BODY_SIZE: int = 10 * 1024 * 1024
+    
+    # Accounts allowed to use admin endpoints (bulk user import and export)
+    ADMIN_EMAILS: List[str] = []
+    
     # OAuth2 settings (for future Google login integration)
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
@@ -37,9 +125,26 @@ class Settings(BaseSettings):
     # CORS settings
     ALLOWED_HOSTS: List[str] = ["*"]
     
+    # Prometheus metrics at /metrics (values are per worker process)
+    METRICS_ENABLED: bool = True
+    
     # Logging settings
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # Records go through a bounded queue to a writer thread; 0 writes inline.
+    # Full-queue policy: "drop_oldest", "drop_newest" or "block" (up to the timeout)
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_POLICY: str = "drop_oldest"
+    LOG_QUEUE_TIMEOUT: float = 1.0
+    # Request log sampling: fraction of successful (< 400) requests logged;
+    # errors and requests slower than LOG_SLOW_REQUEST_MS (0 = off) always are.
+    # LOG_SAMPLE_ROUTES overrides the rate per path prefix, e.g. {"/health": 0}
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_SLOW_REQUEST_MS: int = 1000
+    LOG_SAMPLE_ROUTES: Dict[str, float] = {}
+    # Repeated error logs: per-kind token bucket (messages/second, burst); 0 = unlimited
+    LOG_ERROR_RATE: float = 1.0
+    LOG_ERROR_BURST: int = 10
     
     @field_validator("SECRET_KEY")
     @classmethod
@@ -59,6 +164,59 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL must be provided")
         return v
     
+    @field_validator("BLOG_COUNT_STRATEGY")
+    @classmethod
+    def validate_blog_count_strategy(cls, v: str) -> str:
+        """Validate blog total counting strategy."""
+        if v not in ("exact", "counter", "window", "none"):
+            raise ValueError("BLOG_COUNT_STRATEGY must be one of: exact, counter, window, none")
+        return v
+    
+    @field_validator("SQLITE_MODE")
+    @classmethod
+    def validate_sqlite_mode(cls, v: str) -> str:
+        """Validate SQLite connection mode."""
+        if v not in ("shared", "wal"):
+            raise ValueError("SQLITE_MODE must be one of: shared, wal")
+        return v
+    
+    @field_validator("DATABASE_REPLICA_POLICY")
+    @classmethod
+    def validate_database_replica_policy(cls, v: str) -> str:
+        """Validate the replica selection policy."""
+        if v not in ("round_robin", "least_connections"):
+            raise ValueError("DATABASE_REPLICA_POLICY must be one of: round_robin, least_connections")
+        return v
+    
+    @field_validator(
+        "DATABASE_POOL_SIZE", "WEB_CONCURRENCY", "SQLITE_READ_POOL_SIZE",
+        "BLOG_IMPORT_BATCH_SIZE", "USER_IMPORT_BATCH_SIZE", "EXPORT_BATCH_SIZE",
+        "USER_IMPORT_MAX_RECORDS", "USER_IMPORT_MAX_BODY_SIZE",
+        "BLOG_IMPORT_MAX_RECORDS", "BLOG_IMPORT_MAX_BODY_SIZE"
+    )
+    @classmethod
+    def validate_positive(cls, v: int, info: ValidationInfo) -> int:
+        """Validate settings that must be at least 1."""
+        if v < 1:
+            raise ValueError(f"{info.field_name} must be at least 1")
+        return v
+    
+    @field_validator("SEARCH_BACKEND")
+    @classmethod
+    def validate_search_backend(cls, v: str) -> str:
+        """Validate blog search backend."""
+        if v not in ("fulltext", "memory", "like"):
+            raise ValueError("SEARCH_BACKEND must be one of: fulltext, memory, like")
+        return v
+    
+    @field_validator("RESPONSE_CACHE_BACKEND")
+    @classmethod
+    def validate_response_cache_backend(cls, v: str) -> str:
+        """Validate response cache backend."""
+        if v not in ("none", "memory", "redis"):
+            raise ValueError("RESPONSE_CACHE_BACKEND must be one of: none, memory, redis")
+        return v
+    
     @field_validator("ACCESS_TOKEN_EXPIRE_MINUTES")
     @classmethod
     def validate_token_expiry(cls, v: int) -> int:
@@ -69,6 +227,49 @@ class Settings(BaseSettings):
             raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES cannot exceed 1440 (24 hours)")
         return v
     
+    @field_validator("PASSWORD_HASH_WORKERS")
+    @classmethod
+    def validate_password_hash_workers(cls, v: int) -> int:
+        """Validate password hashing pool size."""
+        if v < 1:
+            raise ValueError("PASSWORD_HASH_WORKERS must be at least 1")
+        return v
+    
+    @field_validator("PASSWORD_HASH_QUEUE_POLICY")
+    @classmethod
+    def validate_password_hash_queue_policy(cls, v: str) -> str:
+        """Validate password hashing back-pressure policy."""
+        if v not in ("reject", "wait"):
+            raise ValueError("PASSWORD_HASH_QUEUE_POLICY must be 'reject' or 'wait'")
+        return v
+    
+    @field_validator("LOG_QUEUE_POLICY")
+    @classmethod
+    def validate_log_queue_policy(cls, v: str) -> str:
+        """Validate log queue full policy."""
+        if v not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError("LOG_QUEUE_POLICY must be one of: drop_oldest, drop_newest, block")
+        return v
+    
+    @field_validator("LOG_SAMPLE_RATE")
+    @classmethod
+    def validate_log_sample_rate(cls, v: float) -> float:
+        """Validate request log sample rate."""
+        if not 0 <= v <= 1:
+            raise ValueError("LOG_SAMPLE_RATE must be between 0 and 1")
+        return v
+    
+    @field_validator("LOG_SAMPLE_ROUTES")
+    @classmethod
+    def validate_log_sample_routes(cls, v: Dict[str, float]) -> Dict[str, float]:
+        """Validate per-route request log sample rates."""
+        for prefix, rate in v.items():
+            if not prefix.startswith("/"):
+                raise ValueError(f"LOG_SAMPLE_ROUTES prefix must start with '/': {prefix}")
+            if not 0 <= rate <= 1:
+                raise ValueError(f"LOG_SAMPLE_ROUTES rate for {prefix} must be between 0 and 1")
+        return v
+    
     @field_validator("ALLOWED_HOSTS")
     @classmethod
     def validate_allowed_hosts(cls, v: List[str]) -> List[str]:
@@ -2,44 +2,447 @@
 Database configuration and session management.
 Handles database connections, session creation, and connection pooling.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import Select, create_engine, event, exc
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from itertools import count
+from typing import (
+    Any, AsyncGenerator, Callable, Dict, Generator, Hashable, List, Optional, Sequence, Tuple, TypeVar, Union
+)
+from starlette.concurrency import run_in_threadpool
 import logging
+import time
 
 from app.core.config import settings
+from app.core.metrics import Counter, registry
+from app.core.query_stats import instrument_engine
 
 logger = logging.getLogger(__name__)
 
+db_pool_checkouts_total = registry.register(Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool.", ("engine",)
+))
+db_pool_wait_seconds_total = registry.register(Counter(
+    "db_pool_wait_seconds_total", "Time spent waiting to check out a pooled connection.", ("engine",)
+))
+db_pool_timeouts_total = registry.register(Counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after DATABASE_POOL_TIMEOUT.", ("engine",)
+))
+db_replica_failures_total = registry.register(Counter(
+    "db_replica_failures_total", "Replica connection failures that took a replica out of rotation.", ("engine",)
+))
+db_replica_fallbacks_total = registry.register(Counter(
+    "db_replica_fallbacks_total", "Replica reads sent to the primary.", ("reason",)
+))
+
+
+class _TimedPoolMixin:
+    """Measures how long checkouts wait for a connection; ``engine_label`` names the engine."""
+    
+    engine_label = "sync"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            db_pool_timeouts_total.inc(self.engine_label)
+            raise
+        finally:
+            db_pool_wait_seconds_total.inc(self.engine_label, amount=time.perf_counter() - start)
+
+
+def _timed_pool_class(base: type, label: str) -> type:
+    # A class per engine, because Pool.recreate() (on dispose) keeps the class,
+    # and pool log records stay under the "sqlalchemy.pool" logger (set by class module)
+    return type(
+        f"Timed{base.__name__}", (_TimedPoolMixin, base),
+        {"engine_label": label, "__module__": base.__module__}
+    )
+
+
+def get_pool_limits() -> Tuple[int, int]:
+    """
+    Pool size and overflow for one worker process.
+    
+    With DATABASE_CONNECTION_BUDGET set, the configured limits are reduced so
+    that WEB_CONCURRENCY workers together stay within the budget.
+    """
+    pool_size, max_overflow = settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW
+    budget = settings.DATABASE_CONNECTION_BUDGET
+    if budget is None:
+        return pool_size, max_overflow
+    
+    per_worker = max(1, budget // settings.WEB_CONCURRENCY)
+    if pool_size + max_overflow > per_worker:
+        pool_size = min(pool_size, per_worker)
+        max_overflow = per_worker - pool_size
+        logger.warning(
+            f"Database pool reduced to pool_size={pool_size}, max_overflow={max_overflow} "
+            f"to fit {settings.WEB_CONCURRENCY} workers into a budget of {budget} connections"
+        )
+    return pool_size, max_overflow
+
+
+def _pool_options(base: type, label: str) -> Dict[str, Any]:
+    """Engine keyword arguments for a pooled (non-SQLite) engine."""
+    pool_size, max_overflow = get_pool_limits()
+    return {
+        "poolclass": _timed_pool_class(base, label),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_use_lifo": settings.DATABASE_POOL_LIFO,
+    }
+
+
+def _is_file_sqlite(url: str) -> bool:
+    """Whether a SQLite URL names a database file (WAL needs one)."""
+    database = url.partition("://")[2].lstrip("/").split("?", 1)[0]
+    return bool(database) and database != ":memory:" and "mode=memory" not in url
+
+
+def _apply_sqlite_pragmas(target: Engine, read_only: bool = False) -> None:
+    """Configure every new SQLite connection of an engine for WAL mode."""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        # Durable across application crashes; only an OS crash can lose the last commits
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _sqlite_options(url: str, label: str, pool_base: type, read_only: bool = False) -> Dict[str, Any]:
+    """
+    Engine keyword arguments for a SQLite engine.
+    
+    In "shared" mode (or for in-memory databases) every thread shares one
+    connection. In "wal" mode a writer engine holds a single connection, so
+    writers queue in the pool instead of contending for the database lock,
+    and a read-only engine pools SQLITE_READ_POOL_SIZE connections.
+    """
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if settings.SQLITE_MODE != "wal" or not _is_file_sqlite(url):
+        options["poolclass"] = StaticPool
+        return options
+    
+    options.update(
+        poolclass=_timed_pool_class(pool_base, label),
+        pool_size=settings.SQLITE_READ_POOL_SIZE if read_only else 1,
+        max_overflow=0,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    )
+    return options
+
+
+def _wal_enabled(url: str) -> bool:
+    if settings.SQLITE_MODE != "wal" or "sqlite" not in url.lower():
+        return False
+    if not _is_file_sqlite(url):
+        logger.warning("SQLITE_MODE=wal needs a database file; using a shared connection")
+        return False
+    return True
+
+
+# Read-your-writes: key of the caller (the user id) and when each key last wrote
+_consistency_key: ContextVar[Optional[Hashable]] = ContextVar("consistency_key", default=None)
+_recent_writes: Dict[Hashable, float] = {}
+_RECENT_WRITES_LIMIT = 10000
+
+
+def set_consistency_key(key: Optional[Hashable]) -> None:
+    """
+    Identify the caller of the current request for read-your-writes.
+    
+    After a session commits a write, replica reads made under the same key
+    go to the primary for DATABASE_REPLICA_STICKY_SECONDS, so callers see
+    their own changes despite replication lag.
+    """
+    _consistency_key.set(key)
+
+
+def _note_write() -> None:
+    key = _consistency_key.get()
+    if key is None or settings.DATABASE_REPLICA_STICKY_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    if len(_recent_writes) >= _RECENT_WRITES_LIMIT:
+        for stale in [k for k, until in _recent_writes.items() if until <= now]:
+            _recent_writes.pop(stale, None)
+    _recent_writes[key] = now + settings.DATABASE_REPLICA_STICKY_SECONDS
+
+
+def _wrote_recently() -> bool:
+    key = _consistency_key.get()
+    return key is not None and _recent_writes.get(key, 0) > time.monotonic()
+
+
+class ReplicaSet:
+    """
+    Read replicas with a selection policy and passive health checks.
+    
+    A replica whose connection fails is taken out of rotation for
+    DATABASE_REPLICA_RETRY_SECONDS and then tried again. ``choose`` returns
+    None when no replica is available, and callers fall back to the primary.
+    """
+    
+    def __init__(self, engines: List[Tuple[str, Engine]], policy: str = "round_robin", retry_seconds: float = 30.0):
+        self.engines = engines
+        self.policy = policy
+        self.retry_seconds = retry_seconds
+        self._counter = count()
+        self._down_until: Dict[Engine, float] = {}
+        for label, target in engines:
+            event.listen(target, "handle_error", self._error_handler(label, target))
+    
+    def _error_handler(self, label: str, target: Engine) -> Callable[[Any], None]:
+        def _on_error(exception_context) -> None:
+            # Failed connects have no connection; lost connections are disconnects
+            if exception_context.connection is None or exception_context.is_disconnect:
+                self.mark_failed(target, label)
+        return _on_error
+    
+    def mark_failed(self, target: Engine, label: str = "replica") -> None:
+        """Take a replica out of rotation for ``retry_seconds``."""
+        if not self.is_available(target):
+            return
+        self._down_until[target] = time.monotonic() + self.retry_seconds
+        db_replica_failures_total.inc(label)
+        logger.warning(f"Database replica {label} failed; reading from other replicas for {self.retry_seconds}s")
+    
+    def is_available(self, target: Engine) -> bool:
+        return self._down_until.get(target, 0) <= time.monotonic()
+    
+    def choose(self) -> Optional[Engine]:
+        """A healthy replica picked by the policy, or None."""
+        candidates = [target for _, target in self.engines if self.is_available(target)]
+        if not candidates:
+            return None
+        if self.policy == "least_connections":
+            return min(candidates, key=lambda target: getattr(target.pool, "checkedout", lambda: 0)())
+        return candidates[next(self._counter) % len(candidates)]
+
+
+def _create_replica_engine(url: str, label: str, create: Callable[..., Any], pool_base: type) -> Any:
+    """Create the (sync or async) engine of one replica."""
+    if "sqlite" in url.lower():
+        return create(url, echo=settings.DATABASE_ECHO, **_sqlite_options(url, label, pool_base, read_only=True))
+    return create(url, echo=settings.DATABASE_ECHO, **_pool_options(pool_base, label))
+
+
 # Database engine configuration
+read_engine: Optional[Engine] = None
+
 if "sqlite" in settings.DATABASE_URL.lower():
     engine = create_engine(
         settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=settings.DATABASE_ECHO
+        echo=settings.DATABASE_ECHO,
+        **_sqlite_options(settings.DATABASE_URL, "sync", QueuePool)
     )
+    if _wal_enabled(settings.DATABASE_URL):
+        _apply_sqlite_pragmas(engine)
+        read_engine = create_engine(
+            settings.DATABASE_URL,
+            echo=settings.DATABASE_ECHO,
+            **_sqlite_options(settings.DATABASE_URL, "sync_read", QueuePool, read_only=True)
+        )
+        _apply_sqlite_pragmas(read_engine, read_only=True)
 else:
     engine = create_engine(
         settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        echo=settings.DATABASE_ECHO
+        echo=settings.DATABASE_ECHO,
+        **_pool_options(QueuePool, "sync")
+    )
+
+
+replica_set: Optional[ReplicaSet] = None
+
+if settings.DATABASE_REPLICA_URLS:
+    replica_set = ReplicaSet(
+        [
+            (f"replica{index}", _create_replica_engine(url, f"replica{index}", create_engine, QueuePool))
+            for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+        ],
+        policy=settings.DATABASE_REPLICA_POLICY,
+        retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS
     )
 
+
+class RoutingSession(Session):
+    """
+    Session sending plain SELECTs to read-only engines when configured.
+    
+    ``read_bind`` is a read-only engine on the same database (SQLite WAL
+    readers) and serves every SELECT. ``replicas`` may lag behind the
+    primary, so they only serve SELECTs made while ``info["read_only"]`` is
+    set (see ``app.services.base.read_only``) and not within the sticky
+    window after the caller's own write. A transaction keeps the replica it
+    first picked.
+    
+    Everything else (flushes, DML, textual SQL) uses the primary bind. Once
+    a transaction has touched the primary, its remaining reads stay there
+    so it sees its own uncommitted writes; the flag resets when the
+    transaction ends.
+    """
+    
+    def __init__(
+        self,
+        *args: Any,
+        read_bind: Optional[Engine] = None,
+        replicas: Optional[ReplicaSet] = None,
+        **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self.read_bind = read_bind
+        self.replicas = replicas
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (self.read_bind is not None or self.replicas is not None) and not self.info.get("use_primary"):
+            if isinstance(clause, Select) and not self._flushing:
+                bind = self._replica_bind() or self.read_bind
+                if bind is not None:
+                    return bind
+            elif clause is not None or self._flushing:
+                # A bare get_bind() (e.g. to inspect the dialect) runs nothing
+                self.info["use_primary"] = True
+        return super().get_bind(mapper, clause=clause, **kwargs)
+    
+    def _replica_bind(self) -> Optional[Engine]:
+        if self.replicas is None or not self.info.get("read_only"):
+            return None
+        replica = self.info.get("replica")
+        if replica is None:
+            if _wrote_recently():
+                db_replica_fallbacks_total.inc("recent_write")
+                return None
+            replica = self.replicas.choose()
+            if replica is None:
+                db_replica_fallbacks_total.inc("unavailable")
+                return None
+            self.info["replica"] = replica
+        return replica
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session: Session) -> None:
+    if session.info.get("use_primary"):
+        _note_write()
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("use_primary", None)
+        session.info.pop("replica", None)
+
+
 # Session factory
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    read_bind=read_engine,
+    replicas=replica_set
 )
 
 # Base class for models
 Base = declarative_base()
 
+# Either kind of session handed to services by the request dependency
+DBSession = Union[Session, AsyncSession]
+
+T = TypeVar("T")
+
+
+def get_async_database_url(url: str) -> str:
+    """Translate a synchronous database URL into its async driver equivalent."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0].lower()
+    
+    if backend == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if backend in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    
+    return url
+
+
+def _create_async_engine(read_only: bool = False) -> AsyncEngine:
+    """Create an engine used when DATABASE_ASYNC is enabled."""
+    url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    
+    if "sqlite" in url.lower():
+        label = "async_read" if read_only else "async"
+        async_engine = create_async_engine(
+            url,
+            echo=settings.DATABASE_ECHO,
+            **_sqlite_options(url, label, AsyncAdaptedQueuePool, read_only=read_only)
+        )
+        if _wal_enabled(url):
+            _apply_sqlite_pragmas(async_engine.sync_engine, read_only=read_only)
+        return async_engine
+    
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        **_pool_options(AsyncAdaptedQueuePool, "async")
+    )
+
+
+# Async engines and session factory (only created when enabled, so the async
+# drivers stay optional for synchronous deployments)
+async_engine: Optional[AsyncEngine] = None
+async_read_engine: Optional[AsyncEngine] = None
+async_replica_engines: List[AsyncEngine] = []
+async_replica_set: Optional[ReplicaSet] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+if settings.DATABASE_ASYNC:
+    async_engine = _create_async_engine()
+    if read_engine is not None:
+        async_read_engine = _create_async_engine(read_only=True)
+    if settings.DATABASE_REPLICA_URLS:
+        async_replica_engines = [
+            _create_replica_engine(
+                get_async_database_url(url), f"async_replica{index}", create_async_engine, AsyncAdaptedQueuePool
+            )
+            for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+        ]
+        async_replica_set = ReplicaSet(
+            [(f"async_replica{index}", target.sync_engine) for index, target in enumerate(async_replica_engines)],
+            policy=settings.DATABASE_REPLICA_POLICY,
+            retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS
+        )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        sync_session_class=RoutingSession,
+        read_bind=async_read_engine.sync_engine if async_read_engine is not None else None,
+        replicas=async_replica_set,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -57,6 +460,143 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+    Automatically handles session cleanup.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database support is disabled (set DATABASE_ASYNC=true)")
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await db.rollback()
+            raise
+
+
+@asynccontextmanager
+async def open_session(read_only: bool = False) -> AsyncGenerator[DBSession, None]:
+    """
+    Session of the configured kind, independent of the request.
+    
+    For work that outlives the request dependency, such as streaming
+    response bodies: dependencies with yield are closed before the body is
+    sent.
+    
+    Args:
+        read_only: Let the session's SELECTs go to read replicas
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            db.info["read_only"] = read_only
+            yield db
+        return
+    
+    db = SessionLocal()
+    db.info["read_only"] = read_only
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _count_checkouts(target: Engine, name: str) -> None:
+    """Count pool checkouts of an engine under the given label."""
+    event.listen(target, "checkout", lambda *args: db_pool_checkouts_total.inc(name))
+
+
+def get_engines() -> List[Tuple[str, Engine]]:
+    """Every configured engine (async ones as their sync facade) with its label."""
+    engines = [("sync", engine)]
+    if read_engine is not None:
+        engines.append(("sync_read", read_engine))
+    if async_engine is not None:
+        engines.append(("async", async_engine.sync_engine))
+    if async_read_engine is not None:
+        engines.append(("async_read", async_read_engine.sync_engine))
+    for replicas in (replica_set, async_replica_set):
+        if replicas is not None:
+            engines.extend(replicas.engines)
+    return engines
+
+
+for _label, _target in get_engines():
+    _count_checkouts(_target, _label)
+    instrument_engine(_target, _label)
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """
+    Connection pool utilisation of each engine.
+    
+    Pools without a fixed size (e.g. the StaticPool used for SQLite) only
+    report their class.
+    """
+    stats = []
+    for name, target in get_engines():
+        pool = target.pool
+        entry: Dict[str, Any] = {"engine": name, "pool": type(pool).__name__}
+        if hasattr(pool, "checkedout"):
+            entry.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(0, pool.overflow()),
+            )
+        stats.append(entry)
+    return stats
+
+
+# Request-scoped session dependency selected by configuration
+get_session = get_async_db if settings.DATABASE_ASYNC else get_db
+
+
+async def run_in_session(
+    db: DBSession,
+    fn: Callable[..., T],
+    *args: Any,
+    **kwargs: Any
+) -> T:
+    """
+    Run synchronous ORM code against a request session.
+    
+    With an AsyncSession the call goes through ``run_sync`` so database I/O is
+    awaited on the async driver instead of blocking the event loop; a plain
+    Session is passed straight through.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+
+async def stream_partitions(db: DBSession, statement: Select, size: int) -> AsyncGenerator[Sequence[Row], None]:
+    """
+    Run a SELECT and yield its rows in lists of up to ``size``.
+    
+    The statement runs with ``yield_per``, so the result is never buffered
+    in full and drivers that support it read from a server-side cursor.
+    With a plain Session each partition is fetched in the thread pool,
+    keeping the event loop free.
+    """
+    statement = statement.execution_options(yield_per=size)
+    if isinstance(db, AsyncSession):
+        result = await db.stream(statement)
+        async for partition in result.partitions():
+            yield partition
+        return
+    
+    result = await run_in_threadpool(db.execute, statement)
+    partitions = result.partitions()
+    while True:
+        partition = await run_in_threadpool(next, partitions, None)
+        if partition is None:
+            return
+        yield partition
+
+
 @contextmanager
 def get_db_context() -> Generator[Session, None, None]:
     """
@@ -85,3 +625,16 @@ def init_db() -> None:
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
+
+
+async def close_db() -> None:
+    """Release pooled connections held by the database engines."""
+    for async_target in (*async_replica_engines, async_read_engine, async_engine):
+        if async_target is not None:
+            await async_target.dispose()
+    if replica_set is not None:
+        for _, replica in replica_set.engines:
+            replica.dispose()
+    if read_engine is not None:
+        read_engine.dispose()
+    engine.dispose()
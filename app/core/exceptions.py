@@ -79,6 +79,27 @@ class DatabaseError(AppException):
         )
 
 
+class PayloadTooLargeError(AppException):
+    """Request body exceeding a configured limit."""
+    
+    def __init__(self, detail: str = "Request body too large"):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=detail
+        )
+
+
+class ServiceUnavailableError(AppException):
+    """Temporary overload errors; clients should retry later."""
+    
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 def handle_exception(exc: Exception) -> Dict[str, Any]:
     """Handle exceptions and return consistent error response."""
     if isinstance(exc, AppException):
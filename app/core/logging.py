@@ -1,25 +1,69 @@
 """
 Logging configuration for the application.
-Provides structured logging with different levels and outputs.
+Provides structured logging with different levels and outputs. Records are
+handed to a bounded queue and written by a background listener thread, so
+logging calls never wait on stdout or disk.
 """
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import json
 from datetime import datetime, timezone
 
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def _json_dumps(value: Any) -> str:
+    """Compact JSON encoding; non-JSON values fall back to str()."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str).decode()
+    return json.dumps(value, default=str, separators=(",", ":"), ensure_ascii=False)
+
 
 class JSONFormatter(logging.Formatter):
-    """Custom JSON formatter for structured logging."""
+    """
+    JSON formatter for structured logging, tuned for throughput.
+    
+    Static fields (service name and version) are encoded once and spliced
+    in front of each record, the timestamp is taken from the record with its
+    second-resolution prefix cached, and ``extra_fields`` go straight into
+    the per-record dict in a single encode. Uses orjson when installed.
+    """
+    
+    def __init__(self, static_fields: Optional[Dict[str, Any]] = None, **kwargs):
+        super().__init__(**kwargs)
+        if static_fields is None:
+            static_fields = {"service": settings.APP_NAME, "version": settings.APP_VERSION}
+        encoded = _json_dumps(static_fields)
+        # '"service":...,"version":...,' ready to prefix each record's fields
+        self._static = encoded[1:-1] + "," if static_fields else ""
+        self._second = None
+        self._second_prefix = ""
+    
+    def _timestamp(self, created: float) -> str:
+        """ISO 8601 UTC timestamp of a record, reusing the per-second prefix."""
+        second = int(created)
+        if second != self._second:
+            self._second_prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._second = second
+        return f"{self._second_prefix}.{int((created - second) * 1e6):06d}+00:00"
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -33,10 +77,11 @@ class JSONFormatter(logging.Formatter):
             log_entry["exception"] = self.formatException(record.exc_info)
         
         # Add extra fields if present
-        if hasattr(record, 'extra_fields'):
-            log_entry.update(record.extra_fields)
+        extra_fields = getattr(record, "extra_fields", None)
+        if extra_fields:
+            log_entry.update(extra_fields)
         
-        return json.dumps(log_entry)
+        return "{" + self._static + _json_dumps(log_entry)[1:]
 
 
 class ColoredFormatter(logging.Formatter):
@@ -69,6 +114,231 @@ class ColoredFormatter(logging.Formatter):
         return formatted
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler with an explicit policy for a full queue.
+    
+    Policies: "drop_oldest" discards the oldest queued record to make room,
+    "drop_newest" discards the incoming record and "block" waits up to
+    ``timeout`` seconds for room before dropping it. Dropped records are
+    counted rather than reported through logging.
+    """
+    
+    POLICIES = ("drop_oldest", "drop_newest", "block")
+    
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop_oldest", timeout: float = 1.0):
+        super().__init__(log_queue)
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown log queue policy: {policy}")
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message arguments now, leaving formatting to the listener.
+        
+        Arguments are rendered in the calling thread because they may be
+        objects (e.g. ORM instances) that are unsafe to touch elsewhere.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue according to the full-queue policy."""
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.timeout)
+            else:
+                self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if self.policy != "drop_oldest":
+                self._count_drop()
+                return
+        
+        # Make room by discarding the oldest record; racing producers may refill it
+        try:
+            self.queue.get_nowait()
+            self._count_drop()
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._count_drop()
+    
+    def _count_drop(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+# Active queue handler and listener (None when logging writes synchronously)
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queued_loggers: List[str] = []
+
+
+def _start_queue_listener(logger_names: List[str]) -> None:
+    """Move the configured handlers behind a bounded queue and a listener thread."""
+    global _queue_handler, _queue_listener, _queued_loggers
+    
+    handlers: List[logging.Handler] = []
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            if handler not in handlers:
+                handlers.append(handler)
+            logger.removeHandler(handler)
+    if not handlers:
+        return
+    
+    _queue_handler = BoundedQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_SIZE),
+        policy=settings.LOG_QUEUE_POLICY,
+        timeout=settings.LOG_QUEUE_TIMEOUT
+    )
+    for name in logger_names:
+        logging.getLogger(name).addHandler(_queue_handler)
+    _queued_loggers = list(logger_names)
+    
+    _queue_listener = logging.handlers.QueueListener(
+        _queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records to their handlers and stop the listener thread.
+    
+    Safe to call more than once; logging falls back to the handlers directly
+    so records emitted afterwards are still written.
+    """
+    global _queue_handler, _queue_listener
+    
+    listener, handler = _queue_listener, _queue_handler
+    _queue_listener = _queue_handler = None
+    if listener is None:
+        return
+    
+    listener.stop()  # drains the queue before returning
+    for name in _queued_loggers:
+        logger = logging.getLogger(name)
+        if handler in logger.handlers:
+            logger.removeHandler(handler)
+            for target in listener.handlers:
+                logger.addHandler(target)
+    for target in listener.handlers:
+        try:
+            target.flush()
+        except (OSError, ValueError):
+            # Stream already closed (interpreter exit); as logging.shutdown does
+            pass
+
+
+def get_log_queue_stats() -> Dict[str, Any]:
+    """Queue depth and drop counters of the log pipeline."""
+    handler = _queue_handler
+    if handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "policy": handler.policy,
+        "capacity": handler.queue.maxsize,
+        "depth": handler.queue.qsize(),
+        "dropped": handler.dropped,
+    }
+
+
+class TokenBucket:
+    """Token bucket refilling at ``rate`` tokens per second up to ``burst``."""
+    
+    __slots__ = ("rate", "burst", "tokens", "updated")
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+    
+    def take(self) -> bool:
+        """Consume a token if one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LogRateLimiter:
+    """
+    Per-key token buckets for repetitive log messages.
+    
+    Callers pass a key identifying the kind of message (e.g. exception type
+    and route) and only log when ``allow`` returns a truthy value. Suppressed
+    messages are counted per key and the count is returned with the next
+    allowed message so it can be reported. A ``rate`` of 0 disables limiting.
+    """
+    
+    def __init__(self, rate: float, burst: int, max_keys: int = 1024):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.suppressed = 0
+        self._buckets: Dict[Any, TokenBucket] = {}
+        self._pending: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+    
+    def allow(self, key: Any) -> Optional[int]:
+        """
+        Check whether a message for ``key`` may be logged.
+        
+        Returns:
+            None if the message should be dropped, otherwise the number of
+            messages for this key suppressed since the last one allowed
+        """
+        if self.rate <= 0:
+            return 0
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    # Forget the oldest key; it simply starts with a full bucket again
+                    oldest = next(iter(self._buckets))
+                    del self._buckets[oldest]
+                    self._pending.pop(oldest, None)
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            if bucket.take():
+                return self._pending.pop(key, 0)
+            self._pending[key] = self._pending.get(key, 0) + 1
+            self.suppressed += 1
+            return None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Suppression counters."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "keys": len(self._buckets),
+            "suppressed": self.suppressed,
+        }
+
+
+def suppressed_note(suppressed: int) -> str:
+    """Log message suffix reporting how many similar messages were suppressed."""
+    return f" ({suppressed} similar suppressed)" if suppressed else ""
+
+
+# Limits repeated error logs from the request middleware and exception handlers
+error_log_limiter = LogRateLimiter(settings.LOG_ERROR_RATE, settings.LOG_ERROR_BURST)
+
+
+atexit.register(shutdown_logging)
+
+
 def setup_logging(
     log_level: str = "INFO",
     log_file: str = None,
@@ -77,6 +347,9 @@ def setup_logging(
 ) -> None:
     """Setup logging configuration."""
     
+    # Stop any previous listener so its queued records are not lost
+    shutdown_logging()
+    
     # Create logs directory if it doesn't exist
     if log_file:
         log_path = Path(log_file)
@@ -153,9 +426,28 @@ def setup_logging(
         for logger_name in config["loggers"]:
             config["loggers"][logger_name]["handlers"].append("file")
     
+    # Slow queries (logged under "app") also go to their own file
+    if settings.SQL_SLOW_QUERY_LOG_FILE:
+        Path(settings.SQL_SLOW_QUERY_LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+        config["filters"] = {"slow_queries": {"name": "app.db.slow_queries"}}
+        config["handlers"]["slow_queries"] = {
+            "class": "logging.handlers.RotatingFileHandler",
+            "level": "WARNING",
+            "formatter": "json",
+            "filters": ["slow_queries"],
+            "filename": settings.SQL_SLOW_QUERY_LOG_FILE,
+            "maxBytes": 10485760,  # 10MB
+            "backupCount": 5
+        }
+        config["loggers"]["app"]["handlers"].append("slow_queries")
+    
     # Apply configuration
     logging.config.dictConfig(config)
     
+    # Write records from a background thread (LOG_QUEUE_SIZE=0 writes inline)
+    if settings.LOG_QUEUE_SIZE > 0:
+        _start_queue_listener(list(config["loggers"]))
+    
     # Set specific logger levels
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
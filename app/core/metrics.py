@@ -0,0 +1,218 @@
+"""
+Prometheus-style metrics.
+Keeps request counters and latency histograms in plain per-process
+structures and renders them, together with pool and cache statistics
+gathered at scrape time, in the Prometheus text exposition format.
+"""
+from bisect import bisect_left
+from threading import get_ident
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, Any], float]
+
+
+class Counter:
+    """
+    Monotonic counter with labels.
+    
+    Updates take no lock: each thread increments its own shard and shards
+    are summed when the counter is collected. Under the GIL a thread only
+    ever writes its own entries, so no increment is lost.
+    """
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards: Dict[int, Dict[LabelValues, float]] = {}
+    
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        """Add ``amount`` to the series identified by ``labelvalues``."""
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._shards.setdefault(get_ident(), {})
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+    
+    def values(self) -> Dict[LabelValues, float]:
+        """Totals per label set across all threads."""
+        totals: Dict[LabelValues, float] = {}
+        for shard in list(self._shards.values()):
+            for labelvalues, value in list(shard.items()):
+                totals[labelvalues] = totals.get(labelvalues, 0) + value
+        return totals
+    
+    def collect(self) -> Tuple[str, str, List[Sample]]:
+        samples = [
+            (self.name, dict(zip(self.labelnames, labelvalues)), value)
+            for labelvalues, value in sorted(self.values().items())
+        ]
+        return "counter", self.documentation, samples
+
+
+class Gauge:
+    """
+    Gauge with labels, set or adjusted in place.
+    
+    Meant to be updated from a single thread (the event loop); values are
+    read as-is at scrape time.
+    """
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+    
+    def dec(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) - amount
+    
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+    
+    def collect(self) -> Tuple[str, str, List[Sample]]:
+        samples = [
+            (self.name, dict(zip(self.labelnames, labelvalues)), value)
+            for labelvalues, value in sorted(list(self._values.items()))
+        ]
+        return "gauge", self.documentation, samples
+
+
+class Histogram:
+    """
+    Histogram with labels and fixed upper bounds.
+    
+    Observations update one bucket count plus the sum; cumulative bucket
+    values are only computed at scrape time. Like Gauge, it is meant to be
+    updated from the event loop thread only.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last one is +Inf)..., sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+    
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for the series identified by ``labelvalues``."""
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    def collect(self) -> Tuple[str, str, List[Sample]]:
+        samples: List[Sample] = []
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for labelvalues, series in sorted(list(self._series.items())):
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": bound}, cumulative))
+            samples.append((f"{self.name}_sum", labels, series[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return "histogram", self.documentation, samples
+
+
+# Scrape-time collector: yields (name, type, help, samples) families
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+
+class MetricsRegistry:
+    """Metrics owned by this process plus collectors queried at scrape time."""
+    
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._collectors: List[Collector] = []
+    
+    def register(self, metric: Any) -> Any:
+        """Add a Counter, Gauge or Histogram and return it."""
+        self._metrics.append(metric)
+        return metric
+    
+    def add_collector(self, collector: Collector) -> Collector:
+        """Add a function producing metric families when scraped."""
+        self._collectors.append(collector)
+        return collector
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        lines: List[str] = []
+        families = [(metric.name, *metric.collect()) for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        
+        for name, kind, documentation, samples in families:
+            if not samples:
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def gauge_family(name: str, documentation: str, samples: List[Sample]) -> Tuple[str, str, str, List[Sample]]:
+    """A gauge family for collectors."""
+    return name, "gauge", documentation, samples
+
+
+def counter_family(name: str, documentation: str, samples: List[Sample]) -> Tuple[str, str, str, List[Sample]]:
+    """A counter family for collectors."""
+    return name, "counter", documentation, samples
+
+
+# Global registry; each worker process exposes its own values
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is sent.", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+))
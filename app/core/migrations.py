@@ -3,9 +3,10 @@ Simple database migration system.
 For production use, consider using Alembic.
 """
 import logging
-from sqlalchemy import text
+from sqlalchemy import inspect, text
+from app.core.config import settings
 from app.core.database import engine, Base
-from app.models import user, blog
+from app.models import user, blog, blog_counter
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,18 @@ def run_migrations():
         
         # Run any additional migrations
         with engine.connect() as connection:
+            # Add columns introduced after a table was first created
+            add_missing_columns(connection)
+            
             # Add indexes if they don't exist
             create_indexes(connection)
             
+            # Add triggers that maintain derived tables
+            create_triggers(connection)
+            
+            # Add full-text search structures
+            create_search_index(connection)
+            
             # Add any data migrations
             run_data_migrations(connection)
             
@@ -43,6 +53,11 @@ def create_indexes(connection):
             "CREATE INDEX IF NOT EXISTS idx_blogs_creator_id ON blogs(creator_id)",
             "CREATE INDEX IF NOT EXISTS idx_blogs_created_at ON blogs(created_at)",
             "CREATE INDEX IF NOT EXISTS idx_blogs_published ON blogs(is_published)",
+            # Composite indexes backing keyset pagination (created_at, id)
+            "CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users(created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_blogs_created_at_id ON blogs(created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_blogs_published_created_at_id ON blogs(is_published, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_blogs_creator_created_at_id ON blogs(creator_id, created_at, id)",
         ]
         
         for index_sql in indexes:
@@ -55,6 +70,303 @@ def create_indexes(connection):
         logger.warning(f"Index creation failed (may already exist): {e}")
 
 
+# Columns added to existing tables: (table, column, DDL type and default)
+ADDED_COLUMNS = [
+    ("blog_counters", "version", "INTEGER NOT NULL DEFAULT 0"),
+    ("blog_counters", "changed_at", "TIMESTAMP"),
+]
+
+
+def add_missing_columns(connection):
+    """Add ADDED_COLUMNS to tables created before those columns existed."""
+    try:
+        inspector = inspect(connection)
+        for table, column, ddl in ADDED_COLUMNS:
+            existing = {col["name"] for col in inspector.get_columns(table)}
+            if column not in existing:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                logger.info(f"Added column {table}.{column}")
+        
+        connection.commit()
+        
+    except Exception as e:
+        connection.rollback()
+        logger.warning(f"Adding columns failed: {e}")
+
+
+SQLITE_COUNTER_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blog_counters_insert AFTER INSERT ON blogs
+    BEGIN
+        INSERT OR IGNORE INTO blog_counters (creator_id, total, published)
+            VALUES (0, 0, 0), (NEW.creator_id, 0, 0);
+        UPDATE blog_counters
+            SET total = total + 1,
+                published = published + (CASE WHEN NEW.is_published THEN 1 ELSE 0 END)
+            WHERE creator_id IN (0, NEW.creator_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blog_counters_delete AFTER DELETE ON blogs
+    BEGIN
+        UPDATE blog_counters
+            SET total = total - 1,
+                published = published - (CASE WHEN OLD.is_published THEN 1 ELSE 0 END)
+            WHERE creator_id IN (0, OLD.creator_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blog_counters_update
+    AFTER UPDATE OF is_published, creator_id ON blogs
+    WHEN OLD.is_published IS NOT NEW.is_published OR OLD.creator_id IS NOT NEW.creator_id
+    BEGIN
+        INSERT OR IGNORE INTO blog_counters (creator_id, total, published)
+            VALUES (NEW.creator_id, 0, 0);
+        UPDATE blog_counters
+            SET total = total - 1,
+                published = published - (CASE WHEN OLD.is_published THEN 1 ELSE 0 END)
+            WHERE creator_id IN (0, OLD.creator_id);
+        UPDATE blog_counters
+            SET total = total + 1,
+                published = published + (CASE WHEN NEW.is_published THEN 1 ELSE 0 END)
+            WHERE creator_id IN (0, NEW.creator_id);
+    END
+    """,
+    # Versions change on every write, for ETags and Last-Modified
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blog_versions_insert AFTER INSERT ON blogs
+    BEGIN
+        INSERT OR IGNORE INTO blog_counters (creator_id, total, published)
+            VALUES (0, 0, 0), (NEW.creator_id, 0, 0);
+        UPDATE blog_counters
+            SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+            WHERE creator_id IN (0, NEW.creator_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blog_versions_update AFTER UPDATE ON blogs
+    BEGIN
+        INSERT OR IGNORE INTO blog_counters (creator_id, total, published)
+            VALUES (NEW.creator_id, 0, 0);
+        UPDATE blog_counters
+            SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+            WHERE creator_id IN (0, OLD.creator_id, NEW.creator_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blog_versions_delete AFTER DELETE ON blogs
+    BEGIN
+        UPDATE blog_counters
+            SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+            WHERE creator_id IN (0, OLD.creator_id);
+    END
+    """,
+]
+
+POSTGRES_COUNTER_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION blog_counters_apply(p_creator integer, p_total integer, p_published integer)
+    RETURNS void AS $$
+    BEGIN
+        INSERT INTO blog_counters (creator_id, total, published)
+            VALUES (0, 0, 0), (p_creator, 0, 0)
+            ON CONFLICT (creator_id) DO NOTHING;
+        UPDATE blog_counters
+            SET total = total + p_total, published = published + p_published
+            WHERE creator_id IN (0, p_creator);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION blog_counters_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM blog_counters_apply(OLD.creator_id, -1, CASE WHEN OLD.is_published THEN -1 ELSE 0 END);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM blog_counters_apply(NEW.creator_id, 1, CASE WHEN NEW.is_published THEN 1 ELSE 0 END);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_blog_counters ON blogs",
+    """
+    CREATE TRIGGER trg_blog_counters
+    AFTER INSERT OR DELETE OR UPDATE OF is_published, creator_id ON blogs
+    FOR EACH ROW EXECUTE FUNCTION blog_counters_trigger()
+    """,
+    # Versions change on every write, for ETags and Last-Modified
+    """
+    CREATE OR REPLACE FUNCTION blog_versions_trigger() RETURNS trigger AS $$
+    DECLARE
+        creators integer[];
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            creators := ARRAY[0, OLD.creator_id];
+        ELSIF TG_OP = 'UPDATE' THEN
+            creators := ARRAY[0, OLD.creator_id, NEW.creator_id];
+        ELSE
+            creators := ARRAY[0, NEW.creator_id];
+        END IF;
+        INSERT INTO blog_counters (creator_id, total, published)
+            SELECT DISTINCT unnest(creators), 0, 0
+            ON CONFLICT (creator_id) DO NOTHING;
+        UPDATE blog_counters
+            SET version = version + 1, changed_at = now()
+            WHERE creator_id = ANY(creators);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_blog_versions ON blogs",
+    """
+    CREATE TRIGGER trg_blog_versions
+    AFTER INSERT OR UPDATE OR DELETE ON blogs
+    FOR EACH ROW EXECUTE FUNCTION blog_versions_trigger()
+    """,
+]
+
+
+def create_triggers(connection):
+    """Create triggers that keep blog_counters in step with blogs."""
+    try:
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            statements = SQLITE_COUNTER_TRIGGERS
+        elif dialect == "postgresql":
+            statements = POSTGRES_COUNTER_TRIGGERS
+        else:
+            logger.warning(f"Blog counter triggers are not supported on {dialect}")
+            return
+        
+        for trigger_sql in statements:
+            connection.execute(text(trigger_sql))
+        
+        # Seed the counters the first time the triggers are installed
+        if connection.execute(text("SELECT COUNT(*) FROM blog_counters")).scalar() == 0:
+            rebuild_blog_counters(connection)
+        
+        connection.commit()
+        logger.info("Database triggers created successfully")
+        
+    except Exception as e:
+        connection.rollback()
+        logger.warning(f"Trigger creation failed: {e}")
+
+
+def rebuild_blog_counters(connection):
+    """Recompute blog_counters from the blogs table."""
+    published = "COALESCE(SUM(CASE WHEN is_published THEN 1 ELSE 0 END), 0)"
+    # Versions must never go back, or old ETags would match again
+    version = connection.execute(text("SELECT COALESCE(MAX(version), 0) FROM blog_counters")).scalar()
+    connection.execute(text("DELETE FROM blog_counters"))
+    connection.execute(text(f"""
+        INSERT INTO blog_counters (creator_id, total, published)
+        SELECT creator_id, COUNT(*), {published} FROM blogs GROUP BY creator_id
+    """))
+    connection.execute(text(f"""
+        INSERT INTO blog_counters (creator_id, total, published)
+        SELECT 0, COUNT(*), {published} FROM blogs
+    """))
+    connection.execute(
+        text("UPDATE blog_counters SET version = :version, changed_at = CURRENT_TIMESTAMP"),
+        {"version": version + 1}
+    )
+
+
+def recount_blogs():
+    """Rebuild the blog counters (e.g. after manual data changes)."""
+    try:
+        with engine.connect() as connection:
+            rebuild_blog_counters(connection)
+            connection.commit()
+        
+        logger.info("Blog counters rebuilt")
+        
+    except Exception as e:
+        logger.error(f"Blog counter rebuild failed: {e}")
+        raise
+
+
+SQLITE_SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blogs_fts_insert AFTER INSERT ON blogs
+    BEGIN
+        INSERT INTO blogs_fts (rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blogs_fts_delete AFTER DELETE ON blogs
+    BEGIN
+        INSERT INTO blogs_fts (blogs_fts, rowid, title, content)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_blogs_fts_update AFTER UPDATE OF title, content ON blogs
+    BEGIN
+        INSERT INTO blogs_fts (blogs_fts, rowid, title, content)
+            VALUES ('delete', OLD.id, OLD.title, OLD.content);
+        INSERT INTO blogs_fts (rowid, title, content) VALUES (NEW.id, NEW.title, NEW.content);
+    END
+    """,
+]
+
+
+def create_search_index(connection):
+    """Create the full-text search index over blog titles and content."""
+    if settings.SEARCH_BACKEND != "fulltext":
+        logger.info("Skipping full-text search index (SEARCH_BACKEND is not fulltext)")
+        return
+    
+    try:
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            exists = connection.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'blogs_fts'"
+            )).first()
+            
+            # External-content FTS5 table: stores only the index, rows live in blogs
+            connection.execute(text("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(
+                    title, content,
+                    content='blogs', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """))
+            for trigger_sql in SQLITE_SEARCH_TRIGGERS:
+                connection.execute(text(trigger_sql))
+            
+            if not exists:
+                connection.execute(text("INSERT INTO blogs_fts (blogs_fts) VALUES ('rebuild')"))
+        
+        elif dialect == "postgresql":
+            # Generated column keeps the weighted vector in sync without triggers
+            language = settings.SEARCH_LANGUAGE
+            connection.execute(text(f"""
+                ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{language}', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('{language}', coalesce(content, '')), 'B')
+                ) STORED
+            """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_blogs_search_vector ON blogs USING GIN (search_vector)"
+            ))
+        
+        else:
+            logger.warning(f"Full-text search is not supported on {dialect}")
+            return
+        
+        connection.commit()
+        logger.info("Search index created successfully")
+        
+    except Exception as e:
+        connection.rollback()
+        logger.warning(f"Search index creation failed: {e}")
+
+
 def run_data_migrations(connection):
     """Run data migrations."""
     try:
@@ -100,6 +412,8 @@ def rollback_migrations():
     try:
         with engine.connect() as connection:
             # Drop all tables
+            connection.execute(text("DROP TABLE IF EXISTS blogs_fts"))
+            connection.execute(text("DROP TABLE IF EXISTS blog_counters"))
             connection.execute(text("DROP TABLE IF EXISTS blogs"))
             connection.execute(text("DROP TABLE IF EXISTS users"))
             connection.commit()
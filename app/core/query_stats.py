@@ -0,0 +1,146 @@
+"""
+SQL query instrumentation.
+Times every statement run through the database engines, keeps per-request
+query counts for the request log and metrics, and writes statements slower
+than SQL_SLOW_QUERY_MS to a slow-query log under a normalized fingerprint.
+"""
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import Counter, registry
+
+slow_query_logger = logging.getLogger("app.db.slow_queries")
+
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "SQL statements executed.", ("engine",)
+))
+db_query_duration_seconds_total = registry.register(Counter(
+    "db_query_duration_seconds_total", "Time spent executing SQL statements.", ("engine",)
+))
+db_slow_queries_total = registry.register(Counter(
+    "db_slow_queries_total", "SQL statements slower than SQL_SLOW_QUERY_MS.", ("engine",)
+))
+
+
+class QueryStats:
+    """Statements executed on behalf of one request."""
+    
+    __slots__ = ("count", "duration", "statements")
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # Keyed by the parameterized statement, so repeats with other values match
+        self.statements: StatementCounter = StatementCounter()
+    
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+    
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run more than ``threshold`` times, most frequent first."""
+        if threshold <= 0:
+            return []
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count > threshold
+        ]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect the statements executed in the current context.
+    
+    Nested calls share the outermost collector, so several middlewares can
+    read the same request's figures. The context is copied into the thread
+    pool running sync endpoints, and the collector is shared with it.
+    """
+    stats = _current_stats.get()
+    if stats is not None:
+        yield stats
+        return
+    
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so executions differing only in values group together.
+    
+    Literals and bind placeholders of every paramstyle become ``?`` and
+    expanded IN lists collapse to ``(?+)``.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return _PLACEHOLDER_LIST.sub("(?+)", normalized)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Attach timing hooks to a (sync) engine.
+    
+    Args:
+        engine: Engine to instrument; pass ``async_engine.sync_engine`` for async engines
+        name: Value of the ``engine`` metrics label
+    """
+    slow_threshold = settings.SQL_SLOW_QUERY_MS / 1000
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        db_queries_total.inc(name)
+        db_query_duration_seconds_total.inc(name, amount=duration)
+        
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        
+        if slow_threshold > 0 and duration >= slow_threshold:
+            db_slow_queries_total.inc(name)
+            sql = fingerprint(statement)
+            slow_query_logger.warning(
+                "Slow query (%.1f ms): %s", duration * 1000, sql,
+                extra={"extra_fields": {"duration_ms": round(duration * 1000, 3), "fingerprint": sql, "engine": name}}
+            )
+    
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(exception_context):
+        # after_cursor_execute does not run for failed statements
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
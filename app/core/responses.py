@@ -0,0 +1,111 @@
+"""
+Response helpers.
+Provides the application's JSON response class, encoded with orjson when
+installed, and serializes response models straight to JSON bytes for hot
+read paths.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Sequence
+from uuid import UUID
+import json
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def _encode_default(value: Any) -> Any:
+    """
+    Encode the non-JSON types responses carry: models, dates and times,
+    UUIDs and Decimals (as numbers, like ``jsonable_encoder``).
+    
+    Raises:
+        TypeError: For any other type, as the stdlib encoder does
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, as JSONResponse renders it.
+    
+    Uses orjson when installed, which also encodes datetimes, UUIDs and
+    dataclasses natively; pydantic models are dumped in JSON mode either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_encode_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with ``dumps``.
+    
+    The application's default response class, so endpoint results and
+    error handler bodies skip the stdlib encoder when orjson is installed.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize a response model to a JSON Response in one step.
+    
+    ``model_dump_json`` runs in pydantic-core. Returning a Response also
+    skips FastAPI's handling of a model return value (dump to dict,
+    validate against ``response_model``, ``jsonable_encoder``,
+    ``json.dumps``), so the model must already be the declared response
+    type.
+    
+    Args:
+        model: Response model, e.g. a page validated from column row dicts
+        status_code: HTTP status code
+        headers: Extra response headers
+    
+    Returns:
+        JSON response with the serialized model
+    """
+    return Response(
+        model.model_dump_json().encode(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
+
+
+def models_response(
+    models: Sequence[BaseModel],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """JSON array of response models, serialized like ``model_response``."""
+    items = [model.model_dump_json() for model in models]
+    return Response(
+        f"[{','.join(items)}]".encode(),
+        headers=headers,
+        media_type="application/json"
+    )
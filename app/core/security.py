@@ -2,13 +2,21 @@
 Security utilities for authentication and authorization.
 Handles password hashing, JWT tokens, and security functions.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 from argon2 import PasswordHasher
 from jose import JWTError, jwt
+import asyncio
 import logging
+import os
+import threading
+import time
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.utils.helpers import generate_hash
 
 logger = logging.getLogger(__name__)
 
@@ -69,28 +77,259 @@ class SecurityManager:
             raise ValueError("Failed to create access token")
     
     @staticmethod
-    def verify_token(token: str) -> Optional[str]:
-        """Verify and decode a JWT token."""
+    def decode_token(token: str) -> Optional[dict]:
+        """Verify a JWT token and return its payload."""
         try:
-            payload = jwt.decode(
+            return jwt.decode(
                 token, 
                 settings.SECRET_KEY, 
                 algorithms=[settings.ALGORITHM]
             )
             
-            email: str = payload.get("sub")
-            if email is None:
-                return None
-                
-            return email
-            
         except JWTError as e:
             logger.warning(f"JWT token verification failed: {e}")
             return None
         except Exception as e:
             logger.error(f"Token verification error: {e}")
             return None
+    
+    @staticmethod
+    def verify_token(token: str) -> Optional[str]:
+        """Verify and decode a JWT token."""
+        payload = SecurityManager.decode_token(token)
+        if payload is None:
+            return None
+        
+        email: str = payload.get("sub")
+        if email is None:
+            return None
+            
+        return email
 
 
 # Global security manager instance
 security_manager = SecurityManager()
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for argon2 hashing and verification.
+    
+    argon2-cffi releases the GIL while hashing, so a small thread pool keeps
+    the event loop free without the pickling cost of a process pool. At most
+    ``workers + queue_size`` operations are admitted at once; beyond that the
+    pool either rejects immediately or waits up to ``queue_timeout`` seconds
+    for a slot, raising ServiceUnavailableError (503) in both cases.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 32,
+        policy: str = "reject",
+        queue_timeout: float = 5.0
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.policy = policy
+        self.queue_timeout = queue_timeout
+        self.capacity = workers + queue_size
+        
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the executor on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="argon2"
+                )
+            return self._executor
+    
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Admission semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.capacity)
+            self._slots_loop = loop
+        return self._slots
+    
+    def _reject(self) -> ServiceUnavailableError:
+        """Count a rejected request and build the error to raise."""
+        with self._lock:
+            self._rejected += 1
+        logger.warning(f"Password hashing pool saturated ({self.capacity} pending)")
+        return ServiceUnavailableError("Too many concurrent authentication requests, retry shortly")
+    
+    async def _acquire(self, slots: asyncio.Semaphore) -> None:
+        """Take an admission slot according to the back-pressure policy."""
+        if not slots.locked():
+            await slots.acquire()
+            return
+        
+        if self.policy == "reject":
+            raise self._reject()
+        
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject()
+    
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn`` on the pool once an admission slot is available."""
+        slots = self._get_slots()
+        await self._acquire(slots)
+        
+        with self._lock:
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+            slots.release()
+    
+    async def hash_password(self, password: str) -> str:
+        """Hash a password on the worker pool."""
+        return await self.run(SecurityManager.hash_password, password)
+    
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash on the worker pool."""
+        return await self.run(SecurityManager.verify_password, plain_password, hashed_password)
+    
+    def hash_passwords(self, passwords: List[str]) -> List[str]:
+        """
+        Hash a batch of passwords across all workers, blocking until done.
+        
+        Meant for bulk jobs running off the event loop; there is no
+        admission control, the batch simply queues on the executor.
+        """
+        with self._lock:
+            self._pending += len(passwords)
+            self._peak_pending = max(self._peak_pending, self._pending)
+        
+        try:
+            return list(self._get_executor().map(SecurityManager.hash_password, passwords))
+        finally:
+            with self._lock:
+                self._pending -= len(passwords)
+                self._completed += len(passwords)
+    
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of pool utilisation for monitoring."""
+        with self._lock:
+            pending = self._pending
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": min(pending, self.workers),
+                "queue_depth": max(0, pending - self.workers),
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads, waiting for running jobs to finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Global password hashing pool
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    policy=settings.PASSWORD_HASH_QUEUE_POLICY,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT
+)
+
+# Separate pool for bulk user provisioning, so imports never hold the slots
+# that logins and sign-ups wait for
+bulk_password_hash_pool = PasswordHashPool(
+    workers=settings.USER_IMPORT_HASH_WORKERS or os.cpu_count() or 1,
+    queue_size=0
+)
+
+
+class VerifiedTokenCache:
+    """
+    Cache of already-verified bearer tokens.
+    
+    Entries are keyed by a SHA-256 of the token (raw tokens are never kept),
+    hold a lightweight principal instead of an ORM object, and expire after
+    ``ttl`` seconds or at the token's own ``exp``, whichever comes first.
+    The cache is per process, so invalidation only reaches the current
+    worker; the TTL bounds staleness elsewhere.
+    """
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tokens_by_user: Dict[int, set] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached principal for a token, if still valid."""
+        entry = self._cache.get(generate_hash(token))
+        return entry[1] if entry is not None else None
+    
+    def set(self, token: str, user_id: int, principal: Any, expires_at: Optional[float] = None) -> None:
+        """Cache a principal until the TTL or the token expiry (epoch seconds)."""
+        ttl = self._cache.ttl
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        
+        key = generate_hash(token)
+        self._cache.set(key, (user_id, principal), ttl=ttl)
+        with self._lock:
+            # Forget keys the LRU has already evicted or expired
+            if len(self._tokens_by_user) > self._cache.maxsize:
+                self._tokens_by_user = {
+                    uid: live for uid, keys in self._tokens_by_user.items()
+                    if (live := {k for k in keys if k in self._cache})
+                }
+            keys = {k for k in self._tokens_by_user.get(user_id, ()) if k in self._cache}
+            keys.add(key)
+            self._tokens_by_user[user_id] = keys
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token belonging to a user."""
+        with self._lock:
+            keys = self._tokens_by_user.pop(user_id, set())
+        for key in keys:
+            self._cache.delete(key)
+    
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._tokens_by_user.clear()
+        self._cache.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for monitoring."""
+        return self._cache.stats()
+
+
+# Global verified-token cache
+token_cache = VerifiedTokenCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL
+)
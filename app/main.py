@@ -3,16 +3,21 @@ Main FastAPI application entry point.
 """
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import time
 
+from app.core.cache import response_cache
 from app.core.config import settings
-from app.core.database import init_db
-from app.core.logging import setup_logging, get_logger
+from app.core.database import init_db, close_db, get_db_context
+from app.core.responses import FastJSONResponse
+from app.core.logging import setup_logging, get_logger, shutdown_logging, error_log_limiter, suppressed_note
+from app.core.security import bulk_password_hash_pool, password_hash_pool
+from app.services.search_index import load_search_index, save_search_index
 from app.middleware.cors import setup_cors
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.api.metrics import router as metrics_router
 from app.api.v1.api import api_router
 
 # Setup logging
@@ -31,6 +36,9 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize database
         init_db()
+        if settings.SEARCH_BACKEND == "memory":
+            with get_db_context() as db:
+                load_search_index(db)
         logger.info("Application started successfully")
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
@@ -40,6 +48,19 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Application shutting down")
+    if settings.SEARCH_BACKEND == "memory":
+        try:
+            with get_db_context() as db:
+                save_search_index(db)
+        except Exception as e:
+            logger.error(f"Failed to save search index: {e}")
+    password_hash_pool.shutdown()
+    bulk_password_hash_pool.shutdown()
+    await response_cache.close()
+    await close_db()
+    
+    # Flush queued log records last so shutdown messages are written too
+    shutdown_logging()
 
 # Create FastAPI application
 app = FastAPI(
@@ -49,15 +70,20 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
 # Setup middleware
 setup_cors(app)
 app.add_middleware(LoggingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, tags=["metrics"])
 
 # Root endpoint
 @app.get("/", tags=["root"])
@@ -84,21 +110,27 @@ async def health_check():
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions."""
-    logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}")
-    return JSONResponse(
+    suppressed = error_log_limiter.allow(("http", exc.status_code, request.scope.get("endpoint")))
+    if suppressed is not None:
+        logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}{suppressed_note(suppressed)}")
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
             "message": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        # Keep headers such as Retry-After on 503s
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors."""
-    logger.warning(f"Validation error: {exc.errors()}")
-    return JSONResponse(
+    suppressed = error_log_limiter.allow(("validation", request.scope.get("endpoint")))
+    if suppressed is not None:
+        logger.warning(f"Validation error: {exc.errors()}{suppressed_note(suppressed)}")
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": True,
@@ -111,8 +143,10 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    suppressed = error_log_limiter.allow(("unhandled", type(exc), request.scope.get("endpoint")))
+    if suppressed is not None:
+        logger.error(f"Unhandled exception: {exc}{suppressed_note(suppressed)}", exc_info=True)
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": True,
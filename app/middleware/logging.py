@@ -1,59 +1,122 @@
 """
 Logging middleware for request/response logging.
 """
+import random
 import time
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from typing import Dict, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import error_log_limiter, suppressed_note
+from app.core.query_stats import fingerprint, track_queries
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses."""
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware for logging HTTP requests and responses.
+    
+    Wraps ``send`` instead of buffering the response, so streaming bodies
+    keep their back-pressure and no extra task is spawned per request.
+    ``X-Process-Time`` is the time until the response headers are sent; the
+    response log line reports the time until the body has been sent.
+    
+    Successful requests are sampled: the decision is made up front, and a
+    request that was not sampled still gets its response line if it fails
+    (status >= 400) or is slower than the slow-request threshold. The
+    response line includes the SQL statements the request ran, and a
+    statement repeated more than SQL_REPEATED_QUERY_THRESHOLD times is
+    reported as a possible N+1 pattern regardless of sampling.
+    """
     
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+        slow_request_ms: Optional[int] = None
+    ):
+        self.app = app
+        self.sample_rate = settings.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        routes = settings.LOG_SAMPLE_ROUTES if route_sample_rates is None else route_sample_rates
+        # Longest prefix first so the most specific override wins
+        self.route_sample_rates = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+        slow_ms = settings.LOG_SLOW_REQUEST_MS if slow_request_ms is None else slow_request_ms
+        self.slow_request_ns = slow_ms * 1_000_000 if slow_ms > 0 else None
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def sample_rate_for(self, path: str) -> float:
+        """Sample rate for successful requests to ``path``."""
+        for prefix, rate in self.route_sample_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.sample_rate
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and log information."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter_ns()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+        
+        sampled = False
+        if logger.isEnabledFor(logging.INFO):
+            rate = self.sample_rate_for(path)
+            sampled = rate >= 1 or (rate > 0 and random.random() < rate)
         
         # Log request
-        logger.info(
-            f"Request: {request.method} {request.url.path} "
-            f"from {request.client.host if request.client else 'unknown'}"
-        )
+        if sampled:
+            client = scope.get("client")
+            logger.info("Request: %s %s from %s", method, path, client[0] if client else "unknown")
+        
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                
+                # Add processing time header
+                process_time = (time.perf_counter_ns() - start_time) / 1e9
+                MutableHeaders(scope=message).append("X-Process-Time", str(process_time))
+            await send(message)
         
         # Process request
-        try:
-            response = await call_next(request)
-            
-            # Calculate processing time
-            process_time = time.time() - start_time
-            
-            # Log response
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_process_time)
+            except Exception as e:
+                # Log error, rate limited per exception type and endpoint (set by the router)
+                suppressed = error_log_limiter.allow(("request", type(e), scope.get("endpoint", path)))
+                if suppressed is not None:
+                    process_time = (time.perf_counter_ns() - start_time) / 1e9
+                    logger.error(
+                        "Error: %s %s - Error: %s - Time: %.4fs%s",
+                        method, path, e, process_time, suppressed_note(suppressed)
+                    )
+                raise
+        
+        # Log response
+        elapsed = time.perf_counter_ns() - start_time
+        if sampled or (
+            logger.isEnabledFor(logging.INFO)
+            and (status_code >= 400 or (self.slow_request_ns is not None and elapsed >= self.slow_request_ns))
+        ):
             logger.info(
-                f"Response: {request.method} {request.url.path} "
-                f"- Status: {response.status_code} "
-                f"- Time: {process_time:.4f}s"
+                "Response: %s %s - Status: %s - Time: %.4fs - Queries: %d (%.4fs)",
+                method, path, status_code, elapsed / 1e9, queries.count, queries.duration
             )
-            
-            # Add processing time header
-            response.headers["X-Process-Time"] = str(process_time)
-            
-            return response
-            
-        except Exception as e:
-            # Calculate processing time
-            process_time = time.time() - start_time
-            
-            # Log error
-            logger.error(
-                f"Error: {request.method} {request.url.path} "
-                f"- Error: {str(e)} "
-                f"- Time: {process_time:.4f}s"
-            )
-            raise
+        
+        # Flag statements repeated within this request (likely N+1 loading)
+        for statement, count in queries.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD):
+            sql = fingerprint(statement)
+            suppressed = error_log_limiter.allow(("repeated_query", scope.get("endpoint", path), sql))
+            if suppressed is not None:
+                logger.warning(
+                    "Possible N+1: %s %s ran the same statement %d times: %s%s",
+                    method, path, count, sql, suppressed_note(suppressed)
+                )
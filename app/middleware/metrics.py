@@ -0,0 +1,76 @@
+"""
+Metrics middleware recording request counts and latencies.
+"""
+import time
+from typing import Any, Dict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    http_request_db_queries,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+from app.core.query_stats import track_queries
+
+# Label for requests that matched no route (404s, probes), keeping cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding the request metrics.
+    
+    Requests are labelled with their route template (``/api/v1/blogs/{blog_id}``)
+    rather than the raw path. The router only records the matched endpoint
+    in the scope, so templates are looked up from the router's routes once
+    per endpoint and cached.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._templates: Dict[Any, str] = {}
+    
+    def route_template(self, scope: Scope) -> str:
+        """Route template of the endpoint that handled the request."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        template = self._templates.get(endpoint)
+        if template is None:
+            router = scope.get("router")
+            for route in getattr(router, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            else:
+                template = UNMATCHED_ROUTE
+            self._templates[endpoint] = template
+        return template
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Count the request and time it until the response has been sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        http_requests_in_flight.inc()
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                http_requests_in_flight.dec()
+                route = self.route_template(scope)
+                method = scope["method"]
+                http_request_duration_seconds.observe(time.perf_counter() - start_time, method, route)
+                http_request_db_queries.observe(queries.count, method, route)
+                http_requests_total.inc(method, route, str(status_code))
@@ -6,6 +6,7 @@ Import all models here to ensure they are available when relationships are resol
 # Import models in the correct order to avoid circular dependencies
 from app.models.user import User
 from app.models.blog import Blog
+from app.models.blog_counter import BlogCounter
 
 # Now set up the relationships after both models are imported
 def setup_relationships():
@@ -21,4 +22,4 @@ def setup_relationships():
 # Set up relationships
 setup_relationships()
 
-__all__ = ["User", "Blog"]
+__all__ = ["User", "Blog", "BlogCounter"]
@@ -6,9 +6,20 @@ from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Bool
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import Optional
 
 from app.core.database import Base
 
+# Characters of content shown as the excerpt when a blog has no summary
+EXCERPT_LENGTH = 150
+
+
+def make_excerpt(content: str, summary: Optional[str]) -> str:
+    """The summary, or the start of the content."""
+    if summary:
+        return summary
+    return content[:EXCERPT_LENGTH] + "..." if len(content) > EXCERPT_LENGTH else content
+
 
 class Blog(Base):
     """Blog model representing blog posts."""
@@ -34,6 +45,4 @@ class Blog(Base):
     @property
     def excerpt(self) -> str:
         """Generate a short excerpt from the content."""
-        if self.summary:
-            return self.summary
-        return self.content[:150] + "..." if len(self.content) > 150 else self.content
+        return make_excerpt(self.content, self.summary)
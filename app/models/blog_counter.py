@@ -0,0 +1,27 @@
+"""
+Blog counter model.
+Holds trigger-maintained blog totals so list endpoints can skip COUNT(*),
+and a version that changes on every write for HTTP validators.
+"""
+from sqlalchemy import Column, DateTime, Integer
+
+from app.core.database import Base
+
+# creator_id used for the row that aggregates every creator
+ALL_CREATORS = 0
+
+
+class BlogCounter(Base):
+    """Running blog totals per creator (creator_id 0 holds the global totals)."""
+    
+    __tablename__ = "blog_counters"
+    
+    creator_id = Column(Integer, primary_key=True, autoincrement=False)
+    total = Column(Integer, nullable=False, default=0)
+    published = Column(Integer, nullable=False, default=0)
+    # Bumped by triggers on any insert, update or delete of the creator's blogs
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    changed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<BlogCounter(creator_id={self.creator_id}, total={self.total}, published={self.published})>"
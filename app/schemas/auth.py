@@ -3,7 +3,8 @@ Authentication-related Pydantic schemas.
 Defines the data structures for authentication operations.
 """
 from typing import Optional
-from pydantic import BaseModel, Field
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Token(BaseModel):
@@ -21,6 +22,18 @@ class TokenData(BaseModel):
     user_id: Optional[int] = None
 
 
+class AuthenticatedUser(BaseModel):
+    """Lightweight principal for the authenticated caller (safe to cache)."""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: int
+    name: str
+    email: str
+    is_active: bool
+    is_verified: bool
+    created_at: Optional[datetime] = None
+
+
 class LoginRequest(BaseModel):
     """User login request schema."""
     
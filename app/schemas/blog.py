@@ -57,16 +57,57 @@ class BlogResponse(BlogBase):
     excerpt: str
 
 
+class BlogCreator(BaseModel):
+    """Public creator information embedded in blog responses."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    name: str
+    email: str
+    is_active: bool
+    created_at: datetime
+
+
 class BlogWithCreator(BlogResponse):
     """Blog schema with creator information."""
-    creator: dict = {}  # Using dict instead of UserResponse to avoid circular import
+    creator: Optional[BlogCreator] = None
 
 
 class BlogListResponse(BaseModel):
     """Paginated blog list response."""
     blogs: List[BlogResponse]
-    total: int
-    page: int
+    creators: Optional[List[BlogCreator]] = Field(
+        None, description="Creators of the listed blogs (only with include_creators=true)"
+    )
+    total: Optional[int] = Field(None, description="Total matching blogs (omitted when counting is disabled)")
+    page: Optional[int] = Field(None, description="Page number (offset pagination only)")
     size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+
+
+class BlogSearchResult(BlogResponse):
+    """Blog search hit with relevance information."""
+    score: Optional[float] = Field(None, description="Relevance score (higher is better)")
+    snippet: Optional[str] = Field(None, description="HTML-escaped excerpt with matches wrapped in <mark>")
+
+
+class BlogSearchResponse(BlogListResponse):
+    """Paginated, relevance-ordered blog search response."""
+    blogs: List[BlogSearchResult]
+
+
+class BlogImportError(BaseModel):
+    """A record of a bulk import that was not imported."""
+    index: int = Field(..., description="Position of the record in the request body (0-based)")
+    detail: str
+
+
+class BlogImportResponse(BaseModel):
+    """Outcome of a bulk blog import."""
+    imported: int
+    failed: int
+    errors: List[BlogImportError] = Field(
+        default_factory=list, description="Failed records (the first 100 only)"
+    )
@@ -5,6 +5,8 @@ from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 
+from app.schemas.blog import BlogResponse
+
 
 class UserBase(BaseModel):
     """Base user schema with common fields."""
@@ -60,7 +62,7 @@ class UserResponse(UserBase):
 
 class UserWithBlogs(UserResponse):
     """User schema with associated blog posts."""
-    blogs: List[dict] = []  # Using dict instead of BlogResponse to avoid circular import
+    blogs: List[BlogResponse] = []
 
 
 class UserLogin(BaseModel):
@@ -87,3 +89,12 @@ class UserPasswordChange(BaseModel):
         if not any(c.isdigit() for c in v):
             raise ValueError('Password must contain at least one digit')
         return v
+
+
+class UserImportResult(BaseModel):
+    """Outcome of one record of a bulk user import."""
+    index: int = Field(..., description="Position of the record in the input (0-based)")
+    email: Optional[str] = None
+    status: str = Field(..., description="created, exists, invalid or failed")
+    id: Optional[int] = Field(None, description="Id of the created user")
+    detail: Optional[str] = None
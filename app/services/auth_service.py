@@ -9,13 +9,14 @@ from fastapi.security import HTTPBearer, OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 import logging
 
-from app.core.database import get_db
-from app.core.security import security_manager
+from app.core.database import DBSession, get_db, get_session, set_consistency_key
+from app.core.security import security_manager, token_cache
 from app.core.config import settings
-from app.core.exceptions import AuthenticationError, NotFoundError
+from app.core.exceptions import AuthenticationError, AuthorizationError, NotFoundError
 from app.models.user import User
-from app.schemas.auth import Token, LoginRequest, LoginResponse
-from app.services.user_service import UserService
+from app.schemas.auth import AuthenticatedUser, Token, LoginRequest, LoginResponse
+from app.services.base import AsyncServiceProxy
+from app.services.user_service import AsyncUserService, UserService
 
 logger = logging.getLogger(__name__)
 
@@ -74,42 +75,47 @@ class AuthService:
             if not user:
                 raise AuthenticationError("Invalid email or password")
             
-            # Create access token
-            token = self.create_access_token(user)
-            
-            # Create user response
-            user_response = {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "is_active": user.is_active
-            }
-            
-            logger.info(f"User {user.email} logged in successfully")
-            
-            return LoginResponse(
-                access_token=token.access_token,
-                token_type=token.token_type,
-                expires_in=token.expires_in,
-                user=user_response
-            )
+            return self.create_login_response(user)
             
         except Exception as e:
             logger.error(f"Login error: {e}")
             raise
     
+    def create_login_response(self, user: User) -> LoginResponse:
+        """Issue an access token for an authenticated user."""
+        # Create access token
+        token = self.create_access_token(user)
+        
+        # Create user response
+        user_response = {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "is_active": user.is_active
+        }
+        
+        logger.info(f"User {user.email} logged in successfully")
+        
+        return LoginResponse(
+            access_token=token.access_token,
+            token_type=token.token_type,
+            expires_in=token.expires_in,
+            user=user_response
+        )
+    
     def get_current_user(
         self, 
         credentials = Depends(http_bearer_scheme),
         db: Session = Depends(get_db)
-    ) -> User:
+    ) -> AuthenticatedUser:
         """Get current authenticated user from JWT Bearer token."""
         try:
             # Extract token from HTTPBearer credentials
             token = credentials.credentials
             
             # Verify token
-            email = security_manager.verify_token(token)
+            payload = security_manager.decode_token(token)
+            email = payload.get("sub") if payload else None
             if not email:
                 raise AuthenticationError("Invalid or expired token")
             
@@ -121,7 +127,9 @@ class AuthService:
             if not user.is_active:
                 raise AuthenticationError("User account is deactivated")
             
-            return user
+            principal = AuthenticatedUser.model_validate(user)
+            token_cache.set(token, user.id, principal, expires_at=payload.get("exp"))
+            return principal
             
         except Exception as e:
             logger.error(f"Current user retrieval error: {e}")
@@ -199,27 +207,65 @@ class AuthService:
             return None
 
 
+class AsyncAuthService(AsyncServiceProxy):
+    """Awaitable variant of AuthService for use from async endpoints."""
+    
+    service_class = AuthService
+    
+    async def login_user(self, login_data: LoginRequest) -> LoginResponse:
+        """Authenticate user off the event loop and return login response."""
+        try:
+            user = await AsyncUserService(self.db).authenticate_user(
+                email=login_data.email,
+                password=login_data.password
+            )
+            if not user:
+                raise AuthenticationError("Invalid email or password")
+            
+            return await self.create_login_response(user)
+            
+        except Exception as e:
+            logger.error(f"Login error: {e}")
+            raise
+
+
 # Dependency functions for use in routers
 async def get_current_user_dependency(
     credentials = Depends(http_bearer_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: DBSession = Depends(get_session)
+) -> AuthenticatedUser:
     """Dependency function to get current user from JWT Bearer token."""
-    auth_service = AuthService(db)
-    return auth_service.get_current_user(credentials, db)
+    # Tokens verified recently skip signature checks and the user lookup
+    principal = token_cache.get(credentials.credentials)
+    if principal is None:
+        auth_service = AsyncAuthService(db)
+        principal = await auth_service.get_current_user(credentials)
+    
+    # Replica reads by this user see their own recent writes
+    set_consistency_key(principal.id)
+    return principal
 
 
 async def get_current_user_oauth2_dependency(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ) -> User:
     """Dependency function to get current user from OAuth2 token."""
-    auth_service = AuthService(db)
-    return auth_service.get_current_user_from_oauth2(token, db)
+    auth_service = AsyncAuthService(db)
+    return await auth_service.get_current_user_from_oauth2(token, None)
 
 
 async def get_current_active_user_dependency(
-    current_user: User = Depends(get_current_user_dependency)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user_dependency)
+) -> AuthenticatedUser:
     """Dependency function to get current active user."""
     return current_user
+
+
+async def get_current_admin_user_dependency(
+    current_user: AuthenticatedUser = Depends(get_current_active_user_dependency)
+) -> AuthenticatedUser:
+    """Dependency function to get current user, who must be listed in ADMIN_EMAILS."""
+    if current_user.email.lower() not in {email.lower() for email in settings.ADMIN_EMAILS}:
+        raise AuthorizationError("Admin access required")
+    return current_user
@@ -0,0 +1,80 @@
+"""
+Shared building blocks for the service layer.
+"""
+from functools import wraps
+from typing import Any, Callable, Optional, Type, TypeVar
+import logging
+
+from app.core.database import DBSession, db_replica_fallbacks_total, run_in_session
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def read_only(method: F) -> F:
+    """
+    Mark a service method as safe to run against a read replica.
+    
+    SELECTs issued by the method may go to a replica (see
+    ``RoutingSession``). If the replica fails during the call, the session
+    is rolled back and the method runs once more against the primary.
+    """
+    @wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        session = self.db
+        if getattr(session, "replicas", None) is None or session.info.get("read_only"):
+            return method(self, *args, **kwargs)
+        
+        session.info["read_only"] = True
+        try:
+            return method(self, *args, **kwargs)
+        except Exception:
+            replica = session.info.get("replica")
+            if replica is None or session.replicas.is_available(replica):
+                raise
+            logger.warning(f"Retrying {method.__qualname__} on the primary after a replica failure")
+            db_replica_fallbacks_total.inc("replica_error")
+            session.rollback()
+            session.info["read_only"] = False
+            return method(self, *args, **kwargs)
+        finally:
+            session.info.pop("read_only", None)
+    
+    return wrapper  # type: ignore[return-value]
+
+
+class AsyncServiceProxy:
+    """
+    Awaitable facade over a synchronous service class.
+    
+    Every public method of ``service_class`` becomes a coroutine that runs the
+    original implementation against the request session (see
+    ``run_in_session``), so endpoints share a single code path whether the
+    application is configured for the sync or the async engine.
+    """
+    
+    service_class: Optional[Type] = None
+    
+    def __init__(self, db: DBSession):
+        self.db = db
+    
+    async def run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a method of the wrapped service against the request session."""
+        return await run_in_session(
+            self.db,
+            lambda session: getattr(self.service_class(session), method)(*args, **kwargs)
+        )
+    
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        
+        # Raises AttributeError for unknown methods
+        getattr(self.service_class, name)
+        
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(name, *args, **kwargs)
+        
+        call.__name__ = name
+        return call
@@ -2,14 +2,33 @@
 Blog service for business logic operations.
 Handles blog creation, management, and retrieval.
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Select, Text, case, func, insert, select
+from sqlalchemy.orm import Session, joinedload, load_only
 from sqlalchemy.exc import IntegrityError
 import logging
 
-from app.models.blog import Blog
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.models.blog import EXCERPT_LENGTH, Blog
+from app.models.blog_counter import ALL_CREATORS, BlogCounter
 from app.models.user import User
-from app.schemas.blog import BlogCreate, BlogUpdate, BlogResponse, BlogWithCreator, BlogListResponse
+from app.schemas.blog import (
+    BlogCreate, 
+    BlogUpdate, 
+    BlogResponse, 
+    BlogWithCreator, 
+    BlogCreator, 
+    BlogListResponse, 
+    BlogSearchResult, 
+    BlogSearchResponse
+)
+from app.services.base import AsyncServiceProxy, read_only
+from app.services.search_index import search_index
+from app.services.search_service import get_search_backend
+from app.utils.conditional import Validators, make_validators
+from app.utils.fields import Fields, partial_page
+from app.utils.pagination import encode_cursor, keyset_before
 from app.core.exceptions import (
     NotFoundError, 
     ConflictError, 
@@ -20,6 +39,91 @@ from app.core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Blog.excerpt computed by the database, so listings that only show the
+# excerpt never load the full content
+BLOG_EXCERPT = case(
+    (Blog.summary != "", Blog.summary),
+    (func.length(Blog.content) > EXCERPT_LENGTH, func.substr(Blog.content, 1, EXCERPT_LENGTH, type_=Text) + "..."),
+    else_=Blog.content
+).label("excerpt")
+
+# Column selected for each BlogResponse field; listings select these as
+# plain rows instead of loading Blog instances
+BLOG_FIELD_COLUMNS = {
+    "id": Blog.id,
+    "title": Blog.title,
+    "content": Blog.content,
+    "summary": Blog.summary,
+    "is_published": Blog.is_published,
+    "creator_id": Blog.creator_id,
+    "created_at": Blog.created_at,
+    "updated_at": Blog.updated_at,
+    "excerpt": BLOG_EXCERPT,
+}
+BLOG_LIST_COLUMNS = tuple(BLOG_FIELD_COLUMNS.values())
+
+# Blog attributes loaded for each field when listing Blog instances
+BLOG_FIELD_ATTRIBUTES = {
+    name: (column,) for name, column in BLOG_FIELD_COLUMNS.items() if name != "excerpt"
+}
+BLOG_FIELD_ATTRIBUTES["excerpt"] = (Blog.content, Blog.summary)
+
+CREATOR_COLUMNS = (User.id, User.name, User.email, User.is_active, User.created_at)
+
+
+def blog_attributes(fields) -> list:
+    """Blog attributes to load (``load_only``) for the given field names."""
+    attributes: Dict[str, object] = {"id": Blog.id}
+    for name in fields:
+        for attribute in BLOG_FIELD_ATTRIBUTES.get(name, ()):
+            attributes[attribute.key] = attribute
+    return list(attributes.values())
+
+
+def blog_list_columns(fields: Optional[Fields] = None, include_creators: bool = False) -> tuple:
+    """
+    Columns to select for a page of blogs with the given sparse fieldset.
+    
+    created_at and id are always selected for the next-page cursor, and
+    creator_id when the page's creators are loaded.
+    """
+    if fields is None:
+        return BLOG_LIST_COLUMNS
+    needed = set(fields) | {"id", "created_at"}
+    if include_creators:
+        needed.add("creator_id")
+    return tuple(column for name, column in BLOG_FIELD_COLUMNS.items() if name in needed)
+
+
+# Response cache namespaces: every list page, and one per blog
+BLOG_LISTS_CACHE = "blogs:list"
+
+
+def blog_cache_namespace(blog_id: int) -> str:
+    """Response cache namespace for a single blog."""
+    return f"blogs:{blog_id}"
+
+
+def creator_blog_ids(db: Session, user_id: int) -> List[int]:
+    """Ids of a user's blogs, for invalidating caches that embed the user."""
+    return [blog_id for (blog_id,) in db.query(Blog.id).filter(Blog.creator_id == user_id)]
+
+
+def invalidate_creator_cache(blog_ids: List[int]) -> None:
+    """Drop cached responses that embed the creator of ``blog_ids``."""
+    response_cache.invalidate(BLOG_LISTS_CACHE, *map(blog_cache_namespace, blog_ids))
+
+
+def blog_export_query(published_only: bool = True) -> Select:
+    """Columns of the blogs to export, in id order."""
+    query = select(
+        Blog.id, Blog.title, Blog.summary, Blog.content, Blog.is_published,
+        Blog.creator_id, Blog.created_at, Blog.updated_at
+    ).order_by(Blog.id)
+    if published_only:
+        query = query.where(Blog.is_published == True)
+    return query
+
 
 class BlogService:
     """Service class for blog-related operations."""
@@ -47,6 +151,8 @@ class BlogService:
             self.db.add(db_blog)
             self.db.commit()
             self.db.refresh(db_blog)
+            search_index.index_blog(db_blog)
+            response_cache.invalidate(BLOG_LISTS_CACHE)
             
             logger.info(f"Blog created successfully: {db_blog.title} by user {creator_id}")
             return BlogResponse.model_validate(db_blog)
@@ -60,6 +166,77 @@ class BlogService:
             logger.error(f"Error creating blog: {e}")
             raise DatabaseError("Failed to create blog")
     
+    def import_blogs(
+        self, 
+        blogs: List[BlogCreate], 
+        creator_id: int, 
+        verify_creator: bool = True
+    ) -> int:
+        """
+        Insert a batch of blog posts by one creator.
+        
+        The batch goes out as a single executemany INSERT with one commit,
+        instead of a commit and refresh per post as in create_blog. Rows are
+        only read back when the in-memory search index has to be updated.
+        
+        Args:
+            blogs: Validated blog posts
+            creator_id: Creator of every post in the batch
+            verify_creator: Check that the creator exists (once per import is enough)
+            
+        Returns:
+            Number of blogs inserted
+            
+        Raises:
+            NotFoundError: If the creator does not exist
+            DatabaseError: If the batch could not be inserted
+        """
+        if not blogs:
+            return 0
+        
+        try:
+            if verify_creator and self.db.query(User.id).filter(User.id == creator_id).first() is None:
+                raise NotFoundError("User")
+            
+            # Core INSERT with every column present, so all rows share one statement
+            blogs_table = Blog.__table__
+            statement = insert(blogs_table)
+            if search_index.ready:
+                statement = statement.returning(
+                    blogs_table.c.id, blogs_table.c.title, blogs_table.c.content, blogs_table.c.is_published
+                )
+            result = self.db.execute(
+                statement,
+                [
+                    {
+                        "title": blog.title,
+                        "content": blog.content,
+                        "summary": blog.summary,
+                        "is_published": blog.is_published,
+                        "creator_id": creator_id
+                    }
+                    for blog in blogs
+                ]
+            )
+            inserted = result.all() if search_index.ready else []
+            self.db.commit()
+            
+        except NotFoundError:
+            raise
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error importing {len(blogs)} blogs for user {creator_id}: {e}")
+            raise DatabaseError("Failed to import blogs")
+        
+        for blog_id, title, content, is_published in inserted:
+            if is_published:
+                search_index.add(blog_id, title, content)
+        response_cache.invalidate(BLOG_LISTS_CACHE)
+        
+        logger.info(f"Imported {len(blogs)} blogs for user {creator_id}")
+        return len(blogs)
+    
+    @read_only
     def get_blog_by_id(self, blog_id: int) -> BlogResponse:
         """Get blog by ID."""
         try:
@@ -73,10 +250,74 @@ class BlogService:
             logger.error(f"Error fetching blog {blog_id}: {e}")
             raise
     
+    @read_only
+    def get_blog_validators(self, blog_id: int) -> Optional[Validators]:
+        """
+        Compute HTTP validators for a blog without loading it.
+        
+        The creator's blog version (bumped by triggers on every write) tells
+        apart updates within the same updated_at second; the creator's own
+        updated_at covers the embedded creator.
+        
+        Returns:
+            Validators, or None if the blog or its version row does not exist
+        """
+        row = (
+            self.db.query(
+                func.coalesce(Blog.updated_at, Blog.created_at),
+                func.coalesce(User.updated_at, User.created_at),
+                BlogCounter.version
+            )
+            .join(User, User.id == Blog.creator_id)
+            .join(BlogCounter, BlogCounter.creator_id == Blog.creator_id)
+            .filter(Blog.id == blog_id)
+            .first()
+        )
+        if row is None:
+            return None
+        
+        blog_changed, creator_changed, version = row
+        return make_validators(
+            "blog", blog_id, blog_changed, creator_changed, version,
+            last_modified=max(blog_changed, creator_changed)
+        )
+    
+    @read_only
+    def get_listing_validators(
+        self, 
+        creator_id: int = ALL_CREATORS, 
+        **params
+    ) -> Optional[Validators]:
+        """
+        Compute HTTP validators for a blog listing from its version counter.
+        
+        Args:
+            creator_id: Creator whose blogs are listed (ALL_CREATORS for all)
+            **params: Query parameters selecting the page
+            
+        Returns:
+            Validators, or None if no version is maintained for the listing
+        """
+        counter = self.db.get(BlogCounter, creator_id)
+        if counter is None:
+            return None
+        
+        return make_validators(
+            "blogs", creator_id, counter.version, sorted(params.items()),
+            last_modified=counter.changed_at
+        )
+    
+    @read_only
     def get_blog_with_creator(self, blog_id: int) -> BlogWithCreator:
         """Get blog with creator information."""
         try:
-            blog = self.db.query(Blog).filter(Blog.id == blog_id).first()
+            # Many-to-one: join the creator into the same query
+            blog = (
+                self.db.query(Blog)
+                .options(joinedload(Blog.creator))
+                .filter(Blog.id == blog_id)
+                .first()
+            )
             if not blog:
                 raise NotFoundError("Blog")
             
@@ -86,42 +327,124 @@ class BlogService:
             logger.error(f"Error fetching blog with creator {blog_id}: {e}")
             raise
     
+    def _paginate(
+        self, 
+        query, 
+        skip: int, 
+        limit: int, 
+        cursor: Optional[str] = None,
+        counter: Optional[Tuple[int, str]] = None,
+        include_creators: bool = False,
+        fields: Optional[Fields] = None
+    ) -> BlogListResponse:
+        """Fetch one page of a blog query, newest first.
+        
+        With a cursor the page is located by seeking on (created_at, id)
+        instead of skipping rows, so deep pages cost the same as the first.
+        ``counter`` names the blog_counters row and column holding the total
+        for this query, used when BLOG_COUNT_STRATEGY is "counter".
+        With ``include_creators`` the page's creators are loaded in one
+        batched query and returned alongside the blogs. ``query`` selects
+        ``blog_list_columns(fields, include_creators)``; with ``fields`` the
+        page is a ``partial_page`` whose items only carry those fields.
+        """
+        strategy = settings.BLOG_COUNT_STRATEGY
+        if strategy == "counter" and counter is None:
+            # No maintained total for this query (e.g. search results)
+            strategy = "window"
+        
+        page_query = query.order_by(Blog.created_at.desc(), Blog.id.desc())
+        if cursor:
+            page_query = page_query.filter(keyset_before(self.db, Blog.created_at, Blog.id, cursor))
+        else:
+            page_query = page_query.offset(skip)
+        
+        # One extra row tells us whether another page exists
+        total = None
+        if strategy == "window" and not cursor:
+            blogs = page_query.add_columns(func.count().over()).limit(limit + 1).all()
+            if blogs:
+                total = blogs[0][-1]
+            elif skip == 0:
+                total = 0
+            else:
+                total = query.count()
+        else:
+            blogs = page_query.limit(limit + 1).all()
+            if strategy == "exact":
+                total = query.count()
+            elif strategy == "counter":
+                total = self._counted_total(*counter)
+        
+        has_next = len(blogs) > limit
+        blogs = blogs[:limit]
+        
+        # Validating plain rows in one call runs in pydantic-core, unlike
+        # reading attributes off Blog instances item by item
+        page_model = BlogListResponse if fields is None else partial_page(BlogListResponse, BlogResponse, fields)
+        return page_model.model_validate({
+            "blogs": [blog._asdict() for blog in blogs],
+            "creators": self._load_creators(blogs) if include_creators else None,
+            "total": total,
+            "page": None if cursor else (skip // limit) + 1,
+            "size": limit,
+            "has_next": has_next,
+            "has_prev": bool(cursor) or skip > 0,
+            "next_cursor": encode_cursor(blogs[-1].created_at, blogs[-1].id) if has_next else None
+        })
+        
+    def _load_creators(self, blogs: List) -> List[BlogCreator]:
+        """Fetch the distinct creators of ``blogs`` with a single IN query."""
+        creator_ids = sorted({blog.creator_id for blog in blogs})
+        if not creator_ids:
+            return []
+        
+        rows = self.db.query(*CREATOR_COLUMNS).filter(User.id.in_(creator_ids)).order_by(User.id).all()
+        return [BlogCreator.model_validate(row._asdict()) for row in rows]
+    
+    def _counted_total(self, creator_id: int, column: str) -> int:
+        """Read a total from the trigger-maintained blog_counters table."""
+        counter = self.db.get(BlogCounter, creator_id)
+        return getattr(counter, column) if counter else 0
+    
+    @read_only
     def get_all_blogs(
         self, 
         skip: int = 0, 
         limit: int = 20, 
-        published_only: bool = True
+        published_only: bool = True,
+        cursor: Optional[str] = None,
+        include_creators: bool = False,
+        fields: Optional[Fields] = None
     ) -> BlogListResponse:
-        """Get all blogs with pagination and filtering."""
+        """Get all blogs with pagination and filtering, optionally only some fields."""
         try:
-            query = self.db.query(Blog)
+            query = self.db.query(*blog_list_columns(fields, include_creators))
             
             if published_only:
                 query = query.filter(Blog.is_published == True)
             
-            total = query.count()
-            blogs = query.offset(skip).limit(limit).all()
-            
-            blog_responses = [BlogResponse.model_validate(blog) for blog in blogs]
-            
-            return BlogListResponse(
-                blogs=blog_responses,
-                total=total,
-                page=(skip // limit) + 1,
-                size=limit,
-                has_next=(skip + limit) < total,
-                has_prev=skip > 0
+            counter = (ALL_CREATORS, "published" if published_only else "total")
+            return self._paginate(
+                query, skip, limit, cursor, 
+                counter=counter, 
+                include_creators=include_creators,
+                fields=fields
             )
             
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching blogs: {e}")
             raise DatabaseError("Failed to fetch blogs")
     
+    @read_only
     def get_blogs_by_user(
         self, 
         user_id: int, 
         skip: int = 0, 
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> BlogListResponse:
         """Get blogs by specific user."""
         try:
@@ -130,21 +453,11 @@ class BlogService:
             if not user:
                 raise NotFoundError("User")
             
-            query = self.db.query(Blog).filter(Blog.creator_id == user_id)
-            total = query.count()
-            blogs = query.offset(skip).limit(limit).all()
-            
-            blog_responses = [BlogResponse.model_validate(blog) for blog in blogs]
-            
-            return BlogListResponse(
-                blogs=blog_responses,
-                total=total,
-                page=(skip // limit) + 1,
-                size=limit,
-                has_next=(skip + limit) < total,
-                has_prev=skip > 0
-            )
+            query = self.db.query(*BLOG_LIST_COLUMNS).filter(Blog.creator_id == user_id)
+            return self._paginate(query, skip, limit, cursor, counter=(user_id, "total"))
             
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching blogs for user {user_id}: {e}")
             raise DatabaseError("Failed to fetch user blogs")
@@ -172,6 +485,8 @@ class BlogService:
             
             self.db.commit()
             self.db.refresh(blog)
+            search_index.index_blog(blog)
+            response_cache.invalidate(BLOG_LISTS_CACHE, blog_cache_namespace(blog_id))
             
             logger.info(f"Blog {blog_id} updated successfully by user {user_id}")
             return BlogResponse.model_validate(blog)
@@ -198,6 +513,8 @@ class BlogService:
             
             self.db.delete(blog)
             self.db.commit()
+            search_index.remove_blog(blog_id)
+            response_cache.invalidate(BLOG_LISTS_CACHE, blog_cache_namespace(blog_id))
             
             logger.info(f"Blog {blog_id} deleted successfully by user {user_id}")
             return True
@@ -221,6 +538,8 @@ class BlogService:
             blog.is_published = True
             self.db.commit()
             self.db.refresh(blog)
+            search_index.index_blog(blog)
+            response_cache.invalidate(BLOG_LISTS_CACHE, blog_cache_namespace(blog_id))
             
             logger.info(f"Blog {blog_id} published successfully by user {user_id}")
             return BlogResponse.model_validate(blog)
@@ -230,36 +549,68 @@ class BlogService:
             logger.error(f"Error publishing blog {blog_id}: {e}")
             raise
     
+    @read_only
     def search_blogs(
         self, 
         query: str, 
         skip: int = 0, 
-        limit: int = 20
-    ) -> BlogListResponse:
-        """Search blogs by title or content."""
+        limit: int = 20,
+        include_creators: bool = False,
+        fields: Optional[Fields] = None
+    ) -> BlogSearchResponse:
+        """
+        Search published blogs by title or content, most relevant first.
+        
+        With ``fields`` only the Blog attributes those fields need are
+        loaded, and the page is a ``partial_page``.
+        """
         try:
-            search_query = f"%{query}%"
-            blogs = self.db.query(Blog).filter(
-                Blog.is_published == True,
-                (Blog.title.ilike(search_query) | Blog.content.ilike(search_query))
-            ).offset(skip).limit(limit).all()
-            
-            total = self.db.query(Blog).filter(
-                Blog.is_published == True,
-                (Blog.title.ilike(search_query) | Blog.content.ilike(search_query))
-            ).count()
-            
-            blog_responses = [BlogResponse.model_validate(blog) for blog in blogs]
-            
-            return BlogListResponse(
-                blogs=blog_responses,
+            backend = get_search_backend(self.db)
+            options = []
+            if fields is not None:
+                needed = set(fields) | ({"creator_id"} if include_creators else set())
+                if backend.needs_content:
+                    needed.add("content")
+                options.append(load_only(*blog_attributes(needed)))
+            hits, total = backend.search(self.db, query, skip, limit + 1, options)
+            
+            has_next = len(hits) > limit
+            hits = hits[:limit]
+            page_model = BlogSearchResponse
+            if fields is None:
+                results = [
+                    BlogSearchResult.model_validate(hit.blog).model_copy(
+                        update={"score": hit.score, "snippet": hit.snippet}
+                    )
+                    for hit in hits
+                ]
+            else:
+                page_model = partial_page(BlogSearchResponse, BlogSearchResult, fields)
+                results = [
+                    {
+                        **{name: getattr(hit.blog, name) for name in fields if name in BLOG_FIELD_ATTRIBUTES},
+                        "score": hit.score,
+                        "snippet": hit.snippet
+                    }
+                    for hit in hits
+                ]
+            
+            return page_model(
+                blogs=results,
+                creators=self._load_creators([hit.blog for hit in hits]) if include_creators else None,
                 total=total,
                 page=(skip // limit) + 1,
                 size=limit,
-                has_next=(skip + limit) < total,
+                has_next=has_next,
                 has_prev=skip > 0
             )
             
         except Exception as e:
             logger.error(f"Error searching blogs: {e}")
             raise DatabaseError("Failed to search blogs")
+
+
+class AsyncBlogService(AsyncServiceProxy):
+    """Awaitable variant of BlogService for use from async endpoints."""
+    
+    service_class = BlogService
@@ -0,0 +1,413 @@
+"""
+In-process inverted index for blog search.
+Keeps BM25-ranked posting lists for published blogs in memory so search
+needs no schema support and no table scan. The index can be snapshotted
+to a file that is memory-mapped on the next startup.
+"""
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.blog import Blog
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Snapshot layout: magic, header length, JSON header, then 4-byte aligned arrays
+SNAPSHOT_MAGIC = b"BLOGIDX1"
+_HEADER = struct.Struct("<8sI")
+
+# Term frequencies are stored as unsigned shorts
+_MAX_TF = 0xFFFF
+
+Postings = Union[array, memoryview]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased word tokens."""
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+class PostingList:
+    """Doc ids (sorted) with their per-field term frequencies, as parallel arrays."""
+    
+    __slots__ = ("docs", "title_tf", "content_tf")
+    
+    def __init__(
+        self,
+        docs: Optional[Postings] = None,
+        title_tf: Optional[Postings] = None,
+        content_tf: Optional[Postings] = None
+    ):
+        self.docs = docs if docs is not None else array("I")
+        self.title_tf = title_tf if title_tf is not None else array("H")
+        self.content_tf = content_tf if content_tf is not None else array("H")
+    
+    def __len__(self) -> int:
+        return len(self.docs)
+    
+    def mutable(self) -> "PostingList":
+        """Copy memory-mapped arrays into writable ones before an update."""
+        if isinstance(self.docs, memoryview):
+            self.docs = array("I", self.docs)
+            self.title_tf = array("H", self.title_tf)
+            self.content_tf = array("H", self.content_tf)
+        return self
+    
+    def add(self, doc_id: int, title_tf: int, content_tf: int) -> None:
+        """Insert a document, keeping doc ids sorted (new ids append in O(1))."""
+        position = len(self.docs)
+        if position and self.docs[-1] > doc_id:
+            position = bisect_left(self.docs, doc_id)
+        self.docs.insert(position, doc_id)
+        self.title_tf.insert(position, min(title_tf, _MAX_TF))
+        self.content_tf.insert(position, min(content_tf, _MAX_TF))
+    
+    def remove(self, doc_id: int) -> None:
+        """Drop a document if present."""
+        position = bisect_left(self.docs, doc_id)
+        if position < len(self.docs) and self.docs[position] == doc_id:
+            del self.docs[position]
+            del self.title_tf[position]
+            del self.content_tf[position]
+
+
+class InvertedIndex:
+    """
+    BM25 inverted index over published blog titles and content.
+    
+    Titles and content are scored as one document with title term
+    frequencies (and length) multiplied by TITLE_WEIGHT. Queries match
+    documents containing every term, the last term also as a prefix,
+    mirroring the SQL full-text backends.
+    
+    The index lives in this process only: with several workers, each one
+    sees just the writes it handled itself until it is rebuilt.
+    """
+    
+    K1 = 1.2
+    B = 0.75
+    TITLE_WEIGHT = 10
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, PostingList] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._total_length = 0
+        self._vocabulary: Optional[List[str]] = None
+        self._snapshot: Optional[mmap.mmap] = None
+        self.ready = False
+    
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+    
+    def clear(self) -> None:
+        """Drop every document and any mapped snapshot."""
+        with self._lock:
+            self._postings = {}
+            self._doc_lengths = {}
+            self._doc_terms = {}
+            self._total_length = 0
+            self._vocabulary = None
+            self._snapshot = None
+            self.ready = False
+    
+    def add(self, doc_id: int, title: str, content: str) -> None:
+        """Index (or re-index) a document."""
+        title_counts = Counter(tokenize(title or ""))
+        content_counts = Counter(tokenize(content or ""))
+        terms = tuple(sorted(title_counts.keys() | content_counts.keys()))
+        length = (
+            self.TITLE_WEIGHT * sum(title_counts.values())
+            + sum(content_counts.values())
+        )
+        
+        with self._lock:
+            self._remove_locked(doc_id)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = PostingList()
+                    self._vocabulary = None
+                postings.mutable().add(doc_id, title_counts[term], content_counts[term])
+            
+            self._doc_terms[doc_id] = terms
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+    
+    def remove(self, doc_id: int) -> None:
+        """Remove a document if it is indexed."""
+        with self._lock:
+            self._remove_locked(doc_id)
+    
+    def _remove_locked(self, doc_id: int) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        
+        for term in terms:
+            postings = self._postings[term].mutable()
+            postings.remove(doc_id)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        self._total_length -= self._doc_lengths.pop(doc_id)
+    
+    def index_blog(self, blog: Blog) -> None:
+        """Apply a blog write: published blogs are indexed, others removed."""
+        if not self.ready:
+            return
+        if blog.is_published:
+            self.add(blog.id, blog.title, blog.content)
+        else:
+            self.remove(blog.id)
+    
+    def remove_blog(self, blog_id: int) -> None:
+        """Apply a blog deletion."""
+        if self.ready:
+            self.remove(blog_id)
+    
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Return indexed terms starting with ``prefix``."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        
+        terms = []
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            terms.append(vocabulary[i])
+        return terms
+    
+    def _score_term(self, terms: Iterable[str], n_docs: int, avg_length: float) -> Dict[int, float]:
+        """BM25 contribution of one query term (or its prefix expansions) per doc."""
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = self._postings[term]
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, title_tf, content_tf in zip(
+                postings.docs, postings.title_tf, postings.content_tf
+            ):
+                tf = self.TITLE_WEIGHT * title_tf + content_tf
+                norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[doc_id] / avg_length)
+                score = idf * tf * (self.K1 + 1) / (tf + norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+        return scores
+    
+    def search(self, query: str, limit: int) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Find documents matching every query term.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits to return
+        
+        Returns:
+            Tuple of ((doc_id, score) pairs, best first; total match count)
+        """
+        words = tokenize(query)
+        if not words:
+            return [], 0
+        
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if not n_docs:
+                return [], 0
+            avg_length = self._total_length / n_docs or 1.0
+            
+            groups = [[word] if word in self._postings else [] for word in words[:-1]]
+            groups.append(self._expand_prefix(words[-1]))
+            if not all(groups):
+                return [], 0
+            
+            # Rarest term first so the candidate set shrinks as early as possible
+            groups.sort(key=lambda group: sum(len(self._postings[t]) for t in group))
+            scores = self._score_term(groups[0], n_docs, avg_length)
+            for group in groups[1:]:
+                term_scores = self._score_term(group, n_docs, avg_length)
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+                if not scores:
+                    return [], 0
+        
+        # Ties go to the newest post, like the SQL backends
+        best = heapq.nlargest(limit, scores.items(), key=lambda hit: (hit[1], hit[0]))
+        return best, len(scores)
+    
+    def build(self, db: Session, batch_size: int = 1000) -> None:
+        """Rebuild the index from every published blog."""
+        with self._lock:
+            self.clear()
+            rows = (
+                db.query(Blog.id, Blog.title, Blog.content)
+                .filter(Blog.is_published == True)
+                .order_by(Blog.id)
+                .yield_per(batch_size)
+            )
+            for blog_id, title, content in rows:
+                self.add(blog_id, title, content)
+            self.ready = True
+        logger.info(f"Search index built: {len(self)} blogs, {len(self._postings)} terms")
+    
+    def save(self, path: str, fingerprint: Sequence = ()) -> None:
+        """Write a snapshot that ``load`` can memory-map; replaces ``path`` atomically."""
+        with self._lock:
+            doc_ids = array("I", sorted(self._doc_lengths))
+            doc_lengths = array("I", (self._doc_lengths[d] for d in doc_ids))
+            terms = sorted(self._postings)
+            header = json.dumps({
+                "fingerprint": list(fingerprint),
+                "documents": len(doc_ids),
+                "terms": [[term, len(self._postings[term])] for term in terms],
+            }).encode("utf-8")
+            
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(SNAPSHOT_MAGIC, len(header)))
+                f.write(header)
+                f.write(b"\0" * (-f.tell() % 4))
+                f.write(doc_ids.tobytes())
+                f.write(doc_lengths.tobytes())
+                for term in terms:
+                    postings = self._postings[term]
+                    f.write(bytes(postings.docs))
+                    f.write(bytes(postings.title_tf))
+                    f.write(bytes(postings.content_tf))
+            os.replace(tmp_path, path)
+        logger.info(f"Search index saved to {path}")
+    
+    def load(self, path: str, fingerprint: Sequence = ()) -> bool:
+        """
+        Map a snapshot written by ``save``.
+        
+        Posting lists stay backed by the mapped file until a write touches
+        them, so loading costs O(terms) and pages are read on demand.
+        
+        Returns:
+            True if the snapshot was loaded, False if it is missing or stale
+        """
+        try:
+            with open(path, "rb") as f:
+                snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        
+        try:
+            magic, header_length = _HEADER.unpack_from(snapshot, 0)
+            if magic != SNAPSHOT_MAGIC:
+                return False
+            offset = _HEADER.size
+            header = json.loads(snapshot[offset:offset + header_length])
+            if header["fingerprint"] != list(fingerprint):
+                logger.info("Search index snapshot is stale, rebuilding")
+                return False
+            offset += header_length
+            offset += -offset % 4
+        except (struct.error, ValueError, KeyError):
+            logger.warning(f"Ignoring unreadable search index snapshot {path}")
+            return False
+        
+        view = memoryview(snapshot)
+        
+        def take(count: int, typecode: str) -> memoryview:
+            nonlocal offset
+            size = count * (4 if typecode == "I" else 2)
+            chunk = view[offset:offset + size].cast(typecode)
+            offset += size
+            return chunk
+        
+        with self._lock:
+            self.clear()
+            n_docs = header["documents"]
+            doc_ids = take(n_docs, "I")
+            doc_lengths = take(n_docs, "I")
+            self._doc_lengths = dict(zip(doc_ids, doc_lengths))
+            self._total_length = sum(doc_lengths)
+            
+            doc_terms: Dict[int, List[str]] = {doc_id: [] for doc_id in self._doc_lengths}
+            for term, count in header["terms"]:
+                postings = PostingList(take(count, "I"), take(count, "H"), take(count, "H"))
+                self._postings[term] = postings
+                for doc_id in postings.docs:
+                    doc_terms[doc_id].append(term)
+            
+            self._doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+            self._snapshot = snapshot
+            self.ready = True
+        
+        logger.info(f"Search index loaded from {path}: {n_docs} blogs")
+        return True
+    
+    def max_doc_id(self) -> Optional[int]:
+        """Return the highest indexed blog id."""
+        with self._lock:
+            return max(self._doc_lengths, default=None)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return index size figures."""
+        with self._lock:
+            return {
+                "documents": len(self._doc_lengths),
+                "terms": len(self._postings),
+                "postings": sum(len(p) for p in self._postings.values()),
+            }
+
+
+def index_fingerprint(db: Session) -> List:
+    """Summarise published blogs so a stale snapshot can be detected."""
+    count, max_id, last_change = db.query(
+        func.count(Blog.id),
+        func.max(Blog.id),
+        func.max(func.coalesce(Blog.updated_at, Blog.created_at))
+    ).filter(Blog.is_published == True).one()
+    return [count, max_id, str(last_change) if last_change is not None else None]
+
+
+def load_search_index(db: Session) -> None:
+    """Load the configured snapshot if it is current, otherwise rebuild (and save)."""
+    path = settings.SEARCH_INDEX_PATH
+    fingerprint = index_fingerprint(db) if path else []
+    if path and search_index.load(path, fingerprint):
+        return
+    
+    search_index.build(db)
+    if path:
+        search_index.save(path, fingerprint)
+
+
+def save_search_index(db: Session) -> None:
+    """Snapshot the index to SEARCH_INDEX_PATH, if configured."""
+    if not (settings.SEARCH_INDEX_PATH and search_index.ready):
+        return
+    
+    fingerprint = index_fingerprint(db)
+    if fingerprint[:2] != [len(search_index), search_index.max_doc_id()]:
+        # Other workers wrote blogs this index never saw; let the next start rebuild
+        logger.info("Search index is out of date, not saving snapshot")
+        return
+    search_index.save(settings.SEARCH_INDEX_PATH, fingerprint)
+
+
+# Global index instance, populated at startup when SEARCH_BACKEND is "memory"
+search_index = InvertedIndex()
@@ -0,0 +1,277 @@
+"""
+Blog search backends.
+Provides relevance-ranked blog search on top of the database's full-text
+engine (SQLite FTS5 or Postgres tsvector) or an in-process inverted index,
+with a LIKE scan as fallback.
+"""
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import column, func, literal_column, table
+from sqlalchemy.orm import Query, Session
+import html
+import logging
+
+from app.core.config import settings
+from app.models.blog import Blog
+from app.services.search_index import search_index, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Private-use markers around matches; replaced by <mark> after HTML escaping
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+SNIPPET_WORDS = 24
+
+
+class SearchHit(NamedTuple):
+    """A single search result."""
+    blog: Blog
+    score: Optional[float]
+    snippet: Optional[str]
+
+
+def render_snippet(raw: Optional[str]) -> Optional[str]:
+    """HTML-escape a marked-up snippet and turn match markers into <mark> tags."""
+    if raw is None:
+        return None
+    escaped = html.escape(raw, quote=False)
+    return escaped.replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+
+def make_snippet(text: str, terms: Sequence[str], words: int = SNIPPET_WORDS) -> str:
+    """Build a highlighted excerpt around the first matching word in Python."""
+    tokens = text.split()
+    needles = [term.lower() for term in terms if term]
+    
+    first = 0
+    for i, token in enumerate(tokens):
+        if any(needle in token.lower() for needle in needles):
+            first = i
+            break
+    
+    start = max(0, first - words // 3)
+    window = tokens[start:start + words]
+    marked = [
+        f"{MATCH_START}{token}{MATCH_END}"
+        if any(needle in token.lower() for needle in needles) else token
+        for token in window
+    ]
+    
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + words < len(tokens) else ""
+    return render_snippet(prefix + " ".join(marked) + suffix)
+
+
+def fetch_page(
+    query: Query,
+    skip: int,
+    fetch: int,
+    window: bool = True
+) -> Tuple[list, Optional[int]]:
+    """
+    Run an ordered search query, computing the total per BLOG_COUNT_STRATEGY.
+    
+    Args:
+        query: Ordered search query
+        skip: Number of rows to skip
+        fetch: Number of rows to fetch
+        window: Whether the query may carry a COUNT(*) OVER () column
+        
+    Returns:
+        Tuple of (rows, total)
+    """
+    strategy = settings.BLOG_COUNT_STRATEGY
+    if strategy in ("window", "counter") and not window:
+        strategy = "exact"
+    
+    if strategy in ("window", "counter"):
+        # Search totals are query specific, so "counter" also uses the window
+        rows = query.add_columns(func.count().over()).offset(skip).limit(fetch).all()
+        if rows:
+            total = rows[0][-1]
+        elif skip == 0:
+            total = 0
+        else:
+            total = query.order_by(None).count()
+        return [tuple(row)[:-1] for row in rows], total
+    
+    rows = query.offset(skip).limit(fetch).all()
+    total = query.order_by(None).count() if strategy == "exact" else None
+    if query.is_single_entity:
+        # Single-entity queries return the entities themselves, not rows
+        return [(row,) for row in rows], total
+    return [tuple(row) for row in rows], total
+
+
+class SearchBackend:
+    """Interface for blog search implementations."""
+    
+    # Whether snippets are built from Blog.content in Python
+    needs_content = False
+    
+    def search(
+        self,
+        db: Session,
+        query: str,
+        skip: int,
+        fetch: int,
+        options: Sequence[Any] = ()
+    ) -> Tuple[List[SearchHit], Optional[int]]:
+        """
+        Return up to ``fetch`` hits after ``skip`` and the total match count.
+        
+        ``options`` are loader options (e.g. ``load_only``) for the Blog query.
+        """
+        raise NotImplementedError
+
+
+class LikeSearchBackend(SearchBackend):
+    """Substring search with ILIKE; needs no schema support but scans the table."""
+    
+    needs_content = True
+    
+    def search(self, db, query, skip, fetch, options=()):
+        pattern = f"%{query}%"
+        base = db.query(Blog).options(*options).filter(
+            Blog.is_published == True,
+            (Blog.title.ilike(pattern) | Blog.content.ilike(pattern))
+        ).order_by(Blog.created_at.desc(), Blog.id.desc())
+        
+        rows, total = fetch_page(base, skip, fetch)
+        hits = [SearchHit(blog, None, make_snippet(blog.content, [query])) for (blog,) in rows]
+        return hits, total
+
+
+class SQLiteFullTextSearchBackend(SearchBackend):
+    """Search through the blogs_fts FTS5 table, ranked by bm25."""
+    
+    TITLE_WEIGHT = 10.0
+    CONTENT_WEIGHT = 1.0
+    
+    fts = literal_column("blogs_fts")
+    fts_table = table("blogs_fts", column("rowid"))
+    
+    @staticmethod
+    def build_match(query: str) -> Optional[str]:
+        """Translate free text into a safe FTS5 query (all terms, last one as prefix)."""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+    
+    def search(self, db, query, skip, fetch, options=()):
+        match = self.build_match(query)
+        if match is None:
+            return [], 0
+        
+        matches = self.fts.op("MATCH")(match)
+        score = -func.bm25(self.fts, self.TITLE_WEIGHT, self.CONTENT_WEIGHT)
+        base = (
+            db.query(Blog, score.label("score"))
+            .options(*options)
+            .join(self.fts_table, self.fts_table.c.rowid == Blog.id)
+            .filter(matches, Blog.is_published == True)
+            .order_by(score.desc(), Blog.id.desc())
+        )
+        # FTS5 auxiliary functions such as bm25() cannot run in a windowed select
+        rows, total = fetch_page(base, skip, fetch, window=False)
+        
+        # Snippets are only computed for the rows on this page
+        snippets = {}
+        if rows:
+            snippet = func.snippet(self.fts, 1, MATCH_START, MATCH_END, "…", SNIPPET_WORDS // 2)
+            snippets = dict(
+                db.query(self.fts_table.c.rowid, snippet)
+                .select_from(self.fts_table)
+                .filter(matches, self.fts_table.c.rowid.in_([blog.id for blog, _ in rows]))
+                .all()
+            )
+        
+        hits = [
+            SearchHit(blog, float(rank), render_snippet(snippets.get(blog.id)))
+            for blog, rank in rows
+        ]
+        return hits, total
+
+
+class PostgresFullTextSearchBackend(SearchBackend):
+    """Search through the weighted blogs.search_vector column, ranked by ts_rank_cd."""
+    
+    HEADLINE_OPTIONS = (
+        f"StartSel={MATCH_START}, StopSel={MATCH_END}, "
+        f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=1"
+    )
+    
+    search_vector = literal_column("blogs.search_vector")
+    
+    def search(self, db, query, skip, fetch, options=()):
+        ts_query = func.websearch_to_tsquery(settings.SEARCH_LANGUAGE, query)
+        score = func.ts_rank_cd(self.search_vector, ts_query)
+        base = (
+            db.query(Blog, score.label("score"))
+            .options(*options)
+            .filter(self.search_vector.op("@@")(ts_query), Blog.is_published == True)
+            .order_by(score.desc(), Blog.id.desc())
+        )
+        rows, total = fetch_page(base, skip, fetch)
+        
+        # ts_headline is expensive, so only run it for the rows on this page
+        snippets = {}
+        if rows:
+            headline = func.ts_headline(
+                settings.SEARCH_LANGUAGE, Blog.content, ts_query, self.HEADLINE_OPTIONS
+            )
+            snippets = dict(
+                db.query(Blog.id, headline)
+                .filter(Blog.id.in_([blog.id for blog, _ in rows]))
+                .all()
+            )
+        
+        hits = [
+            SearchHit(blog, float(rank), render_snippet(snippets.get(blog.id)))
+            for blog, rank in rows
+        ]
+        return hits, total
+
+
+class MemorySearchBackend(SearchBackend):
+    """Search through the in-process inverted index; only the page's rows are loaded."""
+    
+    needs_content = True
+    
+    def search(self, db, query, skip, fetch, options=()):
+        ranked, total = search_index.search(query, skip + fetch)
+        ranked = ranked[skip:]
+        if not ranked:
+            return [], total
+        
+        blogs = {
+            blog.id: blog
+            for blog in db.query(Blog).options(*options).filter(Blog.id.in_([doc_id for doc_id, _ in ranked]))
+        }
+        terms = tokenize(query)
+        hits = [
+            SearchHit(blogs[doc_id], score, make_snippet(blogs[doc_id].content, terms))
+            for doc_id, score in ranked
+            if doc_id in blogs
+        ]
+        return hits, total
+
+
+_FULLTEXT_BACKENDS = {
+    "sqlite": SQLiteFullTextSearchBackend,
+    "postgresql": PostgresFullTextSearchBackend,
+}
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    """Select the search backend for the configured setting and database."""
+    if settings.SEARCH_BACKEND == "memory" and search_index.ready:
+        return MemorySearchBackend()
+    if settings.SEARCH_BACKEND == "fulltext":
+        backend = _FULLTEXT_BACKENDS.get(db.get_bind().dialect.name)
+        if backend is not None:
+            return backend()
+    return LikeSearchBackend()
@@ -2,14 +2,22 @@
 User service for business logic operations.
 Handles user creation, authentication, and management.
 """
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Dict, Optional, List, Set, Tuple
+from sqlalchemy import Select, insert, select
+from sqlalchemy.orm import Session, load_only, selectinload
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.exc import IntegrityError
 import logging
 
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithBlogs
-from app.core.security import security_manager
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithBlogs, UserImportResult
+from app.core.cache import response_cache
+from app.core.security import security_manager, bulk_password_hash_pool, password_hash_pool, token_cache
+from app.services.blog_service import creator_blog_ids, invalidate_creator_cache
+from app.services.search_index import search_index
+from app.services.base import AsyncServiceProxy, read_only
+from app.utils.fields import Fields, partial_model
+from app.utils.pagination import encode_cursor, keyset_before
 from app.core.exceptions import (
     NotFoundError, 
     ConflictError, 
@@ -19,6 +27,47 @@ from app.core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# A user import batch: (position in the input, validated record)
+ImportBatch = List[Tuple[int, UserCreate]]
+
+
+def split_import_batch(batch: ImportBatch, existing: Set[str]) -> Tuple[ImportBatch, List[UserImportResult]]:
+    """Separate records to create from those whose email is taken (in the database or earlier in the batch)."""
+    new: ImportBatch = []
+    skipped: List[UserImportResult] = []
+    seen = set(existing)
+    for index, user in batch:
+        if user.email in seen:
+            skipped.append(UserImportResult(index=index, email=user.email, status="exists"))
+        else:
+            seen.add(user.email)
+            new.append((index, user))
+    return new, skipped
+
+
+def import_results(
+    new: ImportBatch, 
+    skipped: List[UserImportResult], 
+    created: Optional[Dict[str, int]], 
+    error: Optional[str] = None
+) -> List[UserImportResult]:
+    """Per-record results of an import batch, in input order."""
+    results = list(skipped)
+    for index, user in new:
+        if created is None:
+            results.append(UserImportResult(index=index, email=user.email, status="failed", detail=error))
+        else:
+            results.append(UserImportResult(index=index, email=user.email, status="created", id=created[user.email]))
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+def user_export_query() -> Select:
+    """Columns of the users to export (never the password hash), in id order."""
+    return select(
+        User.id, User.name, User.email, User.is_active, User.is_verified, User.created_at
+    ).order_by(User.id)
+
 
 class UserService:
     """Service class for user-related operations."""
@@ -26,8 +75,12 @@ class UserService:
     def __init__(self, db: Session):
         self.db = db
     
-    def create_user(self, user_data: UserCreate) -> UserResponse:
-        """Create a new user."""
+    def create_user(
+        self, 
+        user_data: UserCreate, 
+        password_hash: Optional[str] = None
+    ) -> UserResponse:
+        """Create a new user, hashing the password unless a hash is supplied."""
         try:
             # Check if user already exists
             existing_user = self.db.query(User).filter(User.email == user_data.email).first()
@@ -35,7 +88,7 @@ class UserService:
                 raise ConflictError("User with this email already exists")
             
             # Hash password and create user
-            hashed_password = security_manager.hash_password(user_data.password)
+            hashed_password = password_hash or security_manager.hash_password(user_data.password)
             
             db_user = User(
                 name=user_data.name,
@@ -63,6 +116,84 @@ class UserService:
             logger.error(f"Error creating user: {e}")
             raise DatabaseError("Failed to create user")
     
+    def find_existing_emails(self, emails: List[str]) -> Set[str]:
+        """Which of ``emails`` already belong to a user, with a single IN query."""
+        if not emails:
+            return set()
+        return {email for (email,) in self.db.query(User.email).filter(User.email.in_(emails))}
+    
+    def provision_users(self, users: List[UserCreate], password_hashes: List[str]) -> Dict[str, int]:
+        """
+        Insert a batch of new users whose passwords are already hashed.
+        
+        Args:
+            users: Validated users with unique, unused emails
+            password_hashes: Hash of each user's password, in the same order
+        
+        Returns:
+            Id of each created user by email
+        
+        Raises:
+            ConflictError: If an email was taken concurrently (nothing is inserted)
+            DatabaseError: If the batch could not be inserted
+        """
+        if not users:
+            return {}
+        
+        try:
+            result = self.db.execute(
+                insert(User.__table__).returning(User.__table__.c.id, User.__table__.c.email),
+                [
+                    {
+                        "name": user.name,
+                        "email": user.email,
+                        "password_hash": password_hash,
+                        "is_active": True,
+                        "is_verified": True  # As in create_user
+                    }
+                    for user, password_hash in zip(users, password_hashes)
+                ]
+            )
+            created = {email: user_id for user_id, email in result}
+            self.db.commit()
+        
+        except IntegrityError as e:
+            self.db.rollback()
+            logger.error(f"Database integrity error provisioning users: {e}")
+            raise ConflictError("Some emails were registered concurrently; retry the batch")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error provisioning {len(users)} users: {e}")
+            raise DatabaseError("Failed to create users")
+        
+        logger.info(f"Provisioned {len(created)} users")
+        return created
+    
+    def import_users(self, batch: ImportBatch) -> List[UserImportResult]:
+        """
+        Create a batch of users, skipping emails that are already taken.
+        
+        Existing emails are looked up with one query, passwords are hashed
+        in parallel on ``bulk_password_hash_pool`` and the new users are
+        inserted with one INSERT. Blocks while hashing; from async code use
+        AsyncUserService.import_users.
+        
+        Args:
+            batch: (position, record) pairs
+        
+        Returns:
+            One result per record, in input order
+        """
+        existing = self.find_existing_emails([user.email for _, user in batch])
+        new, skipped = split_import_batch(batch, existing)
+        password_hashes = bulk_password_hash_pool.hash_passwords([user.password for _, user in new])
+        try:
+            created = self.provision_users([user for _, user in new], password_hashes)
+        except (ConflictError, DatabaseError) as e:
+            return import_results(new, skipped, None, e.detail)
+        return import_results(new, skipped, created)
+    
+    @read_only
     def get_user_by_id(self, user_id: int) -> UserResponse:
         """Get user by ID."""
         try:
@@ -87,10 +218,17 @@ class UserService:
             logger.error(f"Error fetching user by email {email}: {e}")
             return None
     
+    @read_only
     def get_user_with_blogs(self, user_id: int) -> UserWithBlogs:
         """Get user with their blogs."""
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            # One-to-many: load all blogs with a second IN query instead of a join
+            user = (
+                self.db.query(User)
+                .options(selectinload(User.blogs))
+                .filter(User.id == user_id)
+                .first()
+            )
             if not user:
                 raise NotFoundError("User")
             
@@ -117,6 +255,9 @@ class UserService:
             
             self.db.commit()
             self.db.refresh(user)
+            token_cache.invalidate_user(user_id)
+            if response_cache.enabled:
+                invalidate_creator_cache(creator_blog_ids(self.db, user_id))
             
             logger.info(f"User {user_id} updated successfully")
             return UserResponse.model_validate(user)
@@ -140,8 +281,15 @@ class UserService:
             if not user:
                 raise NotFoundError("User")
             
+            # Blogs are deleted with the user; note them for cache invalidation
+            blog_ids = creator_blog_ids(self.db, user_id)
+            
             self.db.delete(user)
             self.db.commit()
+            token_cache.invalidate_user(user_id)
+            invalidate_creator_cache(blog_ids)
+            for blog_id in blog_ids:
+                search_index.remove_blog(blog_id)
             
             logger.info(f"User {user_id} deleted successfully")
             return True
@@ -173,11 +321,89 @@ class UserService:
             logger.error(f"Error authenticating user {email}: {e}")
             return None
     
+    @read_only
     def get_all_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
         """Get all users with pagination."""
+        users, _ = self.get_users_page(skip=skip, limit=limit)
+        return users
+    
+    @read_only
+    def get_users_page(
+        self, 
+        skip: int = 0, 
+        limit: int = 100, 
+        cursor: Optional[str] = None,
+        fields: Optional[Fields] = None
+    ) -> Tuple[List[UserResponse], Optional[str]]:
+        """
+        Get a page of users, newest first, plus the cursor for the next page.
+        
+        With ``fields`` only those columns (plus the cursor's) are loaded and
+        the users are ``partial_model`` copies of UserResponse.
+        """
         try:
-            users = self.db.query(User).offset(skip).limit(limit).all()
-            return [UserResponse.model_validate(user) for user in users]
+            query = self.db.query(User).order_by(User.created_at.desc(), User.id.desc())
+            if fields is not None:
+                columns = {"id", "created_at"}.union(fields)
+                query = query.options(load_only(*(getattr(User, name) for name in sorted(columns))))
+            
+            if cursor:
+                query = query.filter(keyset_before(self.db, User.created_at, User.id, cursor))
+            else:
+                query = query.offset(skip)
+            
+            users = query.limit(limit + 1).all()
+            next_cursor = None
+            if len(users) > limit:
+                users = users[:limit]
+                next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+            
+            response_model = UserResponse if fields is None else partial_model(UserResponse, fields)
+            return [response_model.model_validate(user) for user in users], next_cursor
+            
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching users: {e}")
             raise DatabaseError("Failed to fetch users")
+
+
+class AsyncUserService(AsyncServiceProxy):
+    """Awaitable variant of UserService for use from async endpoints."""
+    
+    service_class = UserService
+    
+    async def create_user(self, user_data: UserCreate) -> UserResponse:
+        """Create a new user, hashing the password on the worker pool."""
+        if await self.get_user_by_email(user_data.email):
+            raise ConflictError("User with this email already exists")
+        
+        password_hash = await password_hash_pool.hash_password(user_data.password)
+        return await self.run("create_user", user_data, password_hash=password_hash)
+    
+    async def import_users(self, batch: ImportBatch) -> List[UserImportResult]:
+        """Create a batch of users, hashing passwords off the event loop."""
+        existing = await self.find_existing_emails([user.email for _, user in batch])
+        new, skipped = split_import_batch(batch, existing)
+        password_hashes = await run_in_threadpool(
+            bulk_password_hash_pool.hash_passwords, [user.password for _, user in new]
+        )
+        try:
+            created = await self.provision_users([user for _, user in new], password_hashes)
+        except (ConflictError, DatabaseError) as e:
+            return import_results(new, skipped, None, e.detail)
+        return import_results(new, skipped, created)
+    
+    async def authenticate_user(self, email: str, password: str) -> Optional[User]:
+        """Authenticate user, verifying the password on the worker pool."""
+        user = await self.get_user_by_email(email)
+        if not user:
+            return None
+        
+        if not await password_hash_pool.verify_password(password, user.password_hash):
+            return None
+        
+        if not user.is_active:
+            return None
+        
+        return user
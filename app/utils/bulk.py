@@ -0,0 +1,127 @@
+"""
+Bulk request body helpers.
+Reads records from a JSON array or a streamed NDJSON body and validates
+each one separately, so a bad record is reported instead of failing the
+whole request.
+"""
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type, TypeVar, Union
+import json
+
+from fastapi import Request
+from pydantic import BaseModel, ValidationError as PydanticValidationError
+
+from app.core.exceptions import PayloadTooLargeError, ValidationError
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def is_ndjson(request: Request) -> bool:
+    """Whether the request body is newline-delimited JSON."""
+    media_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return media_type in NDJSON_MEDIA_TYPES
+
+
+def describe_errors(error: PydanticValidationError) -> str:
+    """One-line summary of a pydantic validation error."""
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc']))}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors(include_url=False)
+    )
+
+
+async def iter_body(request: Request, max_bytes: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Chunks of a streamed request body, refusing more than ``max_bytes``."""
+    too_large = PayloadTooLargeError(f"Request body exceeds {max_bytes} bytes")
+    if max_bytes is not None and int(request.headers.get("content-length") or 0) > max_bytes:
+        raise too_large
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if max_bytes is not None and received > max_bytes:
+            raise too_large
+        yield chunk
+
+
+async def iter_lines(request: Request, max_bytes: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Non-blank lines of a streamed request body."""
+    pending = b""
+    async for chunk in iter_body(request, max_bytes):
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
+async def iter_records(
+    request: Request,
+    model: Type[M],
+    max_records: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> AsyncIterator[Tuple[int, Union[M, str]]]:
+    """
+    Validate the records of a bulk request body one by one.
+    
+    NDJSON bodies (see ``NDJSON_MEDIA_TYPES``) are read as they stream in;
+    anything else must be a JSON array.
+    
+    Args:
+        request: Incoming request
+        model: Schema each record is validated against
+        max_records: Most records accepted, if limited
+        max_bytes: Largest body accepted, if limited
+    
+    Returns:
+        Async iterator of (record index, validated model or error message)
+    
+    Raises:
+        ValidationError: If a non-NDJSON body is not a JSON array, or has
+            more than ``max_records`` records
+        PayloadTooLargeError: If the body is larger than ``max_bytes``
+    """
+    too_many = ValidationError(f"Too many records (max {max_records})")
+    if is_ndjson(request):
+        index = 0
+        async for line in iter_lines(request, max_bytes):
+            if max_records is not None and index >= max_records:
+                raise too_many
+            try:
+                yield index, model.model_validate_json(line)
+            except PydanticValidationError as e:
+                yield index, describe_errors(e)
+            index += 1
+        return
+    
+    try:
+        records = json.loads(b"".join([chunk async for chunk in iter_body(request, max_bytes)]))
+    except ValueError:
+        raise ValidationError("Request body is not valid JSON")
+    if not isinstance(records, list):
+        raise ValidationError("Request body must be a JSON array (or NDJSON)")
+    if max_records is not None and len(records) > max_records:
+        raise too_many
+    
+    for index, record in enumerate(records):
+        try:
+            yield index, model.model_validate(record)
+        except PydanticValidationError as e:
+            yield index, describe_errors(e)
+
+
+class ImportReport:
+    """Running totals of a bulk import, keeping the first ``max_errors`` errors."""
+    
+    def __init__(self, max_errors: int = 100):
+        self.imported = 0
+        self.failed = 0
+        self.max_errors = max_errors
+        self.errors: List[Dict[str, Union[int, str]]] = []
+    
+    def fail(self, index: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"index": index, "detail": detail})
@@ -0,0 +1,90 @@
+"""
+HTTP conditional request helpers.
+Builds ETag / Last-Modified validators and answers If-None-Match and
+If-Modified-Since with 304 Not Modified.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, NamedTuple, Optional
+import hashlib
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+class Validators(NamedTuple):
+    """Validators describing the current state of a resource."""
+    etag: str
+    last_modified: Optional[datetime] = None
+    
+    def headers(self) -> Dict[str, str]:
+        """Response headers carrying the validators."""
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def make_validators(*parts: Any, last_modified: Optional[datetime] = None) -> Validators:
+    """
+    Build a strong ETag from the values that determine a representation.
+    
+    The application version is mixed in so a deploy that changes the
+    response format does not revalidate old copies.
+    """
+    digest = hashlib.sha256(repr((settings.APP_VERSION,) + parts).encode()).hexdigest()[:32]
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        last_modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+    return Validators(f'"{digest}"', last_modified)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of If-None-Match entries against our ETag."""
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """
+    Evaluate the request's conditional headers (RFC 9110 section 13.2.2).
+    
+    If-Modified-Since is only consulted when If-None-Match is absent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validators.etag)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return validators.last_modified <= since
+    
+    return False
+
+
+def not_modified(validators: Validators) -> Response:
+    """Empty 304 response repeating the validators."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers())
+
+
+def with_validators(result: Any, response: Response, validators: Optional[Validators]) -> Any:
+    """Attach validators to an endpoint result, whether a model or a Response."""
+    if validators is not None:
+        target = result if isinstance(result, Response) else response
+        target.headers.update(validators.headers())
+    return result
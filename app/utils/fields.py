@@ -0,0 +1,92 @@
+"""
+Sparse fieldsets.
+Parses ``fields=`` query parameters naming the response fields a client
+wants, and builds response models restricted to those fields, so list
+endpoints can load and return only those columns.
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+
+from pydantic import BaseModel, Field, create_model
+
+from app.core.exceptions import ValidationError
+
+# Returned whether requested or not, so items can always be told apart
+ALWAYS_INCLUDED = ("id",)
+
+Fields = Tuple[str, ...]
+
+
+def parse_fields(value: Optional[str], model: Type[BaseModel]) -> Optional[Fields]:
+    """
+    Parse a comma separated list of ``model`` field names.
+    
+    Args:
+        value: Raw query parameter, e.g. "title,excerpt"
+        model: Schema of the listed items
+    
+    Returns:
+        Sorted field names including ``ALWAYS_INCLUDED``, or None for all fields
+    
+    Raises:
+        ValidationError: If a name is not a field of ``model``
+    """
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names - set(model.model_fields)
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(sorted(names.union(ALWAYS_INCLUDED)))
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: Fields) -> Type[BaseModel]:
+    """
+    A copy of ``model`` with only ``fields``, created once per fieldset.
+    
+    Partial items are validated and serialized by pydantic-core like full
+    ones; values for other fields are ignored.
+    """
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=model.model_config,
+        **{name: (info.annotation, info) for name, info in model.model_fields.items() if name in fields}
+    )
+
+
+@lru_cache(maxsize=None)
+def sparse_schema(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Documentation schema for ``model`` items of a listing taking ``fields=``.
+    
+    Only ``ALWAYS_INCLUDED`` fields are required; any other may be left out.
+    """
+    return create_model(
+        f"{model.__name__}Sparse",
+        __config__=model.model_config,
+        **{
+            name: (info.annotation, info if name in ALWAYS_INCLUDED else Field(None, description=info.description))
+            for name, info in model.model_fields.items()
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def sparse_page_schema(page: Type[BaseModel], item: Type[BaseModel]) -> Type[BaseModel]:
+    """Documentation schema for a paginated ``page`` whose ``blogs`` are sparse ``item``s."""
+    return create_model(
+        f"{page.__name__}Sparse",
+        __base__=page,
+        blogs=(List[sparse_schema(item)], page.model_fields["blogs"])
+    )
+
+
+@lru_cache(maxsize=256)
+def partial_page(page: Type[BaseModel], item: Type[BaseModel], fields: Fields) -> Type[BaseModel]:
+    """A subclass of the paginated ``page`` whose ``blogs`` are partial ``item``s."""
+    return create_model(
+        f"{page.__name__}Fields",
+        __base__=page,
+        blogs=(List[partial_model(item, fields)], page.model_fields["blogs"])
+    )
@@ -0,0 +1,48 @@
+"""
+Keyset (cursor) pagination helpers.
+Cursors are opaque to clients and encode the (created_at, id) of the last
+row returned, so the next page is a single index seek instead of an OFFSET.
+"""
+from datetime import datetime
+from typing import Any, Tuple
+import base64
+import json
+
+from sqlalchemy import String, literal, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode the sort key of a row as an opaque cursor string."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValidationError("Invalid pagination cursor")
+
+
+def _timestamp_param(db: Session, value: datetime) -> Any:
+    """Bind a cursor timestamp so it compares like the stored column."""
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite keeps DateTime as text and CURRENT_TIMESTAMP has no fractional
+        # part; the bound value must use the same text form to compare equal.
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return literal(text, String)
+    return value
+
+
+def keyset_before(db: Session, created_col: Any, id_col: Any, cursor: str) -> Any:
+    """Filter for rows after ``cursor`` in (created_at DESC, id DESC) order."""
+    created_at, row_id = decode_cursor(cursor)
+    return tuple_(created_col, id_col) < tuple_(_timestamp_param(db, created_at), row_id)
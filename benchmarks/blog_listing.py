@@ -0,0 +1,148 @@
+"""
+Benchmark GET /api/v1/blogs/?limit=100 serialization.
+
+Seeds a throwaway SQLite database and serves full pages through a minimal
+app exposing the real ``get_blogs`` endpoint next to the previous
+implementation (Blog instances, ``BlogResponse.model_validate`` per row and
+FastAPI re-validating the returned model against ``response_model``),
+reporting blogs per second.
+
+Usage:
+    SECRET_KEY=... python -m benchmarks.blog_listing [--blogs N] [--requests N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from fastapi import Depends, FastAPI, Response  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.v1.endpoints.blogs import get_blogs  # noqa: E402
+from app.core.database import SessionLocal, get_db, init_db  # noqa: E402
+from app.models.blog import Blog  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.blog import BlogCreate, BlogListResponse, BlogResponse  # noqa: E402
+from app.services.blog_service import BlogService  # noqa: E402
+from app.utils.conditional import with_validators  # noqa: E402
+from app.utils.pagination import encode_cursor  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+def previous_get_blogs(response: Response, skip: int = 0, limit: int = PAGE_SIZE, db: Session = Depends(get_db)):
+    """The previous listing path, kept here for comparison."""
+    validators = BlogService(db).get_listing_validators(skip=skip, limit=limit)
+    query = db.query(Blog).filter(Blog.is_published == True)
+    blogs = query.order_by(Blog.created_at.desc(), Blog.id.desc()).offset(skip).limit(limit + 1).all()
+    has_next = len(blogs) > limit
+    blogs = blogs[:limit]
+    result = BlogListResponse(
+        blogs=[BlogResponse.model_validate(blog) for blog in blogs],
+        total=query.count(),
+        page=(skip // limit) + 1,
+        size=limit,
+        has_next=has_next,
+        has_prev=skip > 0,
+        next_cursor=encode_cursor(blogs[-1].created_at, blogs[-1].id) if has_next else None
+    )
+    return with_validators(result, response, validators)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_api_route("/api/v1/blogs/", get_blogs, methods=["GET"], response_model=BlogListResponse)
+    app.add_api_route("/previous/blogs/", previous_get_blogs, methods=["GET"], response_model=BlogListResponse)
+    return app
+
+
+def seed(count: int) -> None:
+    init_db()
+    with SessionLocal() as db:
+        creator = User(name="Bench", email="bench@example.com", password_hash="x")
+        db.add(creator)
+        db.commit()
+        posts = [
+            BlogCreate(
+                title=f"Listed post {i}",
+                content="Benchmark content for a listed blog post. " * 20,
+                summary=None if i % 3 else f"Summary of post {i}",
+                is_published=True
+            )
+            for i in range(count)
+        ]
+        BlogService(db).import_blogs(posts, creator.id)
+
+
+def scope(path: str, skip: int) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": f"skip={skip}&limit={PAGE_SIZE}".encode(),
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def get(app: FastAPI, path: str, skip: int = 0) -> bytes:
+    """Call the app directly (no sockets, no HTTP client) and return the body."""
+    body = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+    
+    await app(scope(path, skip), receive, send)
+    return b"".join(body)
+
+
+async def run(app: FastAPI, path: str, requests: int, pages: int) -> float:
+    """Time ``requests`` sequential page loads, returning seconds."""
+    for skip in range(0, pages * PAGE_SIZE, PAGE_SIZE):  # warm-up
+        await get(app, path, skip)
+    start = time.perf_counter()
+    for i in range(requests):
+        await get(app, path, (i % pages) * PAGE_SIZE)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--blogs", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    
+    seed(args.blogs)
+    pages = max(args.blogs // PAGE_SIZE, 1)
+    app = build_app()
+    
+    previous = json.loads(asyncio.run(get(app, "/previous/blogs/")))
+    current = json.loads(asyncio.run(get(app, "/api/v1/blogs/")))
+    assert previous == current, "fast path body differs from the previous implementation"
+    
+    print(f"GET /blogs/?limit={PAGE_SIZE} x {args.requests} over {args.blogs} blogs")
+    print(f"{'variant':<12} {'req/s':>8} {'blogs/s':>10} {'speed-up':>9}")
+    baseline = None
+    for name, path in (("previous", "/previous/blogs/"), ("fast path", "/api/v1/blogs/")):
+        elapsed = asyncio.run(run(app, path, args.requests, pages))
+        rate = args.requests * PAGE_SIZE / elapsed
+        baseline = baseline or rate
+        print(f"{name:<12} {args.requests / elapsed:>8,.0f} {rate:>10,.0f} {rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark bulk blog import against one-by-one creation.
+
+Inserts blog posts into a throwaway SQLite database with
+``BlogService.create_blog`` (creator lookup, commit and refresh per post)
+and with ``BlogService.import_blogs`` at several batch sizes, reporting
+posts per second.
+
+Usage:
+    SECRET_KEY=... python -m benchmarks.bulk_import [--posts N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from app.core.database import SessionLocal, init_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.blog import BlogCreate  # noqa: E402
+from app.services.blog_service import BlogService  # noqa: E402
+
+
+def make_posts(count: int) -> list:
+    return [
+        BlogCreate(
+            title=f"Imported post {i}",
+            content="Benchmark content for a bulk imported blog post. " * 8,
+            is_published=i % 2 == 0
+        )
+        for i in range(count)
+    ]
+
+
+def one_by_one(service: BlogService, posts: list, creator_id: int) -> None:
+    for post in posts:
+        service.create_blog(post, creator_id)
+
+
+def batched(batch_size: int):
+    def run(service: BlogService, posts: list, creator_id: int) -> None:
+        for start in range(0, len(posts), batch_size):
+            service.import_blogs(posts[start:start + batch_size], creator_id, verify_creator=start == 0)
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--posts", type=int, default=20000)
+    args = parser.parse_args()
+    
+    init_db()
+    with SessionLocal() as db:
+        creator = User(name="Bench", email="bench@example.com", password_hash="x")
+        db.add(creator)
+        db.commit()
+        creator_id = creator.id
+    
+    variants = [
+        # create_blog is slow enough that a sample is representative
+        ("create_blog", one_by_one, min(args.posts, 2000)),
+        ("import_blogs x100", batched(100), args.posts),
+        ("import_blogs x1000", batched(1000), args.posts),
+        ("import_blogs x5000", batched(5000), args.posts),
+    ]
+    
+    print(f"{'variant':<20} {'posts':>7} {'posts/s':>10} {'speed-up':>9}")
+    baseline = None
+    for name, run, count in variants:
+        posts = make_posts(count)
+        with SessionLocal() as db:
+            service = BlogService(db)
+            start = time.perf_counter()
+            run(service, posts, creator_id)
+            rate = count / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{name:<20} {count:>7} {rate:>10,.0f} {rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
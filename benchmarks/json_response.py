@@ -0,0 +1,138 @@
+"""
+Benchmark JSON response classes on large blog listings.
+
+Serves a prebuilt BlogListResponse through FastAPI's regular response path
+(``response_model`` validation, ``jsonable_encoder``, then the response
+class) with Starlette's stdlib JSONResponse and with FastJSONResponse,
+driving the ASGI app directly. ``model_response``, which skips FastAPI's
+handling altogether, is included for reference.
+
+Usage:
+    SECRET_KEY=... python -m benchmarks.json_response [--requests N]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, model_response
+from app.schemas.blog import BlogListResponse
+
+
+def make_listing(count: int) -> BlogListResponse:
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    return BlogListResponse.model_validate({
+        "blogs": [
+            {
+                "id": i,
+                "title": f"Listed post {i}",
+                "content": "Benchmark content for a listed blog post. " * 20,
+                "summary": None,
+                "is_published": True,
+                "creator_id": i % 50,
+                "created_at": created_at - timedelta(minutes=i),
+                "updated_at": None,
+                "excerpt": "Benchmark content for a listed blog post. " * 3 + "...",
+            }
+            for i in range(count)
+        ],
+        "total": count,
+        "page": 1,
+        "size": count,
+        "has_next": False,
+        "has_prev": False,
+    })
+
+
+def build_app(listing: BlogListResponse, response_class: type) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    
+    async def get_listing():
+        return listing
+    
+    async def get_listing_response():
+        return model_response(listing)
+    
+    app.add_api_route("/blogs", get_listing, methods=["GET"], response_model=BlogListResponse)
+    app.add_api_route("/blogs/raw", get_listing_response, methods=["GET"], response_model=BlogListResponse)
+    return app
+
+
+def scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def get(app: FastAPI, path: str) -> bytes:
+    """Call the app directly (no sockets, no HTTP client) and return the body."""
+    body = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+    
+    await app(scope(path), receive, send)
+    return b"".join(body)
+
+
+async def run(app: FastAPI, path: str, requests: int) -> float:
+    """Time ``requests`` sequential calls, returning seconds."""
+    for _ in range(min(requests, 20)):  # warm-up
+        await get(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await get(app, path)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    
+    if responses.orjson is None:
+        print("orjson is not installed: FastJSONResponse uses the stdlib fallback")
+    
+    for count in (100, 1000, 5000):
+        listing = make_listing(count)
+        variants = [
+            ("JSONResponse", build_app(listing, JSONResponse), "/blogs"),
+            ("FastJSONResponse", build_app(listing, FastJSONResponse), "/blogs"),
+            ("model_response", build_app(listing, JSONResponse), "/blogs/raw"),
+        ]
+        requests = max(args.requests * 100 // count, 10)
+        
+        bodies = {asyncio.run(get(app, path)) for _, app, path in variants}
+        assert len(bodies) == 1, "response classes produced different bodies"
+        
+        print(f"\n{count} blogs ({len(bodies.pop()) / 1024:,.0f} KiB) x {requests}")
+        print(f"{'variant':<18} {'req/s':>8} {'blogs/s':>10} {'speed-up':>9}")
+        baseline = None
+        for name, app, path in variants:
+            elapsed = asyncio.run(run(app, path, requests))
+            rate = requests * count / elapsed
+            baseline = baseline or rate
+            print(f"{name:<18} {requests / elapsed:>8,.0f} {rate:>10,.0f} {rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
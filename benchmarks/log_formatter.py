@@ -0,0 +1,94 @@
+"""
+Benchmark the structured JSON log formatter.
+
+Formats the same records with the previous JSONFormatter (fresh dict,
+``datetime.now().isoformat()`` and ``json.dumps`` per record) and the
+current one, reporting records per second with and without extra fields.
+
+Usage:
+    SECRET_KEY=... python -m benchmarks.log_formatter [--records N]
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+import app.core.logging as app_logging
+from app.core.logging import JSONFormatter
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """The previous JSONFormatter, kept here for comparison."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        if hasattr(record, "extra_fields"):
+            log_entry.update(record.extra_fields)
+        return json.dumps(log_entry)
+
+
+def make_records(count: int, extra: bool) -> list:
+    """Records spread over a few seconds, like a busy request log."""
+    start = time.time()
+    records = []
+    for i in range(count):
+        record = logging.LogRecord(
+            "app.middleware.logging", logging.INFO, __file__, 42,
+            "Response: %s %s - Status: %s - Time: %.4fs", ("GET", f"/api/v1/blogs/{i}", 200, 0.0012), None
+        )
+        record.created = start + i / 10000
+        if extra:
+            record.extra_fields = {"request_id": f"req-{i}", "user_id": i % 97, "cache": "HIT"}
+        records.append(record)
+    return records
+
+
+def run(formatter: logging.Formatter, records: list) -> float:
+    """Records formatted per second."""
+    for record in records[:1000]:  # warm-up
+        formatter.format(record)
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+    
+    orjson = app_logging.orjson
+    variants = {"legacy": lambda: LegacyJSONFormatter()}
+    if orjson is not None:
+        variants["current (json)"] = lambda: JSONFormatter()
+        variants["current (orjson)"] = lambda: JSONFormatter()
+    else:
+        variants["current"] = lambda: JSONFormatter()
+    
+    print(f"{args.records} records per run")
+    print(f"{'variant':<18} {'extras':>7} {'records/s':>12} {'speed-up':>9}")
+    for extra in (False, True):
+        records = make_records(args.records, extra)
+        baseline = None
+        for name, factory in variants.items():
+            app_logging.orjson = None if name == "current (json)" else orjson
+            rate = run(factory(), records)
+            baseline = baseline or rate
+            print(f"{name:<18} {'yes' if extra else 'no':>7} {rate:>12,.0f} {rate / baseline:>8.2f}x")
+    app_logging.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
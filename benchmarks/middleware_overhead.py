@@ -0,0 +1,134 @@
+"""
+Benchmark request logging middleware overhead on GET /health.
+
+Drives the ASGI app directly (no sockets, no HTTP client) so the numbers
+reflect middleware cost only, comparing no middleware, the previous
+BaseHTTPMiddleware implementation, the pure ASGI LoggingMiddleware and
+LoggingMiddleware together with MetricsMiddleware.
+
+Usage:
+    SECRET_KEY=... python -m benchmarks.middleware_overhead [--requests N] [--log-level INFO]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Callable
+
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.main import health_check
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+
+logger = logging.getLogger("app.middleware.logging")
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous LoggingMiddleware, kept here for comparison."""
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.time()
+        logger.info(
+            f"Request: {request.method} {request.url.path} "
+            f"from {request.client.host if request.client else 'unknown'}"
+        )
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info(
+            f"Response: {request.method} {request.url.path} "
+            f"- Status: {response.status_code} "
+            f"- Time: {process_time:.4f}s"
+        )
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+def build_app(*middleware) -> FastAPI:
+    """A minimal app exposing the real /health endpoint."""
+    app = FastAPI()
+    app.add_api_route("/health", health_check, methods=["GET"])
+    for middleware_class in middleware:
+        app.add_middleware(middleware_class)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/health",
+    "raw_path": b"/health",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("bench", 80),
+}
+
+
+def make_receive():
+    """Deliver the (empty) body once, then block like a server awaiting disconnect."""
+    delivered = False
+    
+    async def receive():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+    
+    return receive
+
+
+async def send(message):
+    pass
+
+
+async def run(app: FastAPI, requests: int) -> list:
+    """Time ``requests`` sequential calls, returning per-request microseconds."""
+    for _ in range(200):  # warm-up (route compilation, caches)
+        await app(dict(SCOPE), make_receive(), send)
+    
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter_ns()
+        await app(dict(SCOPE), make_receive(), send)
+        timings.append((time.perf_counter_ns() - start) / 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--log-level", default="WARNING", help="Level for the middleware logger")
+    args = parser.parse_args()
+    
+    logging.getLogger().handlers.clear()
+    logging.getLogger().addHandler(logging.NullHandler())
+    logger.setLevel(args.log_level)
+    
+    variants = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware": build_app(BaseHTTPLoggingMiddleware),
+        "pure ASGI": build_app(LoggingMiddleware),
+        "pure ASGI + metrics": build_app(LoggingMiddleware, MetricsMiddleware),
+    }
+    
+    results = {name: asyncio.run(run(app, args.requests)) for name, app in variants.items()}
+    baseline = statistics.median(results["no middleware"])
+    
+    print(f"GET /health x {args.requests}, middleware log level {args.log_level}")
+    print(f"{'variant':<22} {'median us':>10} {'p99 us':>10} {'overhead us':>12}")
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(f"{name:<22} {median:>10.1f} {p99:>10.1f} {median - baseline:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
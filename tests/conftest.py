@@ -0,0 +1,23 @@
+"""
+Shared test configuration.
+Points the application at a throwaway SQLite database before it is imported,
+and provides a client running the application's startup and shutdown.
+"""
+import os
+import tempfile
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,166 @@
+"""
+Tests for the bulk import and export endpoints.
+"""
+import csv
+import io
+import json
+import uuid
+
+from click.testing import CliRunner
+
+from app.cli.users import users
+from app.core.config import settings
+from tests.test_queries import PASSWORD, count_queries, create_author
+
+
+def test_blog_import_batches_and_reports_errors(client):
+    """Valid records are inserted in batches; invalid ones are reported by position."""
+    headers = create_author(client)
+    records = [
+        {"title": f"Imported {i}", "content": "Imported post content.", "is_published": True}
+        for i in range(5)
+    ]
+    records.insert(2, {"title": "", "content": "short"})
+
+    with count_queries() as statements:
+        response = client.post("/api/v1/blogs/import?batch_size=2", json=records, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 5
+    assert body["failed"] == 1
+    assert body["errors"][0]["index"] == 2
+    assert "title" in body["errors"][0]["detail"]
+    # One creator check plus one INSERT per batch, not a round-trip per post
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT INTO BLOGS")]) == 3
+
+    ndjson = "\n".join(json.dumps(record) for record in records[:2]) + "\n{not json}\n"
+    response = client.post(
+        "/api/v1/blogs/import", content=ndjson,
+        headers={**headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.json()["imported"] == 2
+    assert response.json()["errors"][0]["index"] == 2
+
+    mine = client.get("/api/v1/blogs/my-blogs?limit=100", headers=headers).json()
+    assert len(mine["blogs"]) == 7
+
+    response = client.post("/api/v1/blogs/import", json={"title": "x"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_blog_import_limits_requests(client, monkeypatch):
+    """Blog imports are capped in records and bytes; a refused JSON array imports nothing."""
+    headers = create_author(client)
+    records = [
+        {"title": f"Limited {i}", "content": "Imported post content.", "is_published": True}
+        for i in range(3)
+    ]
+
+    monkeypatch.setattr(settings, "BLOG_IMPORT_MAX_RECORDS", 2)
+    response = client.post("/api/v1/blogs/import", json=records, headers=headers)
+    assert response.status_code == 422
+    assert "Too many records" in response.text
+    ndjson = "\n".join(json.dumps(record) for record in records)
+    response = client.post(
+        "/api/v1/blogs/import", content=ndjson,
+        headers={**headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 422
+
+    monkeypatch.setattr(settings, "BLOG_IMPORT_MAX_BODY_SIZE", 100)
+    response = client.post("/api/v1/blogs/import", json=records[:2], headers=headers)
+    assert response.status_code == 413
+
+    assert client.get("/api/v1/blogs/my-blogs", headers=headers).json()["blogs"] == []
+
+
+def test_user_import_streams_results(client, tmp_path, monkeypatch):
+    """Users are created in batches; taken emails and invalid records are reported per row."""
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [f"admin@{domain}"])
+    headers = create_author(client, f"admin@{domain}")
+    records = [
+        {"name": f"User {i}", "email": f"user{i}@{domain}", "password": PASSWORD}
+        for i in range(4)
+    ]
+    records += [records[0], {"name": "No password", "email": f"bad@{domain}"}]
+
+    response = client.post("/api/v1/users/import?batch_size=3", json=records, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["index"] for result in results] == list(range(6))
+    assert [result["status"] for result in results] == ["created"] * 4 + ["exists", "invalid"]
+
+    login = client.post("/api/v1/auth/login", json={"email": f"user3@{domain}", "password": PASSWORD})
+    assert login.status_code == 200
+
+    path = tmp_path / "users.csv"
+    path.write_text(f"name,email,password\nUser 0,user0@{domain},{PASSWORD}\nUser 9,user9@{domain},{PASSWORD}\n")
+    result = CliRunner(mix_stderr=False).invoke(users, ["import", str(path)])
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line)["status"] for line in result.stdout.splitlines()] == ["exists", "created"]
+
+
+def test_user_import_requires_admin_and_limits_requests(client, monkeypatch):
+    """Only admins may import users, and each request is capped in records and bytes."""
+    domain = f"{uuid.uuid4().hex[:8]}.example.com"
+    records = [{"name": f"User {i}", "email": f"user{i}@{domain}", "password": PASSWORD} for i in range(3)]
+
+    response = client.post("/api/v1/users/import", json=records, headers=create_author(client))
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [f"admin@{domain}"])
+    headers = create_author(client, f"admin@{domain}")
+    monkeypatch.setattr(settings, "USER_IMPORT_MAX_RECORDS", 2)
+    response = client.post("/api/v1/users/import", json=records, headers=headers)
+    assert response.status_code == 422
+    assert "Too many records" in response.text
+    ndjson = "\n".join(json.dumps(record) for record in records)
+    response = client.post(
+        "/api/v1/users/import", content=ndjson,
+        headers={**headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 422
+
+    monkeypatch.setattr(settings, "USER_IMPORT_MAX_BODY_SIZE", 100)
+    response = client.post("/api/v1/users/import", json=records[:2], headers=headers)
+    assert response.status_code == 413
+
+    # Nothing was created by the refused requests
+    login = client.post("/api/v1/auth/login", json={"email": f"user0@{domain}", "password": PASSWORD})
+    assert login.status_code == 401
+
+
+def test_exports_stream_ndjson_and_csv(client, monkeypatch):
+    """Exports stream every row in id order, without password hashes."""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    headers = create_author(client)
+    client.post(
+        "/api/v1/blogs/import",
+        json=[{"title": f"Export {i}", "content": "Exported post content.", "is_published": True} for i in range(3)],
+        headers=headers
+    )
+
+    response = client.get("/api/v1/blogs/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="blogs.ndjson"'
+    blogs = [json.loads(line) for line in response.text.splitlines()]
+    ids = [blog["id"] for blog in blogs]
+    assert ids == sorted(ids)
+    assert [blog["title"] for blog in blogs[-3:]] == ["Export 0", "Export 1", "Export 2"]
+
+    # User exports contain every account's email, so they are admin only
+    assert client.get("/api/v1/users/export", headers=headers).status_code == 403
+    admin_email = f"admin-{uuid.uuid4().hex[:8]}@example.com"
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [admin_email])
+    headers = create_author(client, admin_email)
+
+    response = client.get("/api/v1/users/export?format=csv", headers=headers)
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "name", "email", "is_active", "is_verified", "created_at"]
+    assert len(rows) > 2
+    assert "password" not in response.text
+
+    assert client.get("/api/v1/users/export?format=xml", headers=headers).status_code == 422
@@ -0,0 +1,59 @@
+"""
+Tests for the response cache.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+class Item(BaseModel):
+    name: str
+
+
+def test_response_cache_serves_and_invalidates():
+    """Entries are reused until their namespace is invalidated."""
+    cache = ResponseCache(MemoryCacheBackend(maxsize=16, ttl=60), ttl=60)
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        return Item(name=f"v{len(calls)}")
+
+    async def fetch():
+        response = await cache.serve("items", {"page": 1}, produce)
+        return response.headers["X-Cache"], response.body
+
+    assert asyncio.run(fetch()) == ("MISS", b'{"name":"v1"}')
+    assert asyncio.run(fetch()) == ("HIT", b'{"name":"v1"}')
+
+    cache.invalidate("items")
+    assert asyncio.run(fetch()) == ("MISS", b'{"name":"v2"}')
+
+
+def test_redis_bump_does_not_block_the_caller():
+    """Generation bumps are sent to Redis from a background thread, in order."""
+    release = threading.Event()
+    bumped = []
+
+    class SlowRedis:
+        def hincrby(self, key, field, amount):
+            release.wait(5)
+            bumped.append((field, threading.current_thread().name))
+
+    # Skip __init__, which needs the redis package and a server
+    backend = RedisCacheBackend.__new__(RedisCacheBackend)
+    backend._sync_client = SlowRedis()
+    backend._bumps = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-bump")
+
+    backend.bump("blogs")
+    backend.bump("blog:1")
+    assert bumped == []
+
+    release.set()
+    backend._bumps.shutdown(wait=True)
+    assert [field for field, _ in bumped] == ["blogs", "blog:1"]
+    assert all(name.startswith("cache-bump") for _, name in bumped)
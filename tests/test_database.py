@@ -0,0 +1,206 @@
+"""
+Tests for database configuration helpers.
+"""
+import pytest
+from sqlalchemy import column, create_engine, event, exc, select, table, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.database import (
+    Base,
+    ReplicaSet,
+    RoutingSession,
+    _timed_pool_class,
+    db_pool_timeouts_total,
+    db_pool_wait_seconds_total,
+    get_async_database_url,
+    get_pool_limits,
+    set_consistency_key,
+)
+from app.core.migrations import create_search_index, create_triggers
+from app.models.blog import Blog
+from app.models.user import User
+from app.services.base import read_only
+from app.services.blog_service import BlogService
+
+
+def test_async_url_for_sqlite():
+    """SQLite URLs are mapped onto the aiosqlite driver."""
+    assert get_async_database_url("sqlite:///./blog.db") == "sqlite+aiosqlite:///./blog.db"
+
+
+def test_async_url_for_postgres():
+    """Postgres URLs are mapped onto asyncpg regardless of the sync driver."""
+    assert (
+        get_async_database_url("postgresql+psycopg2://u:p@db:5432/blogdb")
+        == "postgresql+asyncpg://u:p@db:5432/blogdb"
+    )
+    assert get_async_database_url("postgres://db/blogdb") == "postgresql+asyncpg://db/blogdb"
+
+
+def test_pool_limits_fit_connection_budget(monkeypatch):
+    """Each worker's pool shrinks so all workers fit the connection budget."""
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DATABASE_MAX_OVERFLOW", 10)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "DATABASE_CONNECTION_BUDGET", None)
+    assert get_pool_limits() == (10, 10)
+
+    monkeypatch.setattr(settings, "DATABASE_CONNECTION_BUDGET", 60)
+    assert get_pool_limits() == (10, 5)
+    monkeypatch.setattr(settings, "DATABASE_CONNECTION_BUDGET", 20)
+    assert get_pool_limits() == (5, 0)
+
+
+def test_timed_pool_counts_timeouts():
+    """Checkouts that time out are counted."""
+    pool_engine = create_engine(
+        "sqlite://", poolclass=_timed_pool_class(QueuePool, "test"),
+        pool_size=1, max_overflow=0, pool_timeout=0.01
+    )
+    with pool_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            pool_engine.connect()
+
+    assert db_pool_timeouts_total.values()[("test",)] == 1
+    assert db_pool_wait_seconds_total.values()[("test",)] >= 0.01
+
+
+def test_routing_session_reads_from_read_bind(tmp_path):
+    """SELECTs use the read engine until the transaction writes, then the primary."""
+    url = f"sqlite:///{tmp_path / 'routing.db'}"
+    primary, replica = create_engine(url), create_engine(url)
+    with primary.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+
+    used = []
+    for name, target in (("primary", primary), ("replica", replica)):
+        event.listen(target, "before_cursor_execute", lambda *args, name=name: used.append(name))
+
+    items = table("items", column("id"))
+    session = RoutingSession(bind=primary, read_bind=replica)
+    session.execute(select(items))
+    session.execute(items.insert().values(id=1))
+    session.execute(select(items))
+    session.commit()
+    session.execute(select(items))
+    session.close()
+
+    assert used == ["replica", "primary", "primary", "replica"]
+
+
+def test_replica_reads_fall_back_and_respect_recent_writes(tmp_path, monkeypatch):
+    """Read-only calls use replicas in turn, skip failed ones and follow the caller's writes."""
+    url = f"sqlite:///{tmp_path / 'primary.db'}"
+    primary = create_engine(url)
+    replicas = [create_engine(url), create_engine(url), create_engine(f"sqlite:///{tmp_path / 'missing' / 'x.db'}")]
+    with primary.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+
+    used = []
+    for name, target in zip(("primary", "r0", "r1", "down"), (primary, *replicas)):
+        event.listen(target, "before_cursor_execute", lambda *args, name=name: used.append(name))
+
+    items = table("items", column("id"))
+    replica_set = ReplicaSet([(f"r{i}", target) for i, target in enumerate(replicas)])
+    session = RoutingSession(bind=primary, replicas=replica_set)
+
+    class ItemService:
+        def __init__(self, db):
+            self.db = db
+
+        @read_only
+        def count(self):
+            return len(self.db.execute(select(items)).all())
+
+    service = ItemService(session)
+    for _ in range(4):
+        service.count()
+        session.commit()
+    # The broken replica is retried on the primary once, then skipped
+    assert used == ["r0", "r1", "primary", "r1"]
+    assert not replica_set.is_available(replicas[2])
+
+    # Plain reads outside read-only methods stay on the primary
+    used.clear()
+    session.execute(select(items))
+    session.commit()
+    assert used == ["primary"]
+
+    # After the caller's write, their reads go to the primary for the sticky window
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 60)
+    set_consistency_key(42)
+    used.clear()
+    session.execute(items.insert().values(id=1))
+    session.commit()
+    assert service.count() == 1
+    session.commit()
+    set_consistency_key(7)
+    service.count()
+    session.close()
+    set_consistency_key(None)
+    assert used == ["primary", "primary", "r0"]
+
+
+
+def seed_blog_db(url):
+    """Create a migrated SQLite database at ``url`` holding five published posts."""
+    primary = create_engine(url)
+    Base.metadata.create_all(primary)
+    with primary.connect() as conn:
+        create_triggers(conn)
+        create_search_index(conn)
+    with Session(primary) as db:
+        author = User(name="Author", email="author@example.com", password_hash="x")
+        db.add(author)
+        db.flush()
+        db.add_all([
+            Blog(title=f"Post {i}", content="Some python content", is_published=True, creator_id=author.id)
+            for i in range(5)
+        ])
+        db.commit()
+    return primary
+
+
+def read_search_and_cursor_pages(session):
+    """Search the seeded posts and follow a listing cursor, checking page sizes."""
+    service = BlogService(session)
+    assert len(service.search_blogs("python", limit=2).blogs) == 2
+    session.commit()
+    first = service.get_all_blogs(limit=2)
+    session.commit()
+    assert len(service.get_all_blogs(limit=2, cursor=first.next_cursor).blogs) == 2
+    session.commit()
+    assert len(service.search_blogs("python", skip=2, limit=2).blogs) == 2
+    session.close()
+
+
+@pytest.mark.parametrize("search_backend", ["fulltext", "like"])
+def test_search_and_cursor_pages_use_read_bind(tmp_path, monkeypatch, search_backend):
+    """Looking up the dialect for search or a cursor does not pin reads to the primary."""
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", search_backend)
+    url = f"sqlite:///{tmp_path / 'primary.db'}"
+    primary = seed_blog_db(url)
+    reader = create_engine(url)
+
+    used = []
+    for name, target in (("primary", primary), ("reader", reader)):
+        event.listen(target, "before_cursor_execute", lambda *args, name=name: used.append(name))
+    read_search_and_cursor_pages(RoutingSession(bind=primary, read_bind=reader))
+    assert used and set(used) == {"reader"}
+
+
+@pytest.mark.parametrize("search_backend", ["fulltext", "like"])
+def test_search_and_cursor_pages_read_from_replicas(tmp_path, monkeypatch, search_backend):
+    """Search results and cursor pages are read-only calls served by a replica."""
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", search_backend)
+    url = f"sqlite:///{tmp_path / 'primary.db'}"
+    primary = seed_blog_db(url)
+    replica = create_engine(url)
+
+    used = []
+    for name, target in (("primary", primary), ("replica", replica)):
+        event.listen(target, "before_cursor_execute", lambda *args, name=name: used.append(name))
+    read_search_and_cursor_pages(RoutingSession(bind=primary, replicas=ReplicaSet([("r0", replica)])))
+    assert used and set(used) == {"replica"}
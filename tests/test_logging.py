@@ -0,0 +1,88 @@
+"""
+Tests for the queued logging pipeline and the JSON formatter.
+"""
+from datetime import datetime
+import json
+import logging
+import queue
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logging import BoundedQueueHandler, JSONFormatter, LogRateLimiter
+from app.middleware.logging import LoggingMiddleware
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_drop_oldest_keeps_newest_records():
+    """A full queue discards its oldest record and counts the drop."""
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), policy="drop_oldest")
+    for message in ("a", "b", "c"):
+        handler.handle(make_record(message))
+
+    assert handler.dropped == 1
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ["b", "c"]
+
+
+def test_block_policy_drops_after_timeout():
+    """The block policy waits for room, then drops and counts the record."""
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="block", timeout=0.01)
+    handler.handle(make_record("a"))
+    handler.handle(make_record("b"))
+
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().msg == "a"
+
+
+def test_json_formatter_output():
+    """Static fields lead, timestamps follow record time and extras are merged."""
+    formatter = JSONFormatter(static_fields={"service": "blog"})
+    record = make_record("hello")
+    record.extra_fields = {"user_id": 7}
+
+    for created in (1700000000.25, 1700000000.5, 1700000001.0):
+        record.created = created
+        entry = json.loads(formatter.format(record))
+        assert datetime.fromisoformat(entry["timestamp"]).timestamp() == created
+
+    assert list(entry)[0] == "service"
+    assert entry["service"] == "blog"
+    assert entry["message"] == "hello"
+    assert entry["user_id"] == 7
+
+
+def test_rate_limiter_reports_suppressed_messages():
+    """A drained bucket suppresses messages and reports the count on refill."""
+    limiter = LogRateLimiter(rate=1000, burst=2)
+    assert [limiter.allow("boom") for _ in range(3)] == [0, 0, None]
+    assert limiter.allow("other") == 0
+
+    time.sleep(0.01)
+    assert limiter.allow("boom") == 1
+    assert limiter.stats()["suppressed"] == 1
+
+
+def test_request_logging_sampling(caplog):
+    """Unsampled successes are not logged; errors still are."""
+    app = FastAPI()
+    app.add_api_route("/health", lambda: {"status": "healthy"})
+    app.add_middleware(LoggingMiddleware, sample_rate=0, route_sample_rates={"/api": 1}, slow_request_ms=0)
+
+    # App loggers may not propagate once setup_logging has run, so listen directly
+    middleware_logger = logging.getLogger("app.middleware.logging")
+    middleware_logger.addHandler(caplog.handler)
+    try:
+        with caplog.at_level(logging.INFO, logger="app.middleware.logging"):
+            client = TestClient(app)
+            client.get("/health")
+            client.get("/missing")
+    finally:
+        middleware_logger.removeHandler(caplog.handler)
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.middleware.logging"]
+    assert [message.split(" - ")[0] for message in messages] == ["Response: GET /missing"]
+    assert LoggingMiddleware(app, sample_rate=0, route_sample_rates={"/api": 1}).sample_rate_for("/api/v1/blogs/") == 1
@@ -1,9 +1,15 @@
 """
 Basic tests for the main application.
 """
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
 import pytest
 from fastapi.testclient import TestClient
+from pydantic import BaseModel
 
+from app.core import responses
 from app.main import app
 
 client = TestClient(app)
@@ -41,3 +47,65 @@ def test_openapi_endpoint():
     data = response.json()
     assert "openapi" in data
     assert "info" in data
+
+
+def test_user_listing_schema_matches_sparse_responses():
+    """GET /users/ documents partial items and the X-Next-Cursor header."""
+    spec = client.get("/openapi.json").json()
+    listed = spec["paths"]["/api/v1/users/"]["get"]["responses"]["200"]
+    assert "X-Next-Cursor" in listed["headers"]
+    item = listed["content"]["application/json"]["schema"]["items"]["$ref"].rsplit("/", 1)[-1]
+    assert spec["components"]["schemas"][item]["required"] == ["id"]
+
+
+
+def test_blog_listing_schemas_match_sparse_responses():
+    """Blog listings and search taking ``fields`` document partial items."""
+    spec = client.get("/openapi.json").json()
+    schemas = spec["components"]["schemas"]
+    for path in ("/api/v1/blogs/", "/api/v1/blogs/search"):
+        page = spec["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        blogs = schemas[page["$ref"].rsplit("/", 1)[-1]]["properties"]["blogs"]
+        assert schemas[blogs["items"]["$ref"].rsplit("/", 1)[-1]]["required"] == ["id"]
+
+
+def test_validation_errors_use_json_handler():
+    """Error handlers render their bodies with the application response class."""
+    response = client.get("/api/v1/blogs/?limit=0")
+    assert response.status_code == 422
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["error"] is True
+    assert data["details"][0]["loc"] == ["query", "limit"]
+
+
+def test_json_encoding_without_orjson(monkeypatch):
+    """The stdlib fallback encodes exactly like orjson."""
+    class Item(BaseModel):
+        name: str
+        created_at: datetime
+
+    content = {
+        "item": Item(name="caf\u00e9", created_at=datetime(2024, 1, 2, 3, 4, 5, 678)),
+        "at": datetime(2024, 1, 2, 3, 4, 5),
+        "count": 3,
+        "ratio": 0.5,
+        "tags": ["a", None, True],
+    }
+    encoded = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(content) == encoded
+    assert b"caf\xc3\xa9" in encoded
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_encoding_rejects_unknown_types(monkeypatch, use_orjson):
+    """Decimals and UUIDs are encoded; other objects fail instead of becoming strings."""
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps({"price": Decimal("1.50"), "qty": Decimal("2")}) == b'{"price":1.5,"qty":2}'
+    assert responses.dumps([UUID(int=1)]) == b'["00000000-0000-0000-0000-000000000001"]'
+    with pytest.raises(TypeError):
+        responses.dumps({"tags": {"a"}})
+    with pytest.raises(TypeError):
+        responses.dumps([object()])
@@ -0,0 +1,39 @@
+"""
+Tests for the metrics registry and endpoint.
+"""
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_registry_renders_text_format():
+    """Counters sum across label sets and histogram buckets are cumulative."""
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("jobs_total", "Jobs run.", ("kind",)))
+    histogram = registry.register(Histogram("job_seconds", "Job time.", buckets=(0.1, 1.0)))
+    counter.inc("a")
+    counter.inc("a", amount=2)
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{kind="a"} 3' in lines
+    assert 'job_seconds_bucket{le="0.1"} 1' in lines
+    assert 'job_seconds_bucket{le="1.0"} 2' in lines
+    assert 'job_seconds_bucket{le="+Inf"} 3' in lines
+    assert "job_seconds_count 3" in lines
+
+
+def test_metrics_endpoint_labels_route_templates():
+    """Requests are labelled with the route template, not the raw path."""
+    client.get("/api/v1/blogs/999999")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/api/v1/blogs/{blog_id}"' in response.text
+    assert "/api/v1/blogs/999999" not in response.text
@@ -0,0 +1,21 @@
+"""
+Tests for keyset pagination cursors.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    """Cursors decode back to the (created_at, id) they were built from."""
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_invalid_cursor_is_rejected():
+    """Tampered cursors raise a validation error rather than a 500."""
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,182 @@
+"""
+Tests that endpoints issue a constant number of SQL queries as data grows,
+and for the SQL instrumentation hooks.
+"""
+from contextlib import contextmanager
+import logging
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app.core import database
+from app.core.config import settings
+from app.core.query_stats import fingerprint, instrument_engine, track_queries
+
+PASSWORD = "Passw0rdX"
+
+
+@contextmanager
+def count_queries():
+    """Count statements executed on the application's engines."""
+    engines = [engine for _, engine in database.get_engines()]
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def create_author(client, email=None):
+    """Register a user and return auth headers."""
+    email = email or f"{uuid.uuid4().hex[:12]}@example.com"
+    client.post("/api/v1/users/create", json={"name": "Author", "email": email, "password": PASSWORD})
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def add_blogs(client, headers, count):
+    """Create published blogs and return their ids."""
+    return [
+        client.post(
+            "/api/v1/blogs/",
+            json={"title": f"Post {i}", "content": "Some searchable content here.", "is_published": True},
+            headers=headers
+        ).json()["id"]
+        for i in range(count)
+    ]
+
+
+def queries_for(client, url, headers=None):
+    """Return the number of statements one request issues."""
+    with count_queries() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+def test_query_count_is_constant(client):
+    """Detail and list endpoints do not issue a query per related row."""
+    authors = [create_author(client) for _ in range(2)]
+    blog_id = add_blogs(client, authors[0], 2)[0]
+    urls = [
+        (f"/api/v1/blogs/{blog_id}", None),
+        ("/api/v1/users/me/blogs", authors[0]),
+        ("/api/v1/blogs/?include_creators=true", None),
+        ("/api/v1/blogs/search?q=searchable&include_creators=true", None),
+    ]
+
+    for url, headers in urls:
+        queries_for(client, url, headers)  # warm the token cache
+    before = [queries_for(client, url, headers) for url, headers in urls]
+
+    for _ in range(3):
+        authors.append(create_author(client))
+    for headers in authors:
+        add_blogs(client, headers, 5)
+    after = [queries_for(client, url, headers) for url, headers in urls]
+
+    assert after == before
+
+
+def test_blog_detail_includes_creator(client):
+    """GET /blogs/{id} embeds the creator."""
+    headers = create_author(client)
+    blog_id = add_blogs(client, headers, 1)[0]
+
+    response = client.get(f"/api/v1/blogs/{blog_id}")
+    assert response.status_code == 200
+    assert response.json()["creator"]["name"] == "Author"
+
+
+@pytest.mark.parametrize("strategy", ["exact", "window"])
+def test_list_items_match_detail(client, monkeypatch, strategy):
+    """Column-row list items serialize like the detail endpoint's blogs."""
+    monkeypatch.setattr(settings, "BLOG_COUNT_STRATEGY", strategy)
+    headers = create_author(client)
+    blog_id = add_blogs(client, headers, 1)[0]
+    client.put(f"/api/v1/blogs/{blog_id}", json={"content": "Long content. " * 20}, headers=headers)
+
+    for url in ("/api/v1/blogs/?limit=100", "/api/v1/blogs/my-blogs"):
+        page = client.get(url, headers=headers).json()
+        item = next(blog for blog in page["blogs"] if blog["id"] == blog_id)
+        detail = client.get(f"/api/v1/blogs/{blog_id}").json()
+        detail.pop("creator")
+        assert item == detail
+        assert item["excerpt"] == ("Long content. " * 20)[:150] + "..."
+        assert page["total"] >= 1
+
+
+def test_sparse_fieldsets(client):
+    """fields= limits list items to the named fields and their columns."""
+    headers = create_author(client)
+    add_blogs(client, headers, 2)
+
+    with count_queries() as statements:
+        page = client.get("/api/v1/blogs/?fields=title,excerpt&limit=1").json()
+    assert set(page["blogs"][0]) == {"id", "title", "excerpt"}
+    assert page["next_cursor"] is not None
+    assert "blogs.content AS" not in statements[0]
+
+    results = client.get("/api/v1/blogs/search?q=searchable&fields=snippet").json()
+    assert set(results["blogs"][0]) == {"id", "snippet"}
+
+    users = client.get("/api/v1/users/?fields=name", headers=headers).json()
+    assert set(users[0]) == {"id", "name"}
+
+    assert client.get("/api/v1/blogs/?fields=title,secret").status_code == 422
+
+
+def test_conditional_get_short_circuits(client):
+    """A matching If-None-Match gets 304 from a single validator query."""
+    headers = create_author(client)
+    blog_id = add_blogs(client, headers, 1)[0]
+    url = f"/api/v1/blogs/{blog_id}"
+    etag = client.get(url).headers["ETag"]
+
+    with count_queries() as statements:
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert len(statements) == 1
+
+    client.put(url, json={"title": "Changed"}, headers=headers)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_fingerprint_normalizes_values():
+    """Literals, placeholders and expanded IN lists are normalized."""
+    sql = "SELECT *\n  FROM blogs WHERE id IN (?, ?, ?) AND title = 'it''s' AND views > 10 AND owner_id = %(owner_id)s"
+    assert fingerprint(sql) == "SELECT * FROM blogs WHERE id IN (?+) AND title = ? AND views > ? AND owner_id = ?"
+
+
+def test_instrumentation_tracks_repeats_and_slow_queries(monkeypatch, caplog):
+    """Per-context stats see repeated statements; slow ones are logged."""
+    engine = create_engine("sqlite://")
+    event.listen(engine, "connect", lambda conn, record: conn.create_function("nap", 1, time.sleep))
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 20)
+    instrument_engine(engine, "test")
+
+    slow_logger = logging.getLogger("app.db.slow_queries")
+    slow_logger.addHandler(caplog.handler)
+    try:
+        with track_queries() as stats, engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+            conn.execute(text("SELECT nap(0.03)"))
+    finally:
+        slow_logger.removeHandler(caplog.handler)
+
+    assert stats.count == 4
+    assert stats.repeated(2) == [("SELECT ?", 3)]
+    assert [record.extra_fields["fingerprint"] for record in caplog.records] == ["SELECT nap(?)"]
@@ -0,0 +1,88 @@
+"""
+Tests for blog search helpers.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.blog import Blog
+from app.models.user import User
+from app.services.search_index import InvertedIndex
+from app.services.search_service import (
+    MATCH_END,
+    MATCH_START,
+    LikeSearchBackend,
+    SQLiteFullTextSearchBackend,
+    render_snippet,
+)
+
+
+def test_build_match_quotes_terms():
+    """User input is reduced to quoted terms so FTS5 syntax cannot leak through."""
+    assert SQLiteFullTextSearchBackend.build_match('fast "api OR') == '"fast" "api" "or"*'
+    assert SQLiteFullTextSearchBackend.build_match('"*') is None
+
+
+def test_render_snippet_escapes_html():
+    """Snippets are escaped before match markers become <mark> tags."""
+    raw = f"<b>{MATCH_START}python{MATCH_END}</b>"
+    assert render_snippet(raw) == "&lt;b&gt;<mark>python</mark>&lt;/b&gt;"
+
+
+def test_inverted_index_ranks_and_updates():
+    """Title hits outrank content hits, the last term matches as a prefix."""
+    index = InvertedIndex()
+    index.add(1, "Cooking", "A note on python in the kitchen")
+    index.add(2, "Python packaging", "Wheels and sdists")
+    index.add(3, "Gardening", "Tomatoes need sun")
+
+    hits, total = index.search("pyth", 10)
+    assert [doc_id for doc_id, _ in hits] == [2, 1]
+    assert total == 2
+    assert index.search("python wheels", 10)[1] == 1
+
+    index.remove(2)
+    assert [doc_id for doc_id, _ in index.search("python", 10)[0]] == [1]
+
+
+def test_inverted_index_snapshot_round_trip(tmp_path):
+    """A saved snapshot loads back and stays writable."""
+    path = str(tmp_path / "index.bin")
+    index = InvertedIndex()
+    index.add(1, "Python", "Async servers")
+    index.add(2, "Rust", "Fearless servers")
+    index.save(path, fingerprint=[2])
+
+    loaded = InvertedIndex()
+    assert not loaded.load(path, fingerprint=[3])
+    assert loaded.load(path, fingerprint=[2])
+    assert loaded.search("servers", 10) == index.search("servers", 10)
+
+    loaded.add(3, "Go", "More servers")
+    loaded.remove(1)
+    assert sorted(doc_id for doc_id, _ in loaded.search("servers", 10)[0]) == [2, 3]
+
+
+@pytest.mark.parametrize("strategy", ["exact", "none"])
+def test_like_search_without_window_count(monkeypatch, strategy):
+    """The LIKE backend pages single-entity rows when no window count is used."""
+    monkeypatch.setattr(settings, "BLOG_COUNT_STRATEGY", strategy)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        author = User(name="Author", email="author@example.com", password_hash="x")
+        db.add(author)
+        db.flush()
+        db.add_all([
+            Blog(title=f"Post {i}", content="Some python content", is_published=True, creator_id=author.id)
+            for i in range(3)
+        ])
+        db.commit()
+
+        hits, total = LikeSearchBackend().search(db, "python", 1, 5)
+
+    assert len(hits) == 2
+    assert total == (3 if strategy == "exact" else None)
+    assert "<mark>python</mark>" in hits[0].snippet
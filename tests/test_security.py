@@ -0,0 +1,81 @@
+"""
+Tests for password hashing and the argon2 worker pool.
+"""
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.security import PasswordHashPool, VerifiedTokenCache, password_hash_pool
+from tests.test_queries import PASSWORD
+
+
+def test_pool_hashes_and_verifies():
+    """Hashing round-trips through the worker pool."""
+    pool = PasswordHashPool(workers=2, queue_size=2)
+
+    async def scenario():
+        hashed = await pool.hash_password("Secret123")
+        return await pool.verify_password("Secret123", hashed)
+
+    try:
+        assert asyncio.run(scenario()) is True
+        assert pool.stats()["completed"] == 2
+    finally:
+        pool.shutdown()
+
+
+def test_pool_rejects_when_saturated():
+    """The reject policy returns 503 instead of queueing past capacity."""
+    pool = PasswordHashPool(workers=1, queue_size=0, policy="reject")
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await pool.run(lambda: None)
+        release.set()
+        await busy
+        return exc_info.value
+
+    try:
+        error = asyncio.run(scenario())
+        assert error.status_code == 503
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_saturated_pool_responses_carry_retry_after(client, monkeypatch):
+    """Endpoints pass the pool's 503 on with its Retry-After header."""
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    client.post("/api/v1/users/create", json={"name": "Busy", "email": email, "password": PASSWORD})
+
+    async def saturated(fn, *args):
+        raise ServiceUnavailableError("Too many concurrent authentication requests, retry shortly")
+
+    monkeypatch.setattr(password_hash_pool, "run", saturated)
+    responses = [
+        client.post("/api/v1/users/create", json={"name": "Busy", "email": f"new-{email}", "password": PASSWORD}),
+        client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD}),
+    ]
+    for response in responses:
+        assert response.status_code == 503, response.text
+        assert response.headers["Retry-After"] == "1"
+
+
+def test_token_cache_respects_expiry_and_invalidation():
+    """Cached principals expire with the token and on user invalidation."""
+    cache = VerifiedTokenCache(maxsize=10, ttl=60)
+
+    cache.set("token-a", 1, "principal-a")
+    cache.set("token-b", 2, "principal-b", expires_at=time.time() - 1)
+    assert cache.get("token-a") == "principal-a"
+    assert cache.get("token-b") is None
+
+    cache.invalidate_user(1)
+    assert cache.get("token-a") is None